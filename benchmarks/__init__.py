@@ -0,0 +1,3 @@
+"""
+Herramientas de benchmark para el pipeline de datos y el dashboard.
+"""
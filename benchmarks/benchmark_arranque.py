@@ -0,0 +1,164 @@
+"""
+Benchmark del arranque en frío del dashboard.
+
+Arranca varias veces un intérprete nuevo que importa `dashboard` (lo mismo
+que paga cada worker que no hereda el proceso maestro) y reporta:
+
+- tiempo total de arranque (reloj) y las fases medidas por el propio
+  dashboard (imports, app, carga de datos, precalentamiento; ver
+  utils/startup.py), con la carga de cada dataset;
+- tiempo de import por paquete, a partir de ``-X importtime`` (tiempo propio
+  de cada módulo sumado por paquete de primer nivel, así los totales no se
+  solapan; el cuerpo de `dashboard` se ve en las fases) y el tiempo
+  acumulado de cada import directo de `dashboard`;
+- qué renderizadores pesados (Altair, Plotly, DuckDB…) se cargaron al arrancar.
+
+Termina con código 1 si la mediana del arranque supera el presupuesto.
+
+Uso:
+    python -m benchmarks.benchmark_arranque --repeticiones 5 --presupuesto 3
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.startup import DEFAULT_BUDGET_S, STARTUP_PROFILE_ENV
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = Path("bench_arranque.json")
+TOP_PACKAGES = 15
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """
+    Tiempos de import (s) de la salida de ``-X importtime``.
+
+    Returns:
+        Dict: ``packages`` (tiempo propio sumado por paquete de primer nivel) y
+        ``direct`` (tiempo acumulado de cada import directo de `dashboard`)
+    """
+    packages: Dict[str, float] = {}
+    direct: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        package = name.split('.')[0]
+        if name == 'dashboard':
+            # Su tiempo propio es el cuerpo del módulo (carga de datos, precalentamiento): ver las fases
+            continue
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+        # `dashboard` va con un espacio de sangría; sus imports directos, con tres
+        if len(indent) == 3:
+            direct[name] = int(cumulative_us) / 1e6
+    return {'packages': packages, 'direct': direct}
+
+
+def run_once() -> Dict[str, Any]:
+    """Un arranque en un intérprete nuevo, con su perfil y sus tiempos de import."""
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = Path(tmp) / "startup.json"
+        env = {**os.environ, STARTUP_PROFILE_ENV: str(profile_path)}
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import dashboard'],
+            cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(f"El arranque falló:\n{result.stderr[-2000:]}")
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+
+    return {'wall_s': round(wall, 4), 'profile': profile, 'imports': parse_importtime(result.stderr)}
+
+
+def _median_of(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = {key for run in runs for key in run}
+    medians = {key: round(statistics.median(run.get(key) or 0.0 for run in runs), 4) for key in keys}
+    return dict(sorted(medians.items(), key=lambda item: -item[1]))
+
+
+def summarize(runs: List[Dict[str, Any]], budget_s: float) -> Dict[str, Any]:
+    """Medianas entre arranques y comparación con el presupuesto."""
+    wall = statistics.median(run['wall_s'] for run in runs)
+    packages = _median_of([run['imports']['packages'] for run in runs])
+    return {
+        'wall_s': round(wall, 4),
+        'budget_s': budget_s,
+        'within_budget': wall <= budget_s,
+        'in_process_s': round(statistics.median(run['profile']['total_s'] for run in runs), 4),
+        'phases': _median_of([run['profile']['phases'] for run in runs]),
+        'data_load': _median_of([run['profile']['data_load'] for run in runs]),
+        'import_packages': dict(list(packages.items())[:TOP_PACKAGES]),
+        'import_direct': _median_of([run['imports']['direct'] for run in runs]),
+        'loaded_modules': runs[-1]['profile']['loaded_modules'],
+    }
+
+
+def print_summary(summary: Dict[str, Any]):
+    """Muestra el resumen del arranque."""
+    status = "dentro" if summary['within_budget'] else "FUERA"
+    print(f"Arranque en frío: {summary['wall_s']:.2f}s (presupuesto {summary['budget_s']:.2f}s, {status})")
+    print("Fases:", ', '.join(f"{k} {v:.3f}s" for k, v in summary['phases'].items()))
+    print("Imports directos de dashboard:")
+    for name, seconds in list(summary['import_direct'].items())[:10]:
+        print(f"  {name:<40} {seconds:>8.3f}s")
+    print("Tiempo de import por paquete:")
+    for name, seconds in summary['import_packages'].items():
+        print(f"  {name:<40} {seconds:>8.3f}s")
+    loaded = [name for name, is_loaded in summary['loaded_modules'].items() if is_loaded]
+    print("Renderizadores cargados al arrancar:", ', '.join(loaded) or '-')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil y presupuesto del arranque en frío del dashboard.")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Arranques a medir")
+    parser.add_argument('--presupuesto', type=float, default=DEFAULT_BUDGET_S,
+                        help="Presupuesto de arranque en segundos (mediana)")
+    parser.add_argument('--salida', type=Path, default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    runs = []
+    for i in range(args.repeticiones):
+        run = run_once()
+        runs.append(run)
+        logger.info(f"🚀 Arranque {i + 1}/{args.repeticiones}: {run['wall_s']:.2f}s")
+
+    summary = summarize(runs, args.presupuesto)
+    report = {
+        'benchmark': 'arranque',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repetitions': args.repeticiones,
+        'summary': summary,
+        'runs': [{'wall_s': run['wall_s'], **run['profile']} for run in runs],
+    }
+    print_summary(summary)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"📊 Resultados guardados en '{args.salida}'")
+    return 0 if summary['within_budget'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
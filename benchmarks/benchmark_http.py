@@ -0,0 +1,352 @@
+"""
+Prueba de carga HTTP del dashboard.
+
+Repite sesiones realistas contra la aplicación levantada en local, sin
+depender de servicios externos. Cada sesión:
+
+1. pide la página (`/`), `_dash-layout` y `_dash-dependencies`, como el navegador;
+2. navega cada ruta a través del callback `display_page`;
+3. dispara los callbacks cuyos componentes aparecen en la página devuelta
+   (ej. los gráficos de inicio), con las entradas tomadas del layout.
+
+Las sesiones se ejecutan con la concurrencia pedida y se informan las
+peticiones por segundo y los percentiles de latencia por endpoint.
+
+Uso:
+    python -m benchmarks.benchmark_http --sesiones 50 --concurrencia 8
+    python -m benchmarks.benchmark_http --workers 4 --hilos 4       # contra servir.py
+    python -m benchmarks.benchmark_http --url http://127.0.0.1:8057  # servidor ya levantado
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import logging
+import math
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+ROUTES = ['/', '/economico', '/empresarial', '/educacion', '/salud', '/seguridad']
+ROUTER_OUTPUT = "page-content.children"
+CALLBACK_PATH = "/_dash-update-component"
+DEFAULT_OUTPUT = Path("bench_http.json")
+PERCENTILES = (50, 90, 95, 99)
+READY_TIMEOUT = 120
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = READY_TIMEOUT):
+    """Espera a que el servidor responda listo en /readyz."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/readyz", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"El servidor en {base_url} no quedó listo en {timeout}s")
+
+
+@contextmanager
+def local_server(workers: Optional[int] = None, threads: int = 4) -> Iterator[str]:
+    """
+    Levanta el dashboard en un puerto libre y entrega su URL base.
+
+    Sin ``workers``, en este proceso con el servidor multihilo de Werkzeug;
+    con ``workers``, en un subproceso con `servir.py` (gunicorn).
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    if workers:
+        process = subprocess.Popen(
+            [sys.executable, "servir.py", "--host", "127.0.0.1", "--puerto", str(port),
+             "--workers", str(workers), "--hilos", str(threads)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(base_url)
+            yield base_url
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        return
+
+    from werkzeug.serving import make_server
+    import dashboard
+
+    server = make_server('127.0.0.1', port, dashboard.server, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        _wait_ready(base_url)
+        yield base_url
+    finally:
+        server.shutdown()
+
+
+class Client:
+    """Cliente HTTP con conexión persistente (una por hilo) que registra cada petición."""
+
+    def __init__(self, base_url: str, compressed: bool = True):
+        parsed = urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.compressed = compressed
+        self.records: List[Tuple[str, float, int, bool]] = []
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(self, endpoint: str, method: str, path: str, payload: Any = None) -> Any:
+        """Hace una petición y devuelve el JSON de la respuesta (o None)."""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        if self.compressed:
+            headers['Accept-Encoding'] = 'gzip'
+
+        started = time.perf_counter()
+        data, ok = b'', False
+        try:
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            data = response.read()
+            ok = response.status < 400
+            encoding = response.getheader('Content-Encoding')
+        except (OSError, http.client.HTTPException):
+            self._conn = None
+            encoding = None
+        elapsed = time.perf_counter() - started
+        self.records.append((endpoint, elapsed, len(data), ok))
+
+        if not ok:
+            return None
+        if encoding == 'gzip':
+            data = gzip.decompress(data)
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+
+def _collect_components(node: Any, found: Dict[str, Dict[str, Any]]):
+    """Recorre el JSON de un layout de Dash y guarda las props de cada componente con id."""
+    if isinstance(node, list):
+        for child in node:
+            _collect_components(child, found)
+    elif isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict):
+            if isinstance(props.get('id'), str):
+                found[props['id']] = props
+            _collect_components(props.get('children'), found)
+        else:
+            for value in node.values():
+                _collect_components(value, found)
+
+
+def _parse_outputs(output: str) -> Any:
+    """Salidas de un callback en el formato de `_dash-update-component`."""
+    def single(spec: str) -> Dict[str, str]:
+        component_id, prop = spec.rsplit('.', 1)
+        return {'id': component_id, 'property': prop}
+
+    if output.startswith('..'):
+        return [single(spec) for spec in output.strip('.').split('...')]
+    return single(output)
+
+
+def callback_payload(dependency: Dict[str, Any], components: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Payload de un callback si todas sus entradas están en los componentes dados."""
+    inputs = []
+    for item in dependency.get('inputs', []):
+        props = components.get(item['id']) if isinstance(item.get('id'), str) else None
+        if props is None:
+            return None
+        inputs.append({'id': item['id'], 'property': item['property'], 'value': props.get(item['property'])})
+    state = [
+        {'id': item['id'], 'property': item['property'], 'value': components.get(item['id'], {}).get(item['property'])}
+        for item in dependency.get('state', [])
+    ]
+    return {
+        'output': dependency['output'],
+        'outputs': _parse_outputs(dependency['output']),
+        'inputs': inputs,
+        'state': state,
+        'changedPropIds': [],
+    }
+
+
+def run_session(client: Client, routes: List[str]):
+    """Una sesión: carga inicial y navegación de cada ruta con sus callbacks."""
+    client.request('GET /', 'GET', '/')
+    client.request('GET /_dash-layout', 'GET', '/_dash-layout')
+    dependencies = client.request('GET /_dash-dependencies', 'GET', '/_dash-dependencies') or []
+
+    for route in routes:
+        router = {
+            'output': ROUTER_OUTPUT,
+            'outputs': _parse_outputs(ROUTER_OUTPUT),
+            'inputs': [{'id': 'url', 'property': 'pathname', 'value': route}],
+            'changedPropIds': ['url.pathname'],
+        }
+        page = client.request(f"display_page {route}", 'POST', CALLBACK_PATH, router)
+        if page is None:
+            continue
+
+        components: Dict[str, Dict[str, Any]] = {}
+        _collect_components(page.get('response', {}), components)
+        for dependency in dependencies:
+            if dependency.get('output') == ROUTER_OUTPUT:
+                continue
+            payload = callback_payload(dependency, components)
+            if payload is not None:
+                client.request(f"callback {dependency['output']}", 'POST', CALLBACK_PATH, payload)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(records: List[Tuple[str, float, int, bool]], elapsed: float) -> Dict[str, Dict[str, Any]]:
+    """Peticiones por segundo, errores, bytes y percentiles de latencia (ms) por endpoint y en total."""
+    groups: Dict[str, List[Tuple[str, float, int, bool]]] = {}
+    for record in records:
+        groups.setdefault(record[0], []).append(record)
+    groups['TOTAL'] = list(records)
+
+    summary = {}
+    for endpoint, items in groups.items():
+        latencies = sorted(r[1] * 1000 for r in items)
+        summary[endpoint] = {
+            'requests': len(items),
+            'errors': sum(not r[3] for r in items),
+            'rps': round(len(items) / elapsed, 2) if elapsed else 0.0,
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            **{f"p{p}_ms": round(_percentile(latencies, p), 2) for p in PERCENTILES},
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'mean_bytes': round(sum(r[2] for r in items) / len(items)) if items else 0,
+        }
+    return summary
+
+
+def run_load_test(base_url: str, sessions: int, concurrency: int, routes: List[str] = ROUTES,
+                  compressed: bool = True, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Ejecuta ``sessions`` sesiones con ``concurrency`` clientes en paralelo.
+
+    Las ``warmup`` primeras sesiones (secuenciales) no se cuentan.
+    """
+    for _ in range(warmup):
+        run_session(Client(base_url, compressed), routes)
+
+    clients = [Client(base_url, compressed) for _ in range(concurrency)]
+    counter = iter(range(sessions))
+    lock = threading.Lock()
+
+    def worker(client: Client):
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            run_session(client, routes)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, clients))
+    elapsed = time.perf_counter() - started
+
+    records = [record for client in clients for record in client.records]
+    return {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'endpoints': summarize(records, elapsed),
+    }
+
+
+def print_summary(result: Dict[str, Any]):
+    """Muestra la tabla de resultados por endpoint."""
+    header = f"{'endpoint':<48} {'n':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'bytes':>8}"
+    print(header)
+    print('-' * len(header))
+    for endpoint, s in sorted(result['endpoints'].items(), key=lambda item: item[0] == 'TOTAL'):
+        print(f"{endpoint[:48]:<48} {s['requests']:>6} {s['errors']:>4} {s['rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8} {s['mean_bytes']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP del dashboard (sesiones por todas las rutas).")
+    parser.add_argument('--url', default=None, help="URL de un servidor ya levantado (por defecto se levanta uno local)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Levantar servir.py con N workers (por defecto, servidor multihilo en este proceso)")
+    parser.add_argument('--hilos', type=int, default=4, help="Hilos por worker con --workers")
+    parser.add_argument('--sesiones', type=int, default=20, help="Sesiones a ejecutar")
+    parser.add_argument('--concurrencia', type=int, default=4, help="Sesiones en paralelo")
+    parser.add_argument('--rutas', nargs='+', default=ROUTES, help="Rutas a navegar")
+    parser.add_argument('--sin-compresion', action='store_true', help="No pedir respuestas comprimidas")
+    parser.add_argument('--salida', type=Path, default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar el log del servidor")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+    @contextmanager
+    def target():
+        if args.url:
+            yield args.url.rstrip('/')
+        else:
+            with local_server(args.workers, args.hilos) as base_url:
+                yield base_url
+
+    with target() as base_url:
+        logger.info(f"🚀 {args.sesiones} sesiones, concurrencia {args.concurrencia}, contra {base_url}")
+        result = run_load_test(base_url, args.sesiones, args.concurrencia, args.rutas,
+                               compressed=not args.sin_compresion)
+
+    report = {
+        'benchmark': 'http',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'server': args.url or (f"servir.py ({args.workers} workers × {args.hilos} hilos)" if args.workers
+                               else "werkzeug multihilo (en proceso)"),
+        **result,
+    }
+    print_summary(result)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"📊 Resultados guardados en '{args.salida}'")
+    return 1 if result['endpoints']['TOTAL']['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
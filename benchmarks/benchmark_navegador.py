@@ -0,0 +1,293 @@
+"""
+Benchmark de rendimiento de las páginas en un navegador headless.
+
+Usa la misma configuración de Playwright que
+`jules-scratch/verification/verify_with_logs.py` (Chromium headless) y,
+para cada ruta del dashboard y cada repetición, mide:
+
+- ``layout_ms``: hasta que `#page-content` muestra el layout de la ruta;
+- ``charts_ms``: hasta que cada `dcc.Graph` tiene su figura dibujada y cada
+  iframe con contenido terminó de cargar (y de dibujar su gráfico Vega);
+- ``requests``, ``bytes`` y ``failed_requests``; ``external_requests`` cuenta
+  las peticiones a otros hosts (CDN), que no deberían existir;
+- ``js_heap_mb``: heap de JavaScript usado al terminar de dibujar.
+
+Cada repetición usa un contexto de navegador nuevo (caché fría), salvo con
+``--cache-caliente``. Los resultados (cada repetición y la mediana, mínimo
+y máximo por ruta) se guardan en JSON para comparar entre versiones.
+
+Requiere `pip install playwright` y `playwright install chromium`.
+
+Uso:
+    python -m benchmarks.benchmark_navegador --repeticiones 5
+    python -m benchmarks.benchmark_navegador --url http://127.0.0.1:8057 --rutas / /salud
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from benchmarks.benchmark_http import ROUTES, local_server
+
+try:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = Path("bench_navegador.json")
+DEFAULT_TIMEOUT_MS = 30000
+METRICS = ('layout_ms', 'charts_ms', 'dom_content_loaded_ms', 'load_ms', 'requests', 'bytes',
+           'failed_requests', 'external_requests', 'js_heap_mb')
+
+# Devuelve performance.now() cuando la ruta ya pintó su layout
+LAYOUT_READY_JS = """
+() => {
+  const root = document.getElementById('page-content');
+  return root && root.children.length > 0 ? performance.now() : false;
+}
+"""
+
+# Devuelve performance.now() cuando todos los gráficos de la página están dibujados.
+# Un dcc.Graph sin figura muestra unos ejes vacíos: se espera a que tenga trazas o
+# anotaciones. Los iframes sin src/srcdoc no tienen nada que cargar y no se esperan.
+CHARTS_READY_JS = """
+() => {
+  const root = document.getElementById('page-content');
+  if (!root || root.children.length === 0) return false;
+  const graphsReady = [...root.querySelectorAll('.dash-graph')].every(g => {
+    const gd = g.querySelector('.js-plotly-plot');
+    if (!gd || !gd.querySelector('.main-svg')) return false;
+    const annotations = (gd.layout && gd.layout.annotations) || [];
+    return (gd.data && gd.data.length > 0) || annotations.length > 0;
+  });
+  const framesReady = [...root.querySelectorAll('iframe')].every(f => {
+    if (!f.getAttribute('srcdoc') && !f.getAttribute('src')) return true;
+    const doc = f.contentDocument;
+    if (!doc || doc.readyState !== 'complete') return false;
+    const vis = doc.querySelector('.vega-embed, #vis');
+    return !vis || !!vis.querySelector('canvas, svg');
+  });
+  return graphsReady && framesReady ? performance.now() : false;
+}
+"""
+
+PAGE_STATS_JS = """
+() => {
+  const root = document.getElementById('page-content');
+  const nav = performance.getEntriesByType('navigation')[0];
+  const frames = root ? [...root.querySelectorAll('iframe')] : [];
+  return {
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav ? nav.loadEventEnd : null,
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+    graphs: root ? root.querySelectorAll('.dash-graph').length : 0,
+    iframes: frames.length,
+    empty_iframes: frames.filter(f => !f.getAttribute('srcdoc') && !f.getAttribute('src')).length,
+  };
+}
+"""
+
+
+async def _wait_for_time(page, script: str, timeout_ms: int) -> Optional[float]:
+    """Espera a que ``script`` devuelva un instante de performance.now(); None si vence."""
+    try:
+        handle = await page.wait_for_function(script, polling='raf', timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        return None
+    return round(await handle.json_value(), 1)
+
+
+async def measure_route(context, base_url: str, route: str, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> Dict[str, Any]:
+    """Carga una ruta en una página nueva del contexto y devuelve sus métricas."""
+    page = await context.new_page()
+    finished, failed = [], []
+    page.on("requestfinished", finished.append)
+    page.on("requestfailed", failed.append)
+    page.on("console", lambda msg: logger.debug(f"CONSOLE {route}: {msg.text}"))
+
+    try:
+        await page.goto(f"{base_url}{route}", wait_until='commit', timeout=timeout_ms)
+        layout_ms = await _wait_for_time(page, LAYOUT_READY_JS, timeout_ms)
+        charts_ms = await _wait_for_time(page, CHARTS_READY_JS, timeout_ms) if layout_ms is not None else None
+        # Las peticiones que se cierran justo después del último dibujo también cuentan
+        try:
+            await page.wait_for_load_state('networkidle', timeout=timeout_ms)
+        except PlaywrightTimeoutError:
+            logger.warning(f"⚠️ {route}: la red no quedó inactiva en {timeout_ms} ms")
+        stats = await page.evaluate(PAGE_STATS_JS)
+
+        total_bytes = 0
+        for request in finished:
+            sizes = await request.sizes()
+            total_bytes += sizes['responseHeadersSize'] + sizes['responseBodySize']
+    finally:
+        await page.close()
+
+    host = urlparse(base_url).netloc
+    requests = finished + failed
+    heap = stats.pop('js_heap_bytes')
+    return {
+        'layout_ms': layout_ms,
+        'charts_ms': charts_ms,
+        'timed_out': charts_ms is None,
+        'requests': len(requests),
+        'bytes': total_bytes,
+        'failed_requests': len(failed),
+        'external_requests': sum(urlparse(r.url).netloc not in (host, '') and not r.url.startswith('data:')
+                                 for r in requests),
+        'js_heap_mb': round(heap / 1024 ** 2, 2) if heap is not None else None,
+        **stats,
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mediana, mínimo y máximo de cada métrica entre repeticiones."""
+    summary = {'runs': len(runs), 'timeouts': sum(run['timed_out'] for run in runs)}
+    for metric in METRICS:
+        values = [run[metric] for run in runs if run.get(metric) is not None]
+        if values:
+            summary[metric] = {
+                'median': round(statistics.median(values), 2),
+                'min': round(min(values), 2),
+                'max': round(max(values), 2),
+            }
+    return summary
+
+
+async def run_benchmark(base_url: str, routes: List[str], repetitions: int, warm_cache: bool = False,
+                        block_external: bool = False, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> Dict[str, Any]:
+    """
+    Mide cada ruta ``repetitions`` veces.
+
+    Args:
+        base_url: URL base del dashboard
+        routes: Rutas a medir
+        repetitions: Repeticiones por ruta
+        warm_cache: Reutilizar un contexto (caché HTTP caliente) tras una carga previa sin contar
+        block_external: Abortar las peticiones a otros hosts, para medir sin red
+        timeout_ms: Tiempo máximo de espera de cada fase
+
+    Returns:
+        Dict[str, Any]: Repeticiones y resumen por ruta
+    """
+    host = urlparse(base_url).netloc
+    results = {}
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def abort(route):
+            await route.abort()
+
+        async def new_context():
+            context = await browser.new_context()
+            if block_external:
+                await context.route(lambda url: urlparse(url).netloc not in (host, ''), abort)
+            return context
+
+        try:
+            for route in routes:
+                runs = []
+                context = await new_context() if warm_cache else None
+                if warm_cache:
+                    await measure_route(context, base_url, route, timeout_ms)
+                for i in range(repetitions):
+                    run_context = context or await new_context()
+                    run = await measure_route(run_context, base_url, route, timeout_ms)
+                    if context is None:
+                        await run_context.close()
+                    runs.append(run)
+                    logger.info(f"   {route} #{i + 1}: layout {run['layout_ms']} ms, gráficos {run['charts_ms']} ms, "
+                                f"{run['requests']} peticiones ({run['bytes'] / 1024:.0f} KB), "
+                                f"heap {run['js_heap_mb']} MB")
+                if context is not None:
+                    await context.close()
+                results[route] = {'summary': summarize(runs), 'runs': runs}
+        finally:
+            await browser.close()
+
+    return results
+
+
+def print_summary(results: Dict[str, Any]):
+    """Muestra las medianas por ruta."""
+    header = f"{'ruta':<14} {'layout':>8} {'gráficos':>9} {'peticiones':>10} {'KB':>8} {'externas':>8} {'heap MB':>8} {'timeouts':>8}"
+    print(header)
+    print('-' * len(header))
+    for route, result in results.items():
+        s = result['summary']
+
+        def median(metric):
+            return s.get(metric, {}).get('median', '-')
+
+        kb = round(median('bytes') / 1024, 1) if 'bytes' in s else '-'
+        print(f"{route:<14} {median('layout_ms'):>8} {median('charts_ms'):>9} {median('requests'):>10} "
+              f"{kb:>8} {median('external_requests'):>8} {median('js_heap_mb'):>8} {s['timeouts']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las páginas del dashboard en Chromium headless.")
+    parser.add_argument('--url', default=None, help="URL de un servidor ya levantado (por defecto se levanta uno local)")
+    parser.add_argument('--rutas', nargs='+', default=ROUTES, help="Rutas a medir")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Repeticiones por ruta")
+    parser.add_argument('--cache-caliente', action='store_true', help="Medir con la caché HTTP del navegador caliente")
+    parser.add_argument('--bloquear-externos', action='store_true', help="Abortar las peticiones a otros hosts (CDN)")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT_MS, help="Espera máxima por fase, en ms")
+    parser.add_argument('--salida', type=Path, default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar el log del servidor y la consola del navegador")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+    if not PLAYWRIGHT_AVAILABLE:
+        logger.error("❌ Playwright no está instalado: pip install playwright && playwright install chromium")
+        return 1
+
+    started = time.perf_counter()
+    if args.url:
+        base_url = args.url.rstrip('/')
+        results = asyncio.run(run_benchmark(base_url, args.rutas, args.repeticiones, args.cache_caliente,
+                                            args.bloquear_externos, args.timeout))
+    else:
+        with local_server() as base_url:
+            results = asyncio.run(run_benchmark(base_url, args.rutas, args.repeticiones, args.cache_caliente,
+                                                args.bloquear_externos, args.timeout))
+
+    report = {
+        'benchmark': 'navegador',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'url': args.url,
+        'repetitions': args.repeticiones,
+        'warm_cache': args.cache_caliente,
+        'block_external': args.bloquear_externos,
+        'duration_s': round(time.perf_counter() - started, 2),
+        'routes': results,
+    }
+    print_summary(results)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"📊 Resultados guardados en '{args.salida}'")
+    return 1 if any(result['summary']['timeouts'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
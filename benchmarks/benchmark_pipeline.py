@@ -0,0 +1,181 @@
+"""
+Benchmark de extremo a extremo del pipeline de datos.
+
+Para cada factor de escala genera un libro sintético y mide, etapa por
+etapa, el tiempo real, el tiempo de CPU y el pico de memoria de:
+
+- ``generar``: creación del libro sintético
+- ``generar_modelos``: el mismo libro en el formato de hojas de `DataProcessor`
+- ``preparar_datos``: ``preparar_datos.main`` (Excel -> data/clean)
+- ``data_processor``: ``DataProcessor.process`` (validación con Pydantic)
+- ``loader``: ``DataLoader.load_all_data`` sobre la salida de preparar_datos
+
+Una etapa que no produce filas cuenta como fallida: mediría solo la
+lectura y el rechazo de los datos. Los resultados se guardan en JSON para
+compararlos entre versiones.
+
+Uso:
+    python -m benchmarks.benchmark_pipeline --escalas 10 100 1000 --salida bench_pipeline.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from benchmarks.generar_libro_sintetico import TEMPLATE_FILE, generate_workbook
+from utils.profiling import max_rss_mb, measure
+from utils.storage import read_manifest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = [10, 100, 1000]
+DEFAULT_OUTPUT = Path("bench_pipeline.json")
+
+
+def _run_stage(name: str, func, stages: List[Dict[str, Any]], **fields) -> Any:
+    """Ejecuta una etapa midiendo su costo; los errores quedan registrados."""
+    result = None
+    with measure(name, **fields) as record:
+        try:
+            result = func(record)
+            if record.get('rows_out') == 0:
+                raise RuntimeError(f"La etapa '{name}' no produjo filas")
+            record['ok'] = True
+        except Exception as e:
+            logger.error(f"❌ Etapa '{name}' falló: {e}", exc_info=True)
+            record['ok'] = False
+            record['error'] = f"{type(e).__name__}: {e}"
+    stages.append(record)
+    logger.info(f"⏱️ {name}: {record['wall_s']}s, pico {record['peak_mb']} MB")
+    return result
+
+
+def _dir_size(path: Path) -> int:
+    """Bytes totales de los archivos de un directorio."""
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+
+def benchmark_scale(factor: int, work_dir: Path, template_file: Path = TEMPLATE_FILE) -> Dict[str, Any]:
+    """
+    Ejecuta todas las etapas para un factor de escala.
+
+    Returns:
+        Dict[str, Any]: Resultado con filas de entrada y métricas por etapa
+    """
+    import preparar_datos
+    from utils.loader import DataLoader
+
+    work_dir = Path(work_dir) / f"{factor}x"
+    excel_file = work_dir / f"sintetico_{factor}x.xlsx"
+    model_file = work_dir / f"sintetico_{factor}x_modelos.xlsx"
+    clean_dir = work_dir / "clean"
+    validated_dir = work_dir / "validated"
+    stages: List[Dict[str, Any]] = []
+
+    def generar(record):
+        rows = generate_workbook(excel_file, factor, template_file)
+        record['rows_out'] = sum(rows.values())
+        record['bytes_out'] = excel_file.stat().st_size
+        return rows
+
+    rows = _run_stage('generar', generar, stages) or {}
+
+    def generar_modelos(record):
+        model_rows = generate_workbook(model_file, factor, template_file, formato='modelos')
+        record['rows_out'] = sum(model_rows.values())
+        record['bytes_out'] = model_file.stat().st_size
+        return model_rows
+
+    model_rows = _run_stage('generar_modelos', generar_modelos, stages) or {}
+
+    def preparar(record):
+        if not preparar_datos.main(excel_file, clean_dir, work_dir / "history", work_dir / "artifacts"):
+            raise RuntimeError("preparar_datos.main no publicó datos")
+        record['bytes_out'] = _dir_size(clean_dir)
+        record['rows_out'] = sum(entry.get('rows', 0) for entry in read_manifest(clean_dir).get('datasets', {}).values())
+
+    _run_stage('preparar_datos', preparar, stages, rows_in=sum(rows.values()))
+
+    def procesar(record):
+        from data_processor import DataProcessor
+        processor = DataProcessor(str(model_file), str(validated_dir), track_memory=False)
+        processed = processor.process()
+        record['rows_out'] = sum(len(df) for df in processed.values())
+        record['substages'] = processor.get_metrics_summary()['stages']
+
+    _run_stage('data_processor', procesar, stages, rows_in=sum(model_rows.values()))
+
+    def cargar(record):
+        data = DataLoader(str(clean_dir)).load_all_data()
+        record['rows_out'] = sum(len(df) for df in data.values())
+
+    _run_stage('loader', cargar, stages)
+
+    return {
+        'scale': factor,
+        'input_bytes': excel_file.stat().st_size if excel_file.exists() else 0,
+        'input_rows': rows,
+        'model_rows': model_rows,
+        'stages': stages,
+    }
+
+
+def run_benchmark(scales: List[int], work_dir: Path, template_file: Path = TEMPLATE_FILE) -> Dict[str, Any]:
+    """Ejecuta el benchmark para cada escala y devuelve el informe completo."""
+    results = []
+    for factor in scales:
+        logger.info(f"🚀 Benchmark a escala {factor}x...")
+        results.append(benchmark_scale(factor, work_dir, template_file))
+
+    return {
+        'benchmark': 'pipeline',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'max_rss_mb': round(max_rss_mb(), 2),
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de datos con libros sintéticos.")
+    parser.add_argument('--escalas', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Factores de escala a medir (default: 10 100 1000)")
+    parser.add_argument('--salida', type=Path, default=DEFAULT_OUTPUT, help="Archivo JSON de resultados")
+    parser.add_argument('--plantilla', type=Path, default=TEMPLATE_FILE, help="Libro de Excel plantilla")
+    parser.add_argument('--directorio', type=Path, default=None,
+                        help="Directorio de trabajo (por defecto uno temporal que se elimina)")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar el log de cada etapa")
+    args = parser.parse_args()
+
+    # Los módulos del pipeline registran cada hoja en INFO; se silencian salvo --verbose
+    logging.basicConfig(level=logging.INFO)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+    if args.directorio:
+        report = run_benchmark(args.escalas, args.directorio, args.plantilla)
+    else:
+        with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp:
+            report = run_benchmark(args.escalas, Path(tmp), args.plantilla)
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"📊 Resultados guardados en '{args.salida}'")
+
+    failed = [s['stage'] for r in report['results'] for s in r['stages'] if not s['ok']]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Generador de libros de Excel sintéticos con los mismos esquemas del real.
+
+Toma como plantilla `Indicadores generalidades oficial.xlsx` y multiplica
+por un factor de escala las hojas que crecen con la cobertura territorial y
+temporal:
+
+- Hojas de salud de 18 columnas (ITEM ... Observaciones): nuevos indicadores.
+- Deserción por municipio y año: nuevos municipios.
+- Generalidades y Seguridad: nuevos indicadores.
+
+El resto de hojas se copian sin cambios. Los valores numéricos se alteran
+con un ruido reproducible a partir de una semilla.
+
+Con ``--formato modelos`` el libro sigue en cambio el formato que espera
+`DataProcessor`: una hoja por clave de `DataValidator.SHEET_MODEL_MAPPING`
+(ej. ``generalidades``, ``morbilidad``) con las columnas de su modelo
+Pydantic, derivada de las mismas hojas escaladas. Así la validación procesa
+todas las filas en lugar de rechazar las hojas por no tener modelo.
+
+Uso:
+    python -m benchmarks.generar_libro_sintetico --escala 100 --salida sintetico_100x.xlsx
+    python -m benchmarks.generar_libro_sintetico --escala 100 --formato modelos
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+TEMPLATE_FILE = Path("Indicadores generalidades oficial.xlsx")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+logger = logging.getLogger(__name__)
+
+# Columnas que identifican cada fila y se vuelven únicas en cada copia
+HEALTH_KEY_COLUMNS = ('ITEM', 'Indicador')
+DESERCION_SHEET = 'Tasa Deserción Sector Oficial'
+INDICADOR_SHEETS = ('Generalidades', 'Seguridad')
+
+# Columnas numéricas que no deben alterarse con ruido
+STABLE_COLUMNS = {'ITEM', 'Año', 'Año de creación', 'Año de baja', 'RankingNacional2025'}
+
+FORMATS = ('dashboard', 'modelos')
+# Campos de los modelos de salud (ver models/morbilidad.py), en el orden de las 18 columnas
+HEALTH_FIELDS = (
+    'item', 'sector', 'programa', 'tema', 'subtema', 'dimension', 'variables', 'indicador',
+    'tipo_de_medida', 'nivel_de_desagregacion', 'año', 'valor', 'estado', 'año_de_creacion',
+    'año_de_baja', 'fuente_indicador', 'periodo_tiempo', 'observaciones',
+)
+DEFAULT_TEXT = 'Sin dato'
+DEFAULT_YEAR = 2024
+
+
+def _is_health_sheet(df: pd.DataFrame) -> bool:
+    """Las hojas de salud comparten la estructura de 18 columnas con ITEM."""
+    return len(df.columns) == 18 and all(col in df.columns for col in HEALTH_KEY_COLUMNS)
+
+
+def _jitter(df: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Aplica un ruido multiplicativo de ±20% a las columnas numéricas."""
+    for col in df.columns:
+        if col in STABLE_COLUMNS or not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        noise = rng.uniform(0.8, 1.2, size=len(df))
+        values = df[col] * noise
+        df[col] = values.round() if pd.api.types.is_integer_dtype(df[col]) else values
+    return df
+
+
+def _scale_health(df: pd.DataFrame, factor: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Replica los indicadores de una hoja de salud con ITEM e Indicador únicos."""
+    item_step = int(pd.to_numeric(df['ITEM'], errors='coerce').max() or 0) + 1
+    copies = []
+    for k in range(factor):
+        copy = _jitter(df.copy(), rng) if k else df.copy()
+        if k:
+            copy['ITEM'] = pd.to_numeric(copy['ITEM'], errors='coerce') + k * item_step
+            copy['Indicador'] = copy['Indicador'].astype(str) + f" (sintético {k})"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _scale_desercion(df: pd.DataFrame, factor: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Replica la deserción por año con municipios sintéticos y recalcula la tasa."""
+    copies = []
+    for k in range(factor):
+        copy = df.copy()
+        if k:
+            copy['Municipio'] = copy['Municipio'].astype(str) + f" {k}"
+            copy = _jitter(copy, rng)
+            desertores = pd.to_numeric(copy['Desertores'], errors='coerce')
+            matricula = pd.to_numeric(copy['Matrícula'], errors='coerce')
+            tasa = (desertores / matricula.where(matricula > 0) * 100).round(2)
+            copy['Tasa Deserción'] = tasa.map(lambda v: f"{v:.2f}%" if pd.notna(v) else None)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _scale_indicadores(df: pd.DataFrame, factor: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Replica una hoja de indicadores con nombres de indicador únicos."""
+    copies = []
+    for k in range(factor):
+        copy = df.copy()
+        if k:
+            copy['Indicador'] = copy['Indicador'].astype(str) + f" (sintético {k})"
+            copy = _jitter(copy, rng)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def generate_sheets(template: Dict[str, pd.DataFrame], factor: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Escala las hojas de un libro plantilla.
+
+    Args:
+        template: Hojas del libro real (nombre de hoja -> DataFrame)
+        factor: Factor de escala (1 = mismas filas que la plantilla)
+        seed: Semilla del generador de ruido
+
+    Returns:
+        Dict[str, pd.DataFrame]: Hojas sintéticas con los mismos esquemas
+    """
+    if factor < 1:
+        raise ValueError(f"El factor de escala debe ser >= 1, recibido: {factor}")
+
+    rng = np.random.default_rng(seed)
+    sheets = {}
+
+    for sheet_name, df in template.items():
+        if _is_health_sheet(df):
+            sheets[sheet_name] = _scale_health(df, factor, rng)
+        elif sheet_name == DESERCION_SHEET:
+            sheets[sheet_name] = _scale_desercion(df, factor, rng)
+        elif sheet_name in INDICADOR_SHEETS and 'Indicador' in df.columns:
+            sheets[sheet_name] = _scale_indicadores(df, factor, rng)
+        else:
+            sheets[sheet_name] = df.copy()
+
+    return sheets
+
+
+# --- Formato de DataProcessor (una hoja por modelo Pydantic) ---
+
+def _text(series: pd.Series, default: str = DEFAULT_TEXT) -> pd.Series:
+    """Texto sin vacíos: los modelos no aceptan nulos en campos de texto."""
+    text = series.astype('string').str.strip()
+    return text.mask(text.isna() | (text == ''), default).astype(object)
+
+
+def _number(series: pd.Series, default: float = 0.0, lower: float = 0.0, upper: float = None) -> pd.Series:
+    """Número dentro del rango del modelo (las fechas que Excel inventó cuentan como faltantes)."""
+    values = pd.to_numeric(series, errors='coerce').astype(float).abs().fillna(default)
+    return values.clip(lower=lower, upper=upper)
+
+
+def _year(series: pd.Series) -> pd.Series:
+    """Año entero en el rango 2000-2030 de los modelos."""
+    years = pd.to_numeric(series, errors='coerce').fillna(DEFAULT_YEAR)
+    return years.where(years.between(2000, 2030), DEFAULT_YEAR).astype(int)
+
+
+def _percentages(series: pd.Series) -> pd.Series:
+    """Tasa en texto (``2.49%``) o número como proporción entre 0 y 1."""
+    text = series.astype('string').str.strip()
+    percent = pd.to_numeric(text.str.rstrip('%'), errors='coerce') / 100
+    return percent.fillna(0.0).clip(0, 1)
+
+
+def _health_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Hoja de salud de 18 columnas con los nombres de campo del modelo."""
+    df = df.set_axis(list(HEALTH_FIELDS), axis=1)
+    for field in ('item', 'valor', 'año_de_creacion', 'año_de_baja'):
+        df[field] = _number(df[field]).round().astype(int)
+    df['item'] = df['item'].clip(lower=1)
+    df['año'] = _year(df['año'])
+    for field in HEALTH_FIELDS:
+        if field not in ('item', 'valor', 'año', 'año_de_creacion', 'año_de_baja'):
+            df[field] = _text(df[field])
+    return df
+
+
+def _model_generalidades(sheets, rng) -> pd.DataFrame:
+    df = sheets['Generalidades']
+    ranking = pd.to_numeric(df['RankingNacional2025'], errors='coerce')
+    return pd.DataFrame({
+        'pilar_competitividad': _text(df['Pilar_Competitividad']),
+        'indicador': _text(df['Indicador']),
+        'año': _year(df['Año']),
+        'valor': _number(df['Valor']),
+        'unidad': _text(df['Unidad']),
+        # Sin ranking se usa 50 (el modelo acepta 1-50 y Excel no guarda nulos tipados)
+        'ranking_nacional': ranking.where(ranking.between(1, 50), 50).astype(int),
+        'fuente': _text(df['Fuente']),
+    })
+
+
+def _model_sector_economico(sheets, rng) -> pd.DataFrame:
+    df = sheets['Sector Economico']
+    return pd.DataFrame({
+        'sector_economico': _text(df.iloc[:, 0]),
+        'participacion_porcentual': _number(df.iloc[:, 1], upper=100),
+        'valor_aproximado_cop_billones': _number(df.iloc[:, 2]),
+    })
+
+
+def _model_empresarial(sheets, rng) -> pd.DataFrame:
+    df = sheets['Empresarial']
+    return pd.DataFrame({
+        'tamano_de_empresa': _text(df.iloc[:, 0]),
+        'numero_de_empresas': _number(df.iloc[:, 1]).round().astype(int),
+        'porcentaje_del_total': _number(df.iloc[:, 2], upper=100),
+    })
+
+
+def _model_ciclo_vital(sheets, rng) -> pd.DataFrame:
+    df = sheets['Ciclo vital']
+    return pd.DataFrame({
+        'ciclo_vital': _text(df.iloc[:, 0]),
+        'poblacion': _number(df.iloc[:, 1]),
+        'peso_relativo': _number(df.iloc[:, 2], upper=1),
+    })
+
+
+def _model_municipios(sheets, rng) -> pd.DataFrame:
+    df = sheets['Numero de empresas por municipi']
+    return pd.DataFrame({
+        'municipio': _text(df.iloc[:, 0]),
+        'numero_de_empresas': _number(df.iloc[:, 1]),
+        'porcentaje_del_total': _number(df.iloc[:, 2], upper=100),
+    })
+
+
+def _model_seguridad(sheets, rng) -> pd.DataFrame:
+    """Casos de cada indicador de seguridad en 2024 y, con ruido, en 2023."""
+    df = sheets['Seguridad']
+    casos_2024 = _number(df['Valor']).round().astype(int)
+    casos_2023 = (casos_2024 * rng.uniform(0.8, 1.2, size=len(df))).round().astype(int)
+    variacion = ((casos_2024 - casos_2023) / casos_2023.where(casos_2023 > 0) * 100).fillna(0.0).round(2)
+    return pd.DataFrame({
+        'tipo_delito': _text(df['Indicador']),
+        'casos_2023': casos_2023,
+        'casos_2024': casos_2024,
+        'variacion_porcentual': variacion,
+        'tendencia': np.select([variacion > 1, variacion < -1], ['Aumento', 'Disminución'], 'Estable'),
+        'impacto': np.select([variacion.abs() > 10, variacion.abs() > 5], ['Alto', 'Medio'], 'Bajo'),
+        'observaciones': _text(df['Fuente']),
+    })
+
+
+def _model_morbilidad(sheets, rng) -> pd.DataFrame:
+    return _health_frame(sheets['MORBILIDAD1'])
+
+
+def _model_graduados(sheets, rng) -> pd.DataFrame:
+    df = sheets['Graduados profesion']
+    porcentaje = _number(df.iloc[:, 2])
+    return pd.DataFrame({
+        'area_de_conocimiento': _text(df.iloc[:, 0]),
+        'numero_de_graduados': _number(df.iloc[:, 1]).round().astype(int),
+        # La hoja guarda proporciones; el modelo espera porcentajes
+        'porcentaje_del_total': (porcentaje * 100).where(porcentaje <= 1, porcentaje).clip(upper=100),
+    })
+
+
+def _model_desercion(sheets, rng) -> pd.DataFrame:
+    df = sheets[DESERCION_SHEET]
+    return pd.DataFrame({
+        'municipio': _text(df['Municipio']),
+        'año': _year(df['Año']),
+        'tasa_desercion': _percentages(df['Tasa Deserción']),
+        'sector': 'Oficial',
+        'observaciones': DEFAULT_TEXT,
+    })
+
+
+def _model_estructura_demografica(sheets, rng) -> pd.DataFrame:
+    df = _health_frame(sheets['ESTRUCTURA DEMOGRAFICA'])
+    return df[['indicador', 'valor']]
+
+
+def _model_calidad_agua(sheets, rng) -> pd.DataFrame:
+    """IRCA por año; los conteos de municipios por riesgo son sintéticos."""
+    df = sheets['CALIDAD DEL AGUA']
+    n = len(df)
+    return pd.DataFrame({
+        'año': _year(df['Año']),
+        'indice_riesgo_calidad_agua': _number(df['Valor']),
+        'municipios_sin_riesgo': rng.integers(0, 19, size=n),
+        'municipios_riesgo_medio': rng.integers(0, 10, size=n),
+        'municipios_riesgo_alto': rng.integers(0, 5, size=n),
+    })
+
+
+# Hoja del formato de DataProcessor → constructor a partir de las hojas escaladas
+MODEL_SHEET_BUILDERS: Dict[str, Callable[[Dict[str, pd.DataFrame], np.random.Generator], pd.DataFrame]] = {
+    'generalidades': _model_generalidades,
+    'sector_economico': _model_sector_economico,
+    'empresarial': _model_empresarial,
+    'ciclo_vital': _model_ciclo_vital,
+    'municipios': _model_municipios,
+    'seguridad': _model_seguridad,
+    'morbilidad': _model_morbilidad,
+    'graduados': _model_graduados,
+    'desercion': _model_desercion,
+    'estructura_demografica': _model_estructura_demografica,
+    'calidad_agua': _model_calidad_agua,
+}
+
+
+def generate_model_sheets(template: Dict[str, pd.DataFrame], factor: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Escala la plantilla y la convierte al formato de `DataProcessor`.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Una hoja por modelo, con los nombres de campo como columnas
+    """
+    sheets = generate_sheets(template, factor, seed)
+    rng = np.random.default_rng(seed + 1)
+    return {name: build(sheets, rng) for name, build in MODEL_SHEET_BUILDERS.items()}
+
+
+def generate_workbook(output_file: Path, factor: int, template_file: Path = TEMPLATE_FILE,
+                      seed: int = 42, formato: str = 'dashboard') -> Dict[str, int]:
+    """
+    Genera un libro de Excel sintético escalado a partir de la plantilla.
+
+    Args:
+        formato: ``dashboard`` (hojas del libro real, para preparar_datos) o
+            ``modelos`` (hojas de `DataProcessor`)
+
+    Returns:
+        Dict[str, int]: Filas generadas por hoja
+    """
+    if formato not in FORMATS:
+        raise ValueError(f"Formato desconocido: {formato} (opciones: {', '.join(FORMATS)})")
+    template = pd.read_excel(template_file, sheet_name=None)
+    if formato == 'modelos':
+        sheets = generate_model_sheets(template, factor, seed)
+    else:
+        sheets = generate_sheets(template, factor, seed)
+
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    rows = {sheet_name: len(df) for sheet_name, df in sheets.items()}
+    logger.info(f"📄 Libro sintético {factor}x ({formato}) guardado en '{output_file}' ({sum(rows.values())} filas)")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un libro de Excel sintético escalado.")
+    parser.add_argument('--escala', type=int, default=10, help="Factor de escala (default: 10)")
+    parser.add_argument('--salida', type=Path, default=None, help="Archivo .xlsx de salida")
+    parser.add_argument('--plantilla', type=Path, default=TEMPLATE_FILE, help="Libro de Excel plantilla")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del ruido aleatorio")
+    parser.add_argument('--formato', choices=FORMATS, default='dashboard',
+                        help="Hojas del libro real (dashboard) o de los modelos de DataProcessor (modelos)")
+    args = parser.parse_args()
+
+    suffix = '' if args.formato == 'dashboard' else f"_{args.formato}"
+    output_file = args.salida or Path(f"sintetico_{args.escala}x{suffix}.xlsx")
+    generate_workbook(output_file, args.escala, args.plantilla, args.semilla, args.formato)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    main()
@@ -4,45 +4,69 @@ Framework: Dash + Altair + Pydantic
 Arquitectura: Multi-página con sidebar fijo
 """
 
+# Primero, para medir el arranque completo (ver utils/startup.py)
+from utils.startup import PROFILE
+
+import importlib
+import logging
+import time
+
 import dash
 from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
-import altair as alt
-import pandas as pd
-import numpy as np
-from pathlib import Path
-import logging
 
 # Importar módulos de la aplicación
 from utils.loader import get_data_loader
-# Los imports de los gráficos se harán directamente en los callbacks
+from utils.compression import CompressedCache, install_compression
+from utils.metrics import install_metrics, timed_callback
+from utils.health import install_health
+from utils.assets import VENDOR_IGNORE, install_static_assets, vendor_stylesheets
+from utils.callback_cache import cached_callback
+# Los renderizadores (Plotly, Altair) y las páginas se importan al usarse por primera vez
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configurar Altair
-alt.data_transformers.enable('json')
-alt.themes.enable('default')
-
-# Inicializar aplicación Dash
-app = dash.Dash(
-    __name__,
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap"
-    ],
-    suppress_callback_exceptions=True
-)
+PROFILE.mark('imports')
+
+# Inicializar aplicación Dash (Bootstrap e Inter servidos desde assets/vendor, sin CDN)
+with PROFILE.phase('app'):
+    app = dash.Dash(
+        __name__,
+        external_stylesheets=vendor_stylesheets(),
+        assets_ignore=VENDOR_IGNORE,
+        suppress_callback_exceptions=True
+    )
 
 app.title = "🏛️ Dashboard de Competitividad de Casanare"
 
-# Cargar datos una sola vez al inicio
+# Aplicación WSGI para servidores de producción (ver servir.py)
+server = app.server
+
+# Estado del precalentamiento del proceso (ver warm_up y /readyz)
+warm_state = {'version': None, 'done': False, 'duration_s': None, 'figures': {}}
+
+# Cargar datos una sola vez al inicio; /healthz y /readyz se publican antes
+# para que /readyz responda 503 "loading" durante la carga y el precalentamiento
 logger.info("🚀 Cargando datos...")
 data_loader = get_data_loader()
-data_loader.load_all_data()
+install_health(server, data_loader, warm_state)
+with PROFILE.phase('data_load'):
+    data_loader.load_all_data()
 logger.info("✅ Datos cargados exitosamente")
 
+# Métricas en /metrics (antes que la compresión, para medir la respuesta final)
+compression_cache = CompressedCache()
+install_metrics(server, loader=data_loader, compression_cache=compression_cache)
+
+# Respuestas comprimidas y con ETag; la caché de cuerpos comprimidos se
+# invalida con cada versión de datos publicada
+install_compression(server, version=lambda: data_loader.data_version, cache=compression_cache)
+
+# Bootstrap, Inter y Vega con caché inmutable y precarga
+install_static_assets(server)
+
 # 🏗️ LAYOUT PRINCIPAL
 app.layout = html.Div([
     dcc.Location(id="url", refresh=False),
@@ -97,243 +121,28 @@ app.layout = html.Div([
     html.Div(id="page-content", style={'marginLeft': '250px', 'padding': '2rem'})
 ])
 
-# 🏠 PÁGINA DE INICIO
-def create_home_page() -> dbc.Container:
-    """
-    Genera el layout para la página de inicio (Panorama General).
-
-    Esta página muestra los KPIs más importantes y una selección de
-    visualizaciones clave de diferentes áreas para ofrecer un resumen
-    rápido del estado de competitividad de Casanare.
-
-    Returns:
-        dbc.Container: El componente de layout para la página de inicio.
-    """
-    kpis = data_loader.get_kpis()
-    empresas_total = data_loader.get_empresas_total()
-    
-    return dbc.Container([
-        html.H1("🏛️ Dashboard de Competitividad de Casanare", 
-               style={'color': '#1f77b4', 'marginBottom': '2rem', 'textAlign': 'center'}),
-        
-        # KPIs Principales
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.H4("👥 Población", className="text-center"),
-                        html.H2(f"{kpis.get('poblacion', 0):,}", className="text-center", 
-                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
-                    ])
-                ])
-            ], width=3),
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.H4("💰 PIB", className="text-center"),
-                        html.H2(f"${kpis.get('pib', 0)/1000000:.1f}B", className="text-center", 
-                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
-                    ])
-                ])
-            ], width=3),
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.H4("🏢 Empresas", className="text-center"),
-                        html.H2(f"{empresas_total:,}", className="text-center", 
-                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
-                    ])
-                ])
-            ], width=3),
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardBody([
-                        html.H4("🏆 Ranking", className="text-center"),
-                        html.H2(f"#{kpis.get('ranking_idc', 0)}", className="text-center", 
-                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
-                    ])
-                ])
-            ], width=3)
-        ], className="mb-4"),
-        
-        # Visualizaciones principales
-        dbc.Row([
-            dbc.Col([
-                html.H3("📊 Sectores Económicos", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                dcc.Graph(id="grafico-sectores")
-            ], width=6),
-            dbc.Col([
-                html.H3("🏢 Distribución Empresarial", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                dcc.Graph(id="grafico-empresas")
-            ], width=6)
-        ], className="mb-4"),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("🎓 Graduados por Área", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                dcc.Graph(id="grafico-graduados")
-            ], width=6),
-            dbc.Col([
-                html.H3("🩺 Evolución de Dengue", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                dcc.Graph(id="grafico-dengue")
-            ], width=6)
-        ])
-    ], fluid=True)
-
-# 📊 PÁGINA ECONÓMICA
-def create_economic_page() -> dbc.Container:
-    """
-    Genera el layout para la página de Perfil Económico.
-
-    Esta sección se enfoca en la estructura económica del departamento,
-    incluyendo la composición del PIB y la productividad de sectores clave.
-
-    Returns:
-        dbc.Container: El componente de layout para la página económica.
-    """
-    return dbc.Container([
-        html.H1("📊 Perfil Económico", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Composición del PIB por Sectores", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-sectores-economico",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=12)
-        ], className="mb-4"),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Brechas de Productividad", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-cultivos",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=12)
-        ])
-    ], fluid=True)
-
-# 🏢 PÁGINA EMPRESARIAL
-def create_empresarial_page() -> dbc.Container:
-    """
-    Genera el layout para la página de Tejido Empresarial.
-
-    Aquí se analiza la distribución de las empresas por tamaño y su
-    concentración geográfica dentro del departamento.
-
-    Returns:
-        dbc.Container: El componente de layout para la página empresarial.
-    """
-    return dbc.Container([
-        html.H1("🏢 Tejido Empresarial", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Escala Empresarial", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-empresas-escala",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=6),
-            dbc.Col([
-                html.H3("Distribución Geográfica", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-empresas-geo",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=6)
-        ])
-    ], fluid=True)
-
-# 🎓 PÁGINA EDUCACIÓN
-def create_educacion_page() -> dbc.Container:
-    """
-    Genera el layout para la página de Educación.
-
-    Esta sección presenta indicadores sobre el capital humano, como el número
-    de graduados por área, y la eficiencia del sistema educativo, como la deserción.
+# 📄 PÁGINAS: módulo de cada ruta, importado la primera vez que se visita
+PAGES = {
+    "/": "pages.inicio",
+    "/economico": "pages.economico",
+    "/empresarial": "pages.empresarial",
+    "/educacion": "pages.educacion",
+    "/salud": "pages.salud",
+    "/seguridad": "pages.seguridad",
+}
 
-    Returns:
-        dbc.Container: El componente de layout para la página de educación.
-    """
-    return dbc.Container([
-        html.H1("🎓 Educación", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Capital Humano Formado", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-graduados-educacion",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=6),
-            dbc.Col([
-                html.H3("Permanencia en el Sistema", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-desercion",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=6)
-        ])
-    ], fluid=True)
-
-# 🩺 PÁGINA SALUD
-def create_salud_page() -> dbc.Container:
-    """
-    Genera el layout para la página de Salud Pública.
-
-    Contiene visualizaciones sobre tendencias de salud importantes,
-    como la incidencia de enfermedades de interés público.
-
-    Returns:
-        dbc.Container: El componente de layout para la página de salud.
-    """
-    return dbc.Container([
-        html.H1("🩺 Salud Pública", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Tendencias de Salud", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-salud-tendencias",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=12)
-        ])
-    ], fluid=True)
-
-# 🛡️ PÁGINA SEGURIDAD
-def create_seguridad_page() -> dbc.Container:
-    """
-    Genera el layout para la página de Seguridad Ciudadana.
 
-    Muestra indicadores clave sobre la incidencia de delitos y la
-    seguridad en el departamento.
+def load_page(pathname: str):
+    """Módulo de la página de una ruta (la de inicio si la ruta no existe)."""
+    return importlib.import_module(PAGES.get(pathname, PAGES["/"]))
 
-    Returns:
-        dbc.Container: El componente de layout para la página de seguridad.
-    """
-    return dbc.Container([
-        html.H1("🛡️ Seguridad Ciudadana", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
-        
-        dbc.Row([
-            dbc.Col([
-                html.H3("Incidencia de Delitos", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
-                html.Iframe(
-                    id="grafico-seguridad",
-                    style={'width': '100%', 'height': '600px', 'border': 'none'}
-                )
-            ], width=12)
-        ])
-    ], fluid=True)
 
 # 🔄 CALLBACKS
 @callback(
     Output("page-content", "children"),
     Input("url", "pathname")
 )
+@timed_callback()
 def display_page(pathname: str):
     """
     Controlador de navegación principal (Router).
@@ -347,47 +156,95 @@ def display_page(pathname: str):
     Returns:
         Component: El layout de la página a mostrar.
     """
-    if pathname == "/":
-        return create_home_page()
-    elif pathname == "/economico":
-        return create_economic_page()
-    elif pathname == "/empresarial":
-        return create_empresarial_page()
-    elif pathname == "/educacion":
-        return create_educacion_page()
-    elif pathname == "/salud":
-        return create_salud_page()
-    elif pathname == "/seguridad":
-        return create_seguridad_page()
-    else:
-        return create_home_page()
+    return load_page(pathname).layout()
 
 # --- Callbacks para Gráficos con Plotly ---
 @callback(Output("grafico-sectores", "figure"), Input("grafico-sectores", "id"))
+@timed_callback()
+@cached_callback()
 def update_sectores_plotly(_):
     """Actualizar gráfico de sectores con Plotly"""
     from pages.graficos_plotly import create_sectores_chart_plotly
     return create_sectores_chart_plotly()
 
 @callback(Output("grafico-empresas", "figure"), Input("grafico-empresas", "id"))
+@timed_callback()
+@cached_callback()
 def update_empresas_plotly(_):
     """Actualizar gráfico de empresas con Plotly"""
     from pages.graficos_plotly import create_empresas_chart_plotly
     return create_empresas_chart_plotly()
 
 @callback(Output("grafico-graduados", "figure"), Input("grafico-graduados", "id"))
+@timed_callback()
+@cached_callback()
 def update_graduados_plotly(_):
     """Actualizar gráfico de graduados con Plotly"""
     from pages.graficos_plotly import create_graduados_chart_plotly
     return create_graduados_chart_plotly()
 
 @callback(Output("grafico-dengue", "figure"), Input("grafico-dengue", "id"))
+@timed_callback()
+@cached_callback()
 def update_dengue_plotly(_):
     """Actualizar gráfico de dengue con Plotly"""
     from pages.graficos_plotly import create_dengue_chart_plotly
     return create_dengue_chart_plotly()
 
 
+# Callbacks de gráficos que se precalientan, con el valor de su Input
+WARM_CALLBACKS = (
+    (update_sectores_plotly, "grafico-sectores"),
+    (update_empresas_plotly, "grafico-empresas"),
+    (update_graduados_plotly, "grafico-graduados"),
+    (update_dengue_plotly, "grafico-dengue"),
+)
+
+
+def warm_up(force: bool = False) -> None:
+    """
+    Precalienta el proceso: artefactos derivados y figuras de la página de inicio.
+
+    Las figuras se calculan a través de los callbacks, así quedan en su caché
+    con la misma clave que usarán las peticiones. Se ejecuta una vez por
+    versión de datos; servir.py lo vuelve a llamar en el maestro tras una
+    recarga, antes de crear los workers.
+    """
+    from utils.artifacts import REGISTRY, load_definitions
+
+    if warm_state['done'] and warm_state['version'] == data_loader.data_version and not force:
+        return
+
+    started = time.perf_counter()
+    load_definitions()
+    for name in REGISTRY:
+        try:
+            data_loader.get_artifact(name)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo precalcular el artefacto '{name}': {e}")
+
+    figures = {}
+    for update, component_id in WARM_CALLBACKS:
+        try:
+            update(component_id)
+            figures[component_id] = True
+        except Exception as e:
+            figures[component_id] = False
+            logger.warning(f"⚠️ No se pudo precalentar '{update.__name__}': {e}")
+
+    warm_state.update(version=data_loader.data_version, done=True, figures=figures,
+                      duration_s=round(time.perf_counter() - started, 4))
+    logger.info(f"🔥 Dashboard precalentado en {warm_state['duration_s']}s")
+
+
+# Precalentar al importar: /readyz solo responde listo después de esto
+with PROFILE.phase('warm_up'):
+    warm_up()
+
+# Duración de cada fase del arranque frente al presupuesto (DASHBOARD_STARTUP_BUDGET)
+PROFILE.finish(data_loader)
+
+
 if __name__ == "__main__":
     logger.info("🚀 Iniciando Dashboard de Competitividad de Casanare...")
     # Se desactiva el modo debug para evitar problemas con el auto-reloader en este entorno.
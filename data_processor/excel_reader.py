@@ -3,7 +3,7 @@ Lector de archivos Excel con manejo robusto de errores.
 """
 
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
 from pathlib import Path
 
@@ -22,6 +22,7 @@ class ExcelReader:
         """
         self.file_path = Path(file_path)
         self.sheets_data = {}
+        self._excel_file = None
         
         if not self.file_path.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
@@ -37,30 +38,13 @@ class ExcelReader:
         
         try:
             # Leer todas las hojas
-            excel_file = pd.ExcelFile(self.file_path)
-            sheet_names = excel_file.sheet_names
+            sheet_names = self.list_sheets()
             
             logger.info(f"Hojas encontradas: {sheet_names}")
             
             for sheet_name in sheet_names:
                 try:
-                    # Leer la hoja
-                    df = pd.read_excel(self.file_path, sheet_name=sheet_name)
-                    
-                    # Limpiar nombres de columnas
-                    df.columns = df.columns.str.strip()
-                    
-                    # Eliminar filas completamente vacías
-                    df = df.dropna(how='all')
-                    
-                    # Eliminar columnas completamente vacías
-                    df = df.dropna(axis=1, how='all')
-                    
-                    if not df.empty:
-                        self.sheets_data[sheet_name] = df
-                        logger.info(f"Hoja '{sheet_name}': {len(df)} filas, {len(df.columns)} columnas")
-                    else:
-                        logger.warning(f"Hoja '{sheet_name}' está vacía")
+                    self.add_sheet(sheet_name, self.clean_sheet(self.read_sheet(sheet_name)))
                 
                 except Exception as e:
                     logger.error(f"Error leyendo hoja '{sheet_name}': {e}")
@@ -73,6 +57,52 @@ class ExcelReader:
             logger.error(f"Error leyendo archivo Excel: {e}")
             raise
     
+    def list_sheets(self) -> List[str]:
+        """Obtiene los nombres de las hojas del archivo Excel."""
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.file_path)
+        return self._excel_file.sheet_names
+    
+    def read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Lee una hoja del archivo Excel sin limpiarla."""
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.file_path)
+        return pd.read_excel(self._excel_file, sheet_name=sheet_name)
+    
+    @staticmethod
+    def clean_sheet(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Limpia una hoja recién leída.
+        
+        Elimina espacios en los nombres de columnas y descarta filas y columnas
+        completamente vacías.
+        """
+        # Limpiar nombres de columnas
+        df.columns = df.columns.str.strip()
+        
+        # Eliminar filas completamente vacías
+        df = df.dropna(how='all')
+        
+        # Eliminar columnas completamente vacías
+        df = df.dropna(axis=1, how='all')
+        
+        return df
+    
+    def add_sheet(self, sheet_name: str, df: pd.DataFrame) -> bool:
+        """
+        Registra una hoja limpia si tiene datos.
+        
+        Returns:
+            bool: True si la hoja se registró
+        """
+        if df.empty:
+            logger.warning(f"Hoja '{sheet_name}' está vacía")
+            return False
+        
+        self.sheets_data[sheet_name] = df
+        logger.info(f"Hoja '{sheet_name}': {len(df)} filas, {len(df.columns)} columnas")
+        return True
+    
     def get_sheet_info(self) -> Dict[str, Dict]:
         """Obtiene información detallada de cada hoja."""
         info = {}
@@ -3,37 +3,60 @@ Procesador principal de datos que coordina la lectura y validación.
 """
 
 import pandas as pd
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
+import json
 import logging
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
 from .excel_reader import ExcelReader
 from .validator import DataValidator
+from utils.profiling import measure
 
 logger = logging.getLogger(__name__)
 
+# Archivo JSON Lines con las métricas de cada etapa del procesamiento
+METRICS_FILE = "processing_metrics.jsonl"
+# Resumen por etapa y por hoja de la última ejecución, junto al anterior
+SUMMARY_FILE = "processing_summary.json"
+
 
 class DataProcessor:
     """Procesador principal de datos."""
     
-    def __init__(self, excel_file_path: str, output_dir: str = "data/clean"):
+    def __init__(self, excel_file_path: str, output_dir: str = "data/clean",
+                 metrics_file: Optional[str] = None, track_memory: bool = True):
         """
         Inicializar el procesador.
         
         Args:
             excel_file_path: Ruta al archivo Excel
             output_dir: Directorio de salida para datos limpios
+            metrics_file: Archivo JSON Lines donde se añaden las métricas de cada
+                etapa (por defecto `processing_metrics.jsonl` junto a `output_dir`)
+            track_memory: Si medir el pico de memoria de cada etapa
         """
         self.excel_file_path = excel_file_path
         self.output_dir = Path(output_dir)
+        self.metrics_file = Path(metrics_file) if metrics_file else self.output_dir.parent / METRICS_FILE
+        self.track_memory = track_memory
         self.reader = ExcelReader(excel_file_path)
         self.validator = DataValidator()
         self.processed_data = {}
+        self.metrics: List[Dict[str, Any]] = []
+        self.run_id = None
     
     def process(self, save_clean_data: bool = True) -> Dict[str, pd.DataFrame]:
         """
         Procesa completamente los datos del Excel.
         
+        Cada hoja pasa por las etapas read, clean y validate, y al final por
+        write. Cada etapa se mide (tiempo real, CPU, filas, bytes y pico de
+        memoria) y se registra en `self.metrics` y en `metrics_file`; al
+        terminar, el resumen por etapa y por hoja se guarda en
+        `processing_summary.json` junto a `metrics_file`.
+        
         Args:
             save_clean_data: Si guardar los datos limpios como CSV
             
@@ -41,35 +64,59 @@ class DataProcessor:
             Dict[str, pd.DataFrame]: Datos procesados y validados
         """
         logger.info("=== INICIANDO PROCESAMIENTO DE DATOS ===")
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        self.metrics = []
         
         try:
-            # 1. Leer todas las hojas del Excel
-            logger.info("Paso 1: Leyendo archivo Excel...")
-            sheets_data = self.reader.read_all_sheets()
-            
-            if not sheets_data:
-                raise ValueError("No se pudieron leer hojas del archivo Excel")
-            
-            # Mostrar resumen de lectura
-            self.reader.print_summary()
-            
-            # 2. Validar todas las hojas
-            logger.info("Paso 2: Validando datos...")
-            validation_results = self.validator.validate_all_sheets(sheets_data)
-            
-            # Mostrar resumen de validación
-            print(self.validator.get_validation_summary())
-            
-            # 3. Obtener datos limpios
-            logger.info("Paso 3: Obteniendo datos limpios...")
-            self.processed_data = self.validator.get_clean_data()
-            
-            # 4. Guardar datos limpios si se solicita
-            if save_clean_data and self.processed_data:
-                logger.info("Paso 4: Guardando datos limpios...")
-                self.validator.save_clean_data(str(self.output_dir))
-                logger.info(f"Datos guardados en: {self.output_dir}")
+            with measure('process', trace_memory=self.track_memory) as total:
+                # 1. Leer y limpiar cada hoja del Excel
+                logger.info("Paso 1: Leyendo archivo Excel...")
+                sheets_data = {}
+                for sheet_name in self.reader.list_sheets():
+                    df = self._read_sheet(sheet_name)
+                    if df is not None:
+                        sheets_data[sheet_name] = df
+                
+                if not sheets_data:
+                    raise ValueError("No se pudieron leer hojas del archivo Excel")
+                
+                # Mostrar resumen de lectura
+                self.reader.print_summary()
+                
+                # 2. Validar todas las hojas
+                logger.info("Paso 2: Validando datos...")
+                self.validator.validation_results = {}
+                for sheet_name, df in sheets_data.items():
+                    with self._stage('validate', sheet_name, rows_in=len(df)) as record:
+                        result = self.validator.validate_sheet(sheet_name, df)
+                        self.validator.store_result(sheet_name, result)
+                        record['rows_out'] = len(result.data) if result.data is not None else 0
+                        record['errors'] = result.error_store.total
+                
+                # Registrar resumen de validación
+                logger.info(self.validator.get_validation_summary())
+                
+                # 3. Obtener datos limpios
+                logger.info("Paso 3: Obteniendo datos limpios...")
+                self.processed_data = self.validator.get_clean_data()
+                
+                # 4. Guardar datos limpios si se solicita
+                if save_clean_data and self.processed_data:
+                    logger.info("Paso 4: Guardando datos limpios...")
+                    writes = []
+                    self.validator.save_clean_data(str(self.output_dir), metrics=writes,
+                                                   track_memory=self.track_memory)
+                    for record in writes:
+                        self._emit(record)
+                    logger.info(f"Datos guardados en: {self.output_dir}")
+                
+                total['rows_out'] = sum(len(df) for df in self.processed_data.values())
             
+            self._emit(total)
+            try:
+                self.save_metrics_summary()
+            except OSError as e:
+                logger.warning(f"No se pudo guardar el resumen de métricas: {e}")
             logger.info("=== PROCESAMIENTO COMPLETADO ===")
             return self.processed_data
             
@@ -77,6 +124,87 @@ class DataProcessor:
             logger.error(f"Error en el procesamiento: {e}")
             raise
     
+    @contextmanager
+    def _stage(self, stage: str, sheet_name: str, **fields) -> Iterator[Dict[str, Any]]:
+        """Mide una etapa de una hoja y emite su registro al terminar."""
+        with measure(stage, trace_memory=self.track_memory, sheet=sheet_name, **fields) as record:
+            yield record
+        self._emit(record)
+    
+    def _read_sheet(self, sheet_name: str) -> Optional[pd.DataFrame]:
+        """Lee y limpia una hoja midiendo cada etapa (None si falla o está vacía)."""
+        try:
+            with self._stage('read', sheet_name) as record:
+                raw = self.reader.read_sheet(sheet_name)
+                record['rows_out'] = len(raw)
+            
+            with self._stage('clean', sheet_name, rows_in=len(raw)) as record:
+                df = self.reader.clean_sheet(raw)
+                record['rows_out'] = len(df)
+        except Exception as e:
+            logger.error(f"Error leyendo hoja '{sheet_name}': {e}")
+            return None
+        
+        return df if self.reader.add_sheet(sheet_name, df) else None
+    
+    def _emit(self, record: Dict[str, Any]):
+        """Registra una medición y la añade como línea JSON al archivo de métricas."""
+        record = {'run_id': self.run_id, 'timestamp': datetime.now().isoformat(timespec='milliseconds'), **record}
+        self.metrics.append(record)
+        logger.debug(f"Métrica: {record}")
+        
+        try:
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.metrics_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"No se pudieron escribir métricas en {self.metrics_file}: {e}")
+    
+    def get_metrics_summary(self) -> Dict[str, Any]:
+        """
+        Obtiene un resumen estructurado de las métricas de la última ejecución.
+        
+        Returns:
+            Dict[str, Any]: Totales por etapa, métricas por hoja y total del proceso
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        sheets: Dict[str, Dict[str, Any]] = {}
+        total = None
+        
+        for record in self.metrics:
+            if record['stage'] == 'process':
+                total = record
+                continue
+            
+            totals = stages.setdefault(record['stage'], {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mb': 0.0, 'sheets': 0})
+            totals['wall_s'] = round(totals['wall_s'] + record['wall_s'], 4)
+            totals['cpu_s'] = round(totals['cpu_s'] + record['cpu_s'], 4)
+            totals['peak_mb'] = max(totals['peak_mb'], record['peak_mb'] or 0.0)
+            totals['sheets'] += 1
+            
+            sheet_metrics = {k: v for k, v in record.items() if k not in ('run_id', 'timestamp', 'stage', 'sheet')}
+            sheets.setdefault(record['sheet'], {})[record['stage']] = sheet_metrics
+        
+        # Hojas ordenadas de la más lenta a la más rápida
+        slowest = sorted(sheets, key=lambda name: -sum(m['wall_s'] for m in sheets[name].values()))
+        
+        return {
+            'run_id': self.run_id,
+            'excel_file': str(self.excel_file_path),
+            'output_dir': str(self.output_dir),
+            'total': {k: v for k, v in (total or {}).items() if k not in ('run_id', 'stage')},
+            'stages': stages,
+            'sheets': {name: sheets[name] for name in slowest},
+        }
+    
+    def save_metrics_summary(self, path: Optional[str] = None) -> Path:
+        """Guarda el resumen de métricas en JSON (por defecto, `processing_summary.json` junto a `metrics_file`)."""
+        path = Path(path) if path else self.metrics_file.parent / SUMMARY_FILE
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_metrics_summary(), f, ensure_ascii=False, indent=2, default=str)
+        logger.info(f"Resumen de métricas guardado en: {path}")
+        return path
+    
     def get_processed_data(self) -> Dict[str, pd.DataFrame]:
         """Obtiene los datos procesados."""
         return self.processed_data
@@ -7,17 +7,24 @@ from typing import Dict, List, Type, Any, Optional
 from pydantic import ValidationError
 import logging
 
-from models.base import BaseDataModel, ValidationResult
+from models.base import BaseDataModel, ValidationResult, get_categorical_normalizers
+from utils.storage import write_dataset, update_manifest, staged_output
+from utils.profiling import measure
 from models import (
-    GeneralidadesModel, SectorEconomicoModel, EmpresarialModel,
-    CicloVitalModel, MunicipiosModel, SeguridadModel, MorbilidadModel,
-    GraduadosModel, DesercionModel, EstructuraDemograficaModel, CalidadAguaModel
+    Generalidades as GeneralidadesModel, SectorEconomico as SectorEconomicoModel,
+    Empresarial as EmpresarialModel, CicloVitalModel, MunicipiosModel,
+    Seguridad as SeguridadModel, Morbilidad as MorbilidadModel,
+    Graduados as GraduadosModel, Desercion as DesercionModel,
+    EstructuraDemograficaModel, CalidadAguaModel
 )
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Máximo de filas con error que se registran en el log por hoja
+MAX_ROW_WARNINGS = 10
+
 
 class DataValidator:
     """Validador de datos usando modelos Pydantic."""
@@ -71,6 +78,10 @@ class DataValidator:
         
         validation_result = ValidationResult(is_valid=True)
         validated_data = []
+        failed_rows = 0
+        
+        # Normalizar columnas categóricas una vez por valor distinto
+        df = self._normalize_categorical_columns(model_class, df)
         
         # Validar cada fila
         for index, row in df.iterrows():
@@ -94,10 +105,13 @@ class DataValidator:
                         row_index=index,
                         field=field,
                         value=value,
-                        error_message=error['msg']
+                        error_message=error['msg'],
+                        error_type=error['type']
                     )
                 
-                logger.warning(f"Error en fila {index} de {sheet_name}: {e}")
+                failed_rows += 1
+                if failed_rows <= MAX_ROW_WARNINGS:
+                    logger.warning(f"Error en fila {index} de {sheet_name}: {e}")
             
             except Exception as e:
                 validation_result.is_valid = False
@@ -105,9 +119,18 @@ class DataValidator:
                     row_index=index,
                     field='general',
                     value=str(row_dict),
-                    error_message=f'Error inesperado: {str(e)}'
+                    error_message=f'Error inesperado: {str(e)}',
+                    error_type=type(e).__name__
                 )
-                logger.error(f"Error inesperado en fila {index} de {sheet_name}: {e}")
+                failed_rows += 1
+                if failed_rows <= MAX_ROW_WARNINGS:
+                    logger.error(f"Error inesperado en fila {index} de {sheet_name}: {e}")
+        
+        if failed_rows > MAX_ROW_WARNINGS:
+            logger.warning(
+                f"{sheet_name}: {failed_rows} filas con errores, "
+                f"se omitieron {failed_rows - MAX_ROW_WARNINGS} advertencias en el log"
+            )
         
         # Si hay datos válidos, crear DataFrame
         if validated_data:
@@ -119,6 +142,49 @@ class DataValidator:
         
         return validation_result
     
+    def _normalize_categorical_columns(self, model_class: Type, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica los normalizadores categóricos del modelo sobre los valores únicos.
+        
+        Cada columna se factoriza, el normalizador se ejecuta una vez por valor
+        distinto y el resultado se vuelve a mapear a todas las filas. Los valores
+        que el normalizador rechaza se conservan para que la validación por fila
+        reporte el error como siempre.
+        
+        Args:
+            model_class: Modelo Pydantic de la hoja
+            df: DataFrame con los datos
+            
+        Returns:
+            pd.DataFrame: Copia del DataFrame con las columnas normalizadas
+        """
+        normalizers = {
+            field: normalizer
+            for field, normalizer in get_categorical_normalizers(model_class).items()
+            if field in df.columns
+        }
+        if not normalizers:
+            return df
+        
+        df = df.copy()
+        for field, normalizer in normalizers.items():
+            codes, uniques = pd.factorize(df[field], use_na_sentinel=True)
+            if len(uniques) == 0:
+                continue
+            
+            normalized = []
+            for value in uniques:
+                try:
+                    normalized.append(normalizer(value) if isinstance(value, str) else value)
+                except Exception:
+                    normalized.append(value)
+            
+            mapped = pd.Series(normalized, dtype=object).take(codes).to_numpy()
+            df[field] = df[field].where(codes < 0, mapped)
+            logger.debug(f"Columna '{field}': {len(uniques)} valores distintos normalizados")
+        
+        return df
+    
     def validate_all_sheets(self, sheets_data: Dict[str, pd.DataFrame]) -> Dict[str, ValidationResult]:
         """
         Valida todas las hojas de Excel.
@@ -131,20 +197,20 @@ class DataValidator:
         """
         logger.info(f"Validando {len(sheets_data)} hojas de Excel")
         
-        results = {}
+        self.validation_results = {}
         
         for sheet_name, df in sheets_data.items():
-            result = self.validate_sheet(sheet_name, df)
-            results[sheet_name] = result
-            
-            # Guardar datos limpios si la validación fue exitosa
-            if result.is_valid and result.data is not None:
-                self.clean_data[sheet_name] = result.data
+            self.store_result(sheet_name, self.validate_sheet(sheet_name, df))
         
-        # Guardar resultados
-        self.validation_results = results
+        return self.validation_results
+    
+    def store_result(self, sheet_name: str, result: ValidationResult):
+        """Registra el resultado de una hoja y guarda sus datos limpios si es válida."""
+        self.validation_results[sheet_name] = result
         
-        return results
+        # Guardar datos limpios si la validación fue exitosa
+        if result.is_valid and result.data is not None:
+            self.clean_data[sheet_name] = result.data
     
     def get_validation_summary(self) -> str:
         """Obtiene un resumen de todas las validaciones."""
@@ -168,19 +234,36 @@ class DataValidator:
         
         return summary
     
-    def save_clean_data(self, output_dir: str = "data/clean"):
-        """Guarda los datos limpios como archivos CSV."""
-        import os
+    def save_clean_data(self, output_dir: str = "data/clean", metrics: Optional[List[Dict[str, Any]]] = None,
+                        track_memory: bool = False):
+        """
+        Guarda los datos limpios como CSV, Parquet y manifiesto, y los publica.
         
-        # Crear directorio si no existe
-        os.makedirs(output_dir, exist_ok=True)
+        Args:
+            output_dir: Directorio de salida
+            metrics: Si se indica, recibe una medición de escritura por hoja
+            track_memory: Si medir el pico de memoria de cada escritura
+        """
+        import os
         
         logger.info(f"Guardando datos limpios en {output_dir}")
         
-        for sheet_name, df in self.clean_data.items():
-            output_file = os.path.join(output_dir, f"{sheet_name}.csv")
-            df.to_csv(output_file, index=False)
-            logger.info(f"Guardado: {output_file}")
+        entries = {}
+        with staged_output(output_dir) as staging_dir:
+            for sheet_name, df in self.clean_data.items():
+                with measure('write', trace_memory=track_memory,
+                             sheet=sheet_name, rows_in=len(df)) as record:
+                    entries[sheet_name] = write_dataset(df, staging_dir, sheet_name)
+                    record['rows_out'] = entries[sheet_name]['rows']
+                    record['bytes_written'] = sum(
+                        os.path.getsize(os.path.join(staging_dir, entries[sheet_name][key]))
+                        for key in ('csv', 'columnar') if entries[sheet_name][key]
+                    )
+                if metrics is not None:
+                    metrics.append(record)
+                logger.info(f"Guardado: {os.path.join(output_dir, entries[sheet_name]['csv'])}")
+            
+            update_manifest(staging_dir, entries)
     
     def get_clean_data(self) -> Dict[str, pd.DataFrame]:
         """Obtiene los datos limpios validados."""
@@ -9,6 +9,10 @@ from .morbilidad import Morbilidad
 from .seguridad import Seguridad
 from .desercion import Desercion
 from .generalidades import Generalidades
+from .ciclo_vital import CicloVitalModel
+from .municipios import MunicipiosModel
+from .estructura_demografica import EstructuraDemograficaModel
+from .calidad_agua import CalidadAguaModel
 
 __all__ = [
     'SectorEconomico',
@@ -17,5 +21,9 @@ __all__ = [
     'Morbilidad',
     'Seguridad',
     'Desercion',
-    'Generalidades'
+    'Generalidades',
+    'CicloVitalModel',
+    'MunicipiosModel',
+    'EstructuraDemograficaModel',
+    'CalidadAguaModel'
 ]
\ No newline at end of file
@@ -3,11 +3,75 @@ Modelo base para todos los modelos de datos.
 Define funcionalidades comunes y validadores base.
 """
 
-from typing import Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Type
+from array import array
+from collections import Counter
+from functools import wraps
 from pydantic import BaseModel, Field, validator
 import pandas as pd
 
 
+# Número máximo de valores distintos memorizados por normalizador categórico
+CATEGORICAL_CACHE_SIZE = 1024
+
+# Límites del almacén de errores de validación
+MAX_ERROR_SAMPLES = 20
+MAX_ERROR_ROWS = 1_000_000
+
+
+def categorical_normalizer(func: Callable) -> Callable:
+    """
+    Declara un validador como normalizador categórico.
+
+    Se aplica debajo de ``@validator`` en validadores que dependen solo del
+    valor recibido (ej. mapear textos libres a una etapa o categoría). El
+    resultado se memoriza por valor, y el pipeline de validación usa la
+    marca para normalizar la columna una vez por valor distinto.
+    """
+    cache: Dict[Any, Any] = {}
+
+    @wraps(func)
+    def wrapper(cls, v):
+        try:
+            return cache[(cls, v)]
+        except (KeyError, TypeError):
+            pass
+
+        result = func(cls, v)
+        try:
+            if len(cache) < CATEGORICAL_CACHE_SIZE:
+                cache[(cls, v)] = result
+        except TypeError:
+            # Valor no hasheable: se normaliza sin memorizar
+            pass
+        return result
+
+    wrapper.__categorical_normalizer__ = True
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def get_categorical_normalizers(model_class: Type[BaseModel]) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Obtiene los normalizadores categóricos declarados en un modelo.
+
+    Returns:
+        Dict[str, Callable]: Campo del modelo y normalizador que lo limpia
+    """
+    normalizers = {}
+    decorators = model_class.__pydantic_decorators__.validators
+
+    for name, decorator in decorators.items():
+        normalizer = getattr(model_class, name, None)
+        if not getattr(normalizer, '__categorical_normalizer__', False):
+            continue
+        for field in decorator.info.fields:
+            if field in model_class.model_fields:
+                normalizers[field] = normalizer
+
+    return normalizers
+
+
 class BaseDataModel(BaseModel):
     """Modelo base para todos los modelos de datos del dashboard."""
     
@@ -40,37 +104,114 @@ class BaseDataModel(BaseModel):
         return v
 
 
+class ErrorStore:
+    """
+    Almacén compacto de errores de validación.
+
+    Guarda cada error como tres enteros (fila, código de campo y código de
+    error) en arreglos, mantiene conteos por campo y por tipo de error, y
+    conserva solo una muestra limitada de errores completos con sus valores.
+    """
+
+    def __init__(self, max_samples: int = MAX_ERROR_SAMPLES, max_rows: int = MAX_ERROR_ROWS):
+        self.max_samples = max_samples
+        self.max_rows = max_rows
+        self.total = 0
+        self.row_indices = array('q')
+        self.field_codes = array('I')
+        self.error_codes = array('I')
+        self.fields: List[str] = []
+        self.error_types: List[str] = []
+        self._field_lookup: Dict[str, int] = {}
+        self._error_lookup: Dict[str, int] = {}
+        self.field_counts: Counter = Counter()
+        self.error_counts: Counter = Counter()
+        self.samples: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def _intern(value: str, values: List[str], lookup: Dict[str, int]) -> int:
+        """Devuelve el código entero de un texto, registrándolo si es nuevo."""
+        code = lookup.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            lookup[value] = code
+        return code
+
+    def add(self, row_index: Any, field: str, value: Any, error_message: str,
+            error_type: Optional[str] = None):
+        """Registra un error."""
+        field = str(field)
+        error_type = error_type or error_message
+        field_code = self._intern(field, self.fields, self._field_lookup)
+        error_code = self._intern(error_type, self.error_types, self._error_lookup)
+
+        self.total += 1
+        self.field_counts[field] += 1
+        self.error_counts[error_type] += 1
+
+        if len(self.row_indices) < self.max_rows:
+            try:
+                row = int(row_index)
+            except (TypeError, ValueError):
+                row = -1
+            self.row_indices.append(row)
+            self.field_codes.append(field_code)
+            self.error_codes.append(error_code)
+
+        if len(self.samples) < self.max_samples:
+            self.samples.append({
+                'row_index': row_index,
+                'field': field,
+                'value': value,
+                'error': error_message
+            })
+
+    def __len__(self) -> int:
+        return self.total
+
+
 class ValidationResult:
     """Resultado de la validación de un modelo."""
     
     def __init__(self, is_valid: bool, data: Optional[pd.DataFrame] = None, errors: list = None):
         self.is_valid = is_valid
         self.data = data
-        self.errors = errors or []
+        self.error_store = ErrorStore()
+        for error in errors or []:
+            self.add_error(error['row_index'], error['field'], error['value'], error['error'])
     
-    def add_error(self, row_index: int, field: str, value: Any, error_message: str):
+    @property
+    def errors(self) -> List[Dict[str, Any]]:
+        """Muestra limitada de errores completos (fila, campo, valor y mensaje)."""
+        return self.error_store.samples
+    
+    def add_error(self, row_index: int, field: str, value: Any, error_message: str,
+                  error_type: Optional[str] = None):
         """Añade un error de validación."""
-        self.errors.append({
-            'row_index': row_index,
-            'field': field,
-            'value': value,
-            'error': error_message
-        })
+        self.error_store.add(row_index, field, value, error_message, error_type)
     
     def has_errors(self) -> bool:
         """Verifica si hay errores."""
-        return len(self.errors) > 0
+        return self.error_store.total > 0
     
     def get_error_summary(self) -> str:
         """Obtiene un resumen de errores."""
-        if not self.errors:
+        store = self.error_store
+        if not store.total:
             return "Sin errores"
         
-        summary = f"Total de errores: {len(self.errors)}\n"
-        for error in self.errors[:5]:  # Mostrar solo los primeros 5
+        summary = f"Total de errores: {store.total}\n"
+        
+        fields = ", ".join(f"{field} ({count})" for field, count in store.field_counts.most_common(5))
+        summary += f"  Campos: {fields}\n"
+        for error_type, count in store.error_counts.most_common(3):
+            summary += f"  {count} x {error_type}\n"
+        
+        for error in store.samples[:5]:  # Mostrar solo los primeros 5
             summary += f"  Fila {error['row_index']}: {error['field']} = '{error['value']}' - {error['error']}\n"
         
-        if len(self.errors) > 5:
-            summary += f"  ... y {len(self.errors) - 5} errores más"
+        if store.total > 5:
+            summary += f"  ... y {store.total - 5} errores más"
         
         return summary
@@ -4,7 +4,7 @@ Modelo Pydantic para datos de ciclo vital demográfico.
 
 from typing import Optional
 from pydantic import Field, validator
-from .base import BaseDataModel
+from .base import BaseDataModel, categorical_normalizer
 
 
 class CicloVitalModel(BaseDataModel):
@@ -52,6 +52,7 @@ class CicloVitalModel(BaseDataModel):
             return None
     
     @validator('ciclo_vital')
+    @categorical_normalizer
     def validate_ciclo_vital(cls, v):
         """Valida y normaliza el ciclo vital."""
         if not v or v.strip() == '':
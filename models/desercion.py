@@ -5,6 +5,8 @@ Modelo Pydantic para validación de datos de deserción
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 
+from .base import categorical_normalizer
+
 class Desercion(BaseModel):
     """Modelo para validar datos de deserción"""
     
@@ -15,6 +17,7 @@ class Desercion(BaseModel):
     observaciones: Optional[str] = Field(None, description="Observaciones")
     
     @validator('municipio')
+    @categorical_normalizer
     def clean_municipio(cls, v):
         """Limpiar nombre del municipio"""
         if not v or v.strip() == '':
@@ -36,6 +39,7 @@ class Desercion(BaseModel):
         return round(float(v), 4)
     
     @validator('sector')
+    @categorical_normalizer
     def clean_sector(cls, v):
         """Limpiar sector"""
         if not v or v.strip() == '':
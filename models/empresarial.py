@@ -5,6 +5,8 @@ Modelo Pydantic para validación de datos empresariales
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 
+from .base import categorical_normalizer
+
 class Empresarial(BaseModel):
     """Modelo para validar datos empresariales"""
     
@@ -13,6 +15,7 @@ class Empresarial(BaseModel):
     porcentaje_del_total: float = Field(..., ge=0, le=100, description="Porcentaje del total")
     
     @validator('tamano_de_empresa')
+    @categorical_normalizer
     def clean_tamano_empresa(cls, v):
         """Limpiar y validar tamaño de empresa"""
         if not v or v.strip() == '':
@@ -4,7 +4,7 @@ Modelo Pydantic para datos de municipios.
 
 from typing import Optional
 from pydantic import Field, validator
-from .base import BaseDataModel
+from .base import BaseDataModel, categorical_normalizer
 
 
 class MunicipiosModel(BaseDataModel):
@@ -52,6 +52,7 @@ class MunicipiosModel(BaseDataModel):
             return None
     
     @validator('municipio')
+    @categorical_normalizer
     def validate_municipio(cls, v):
         """Valida el nombre del municipio."""
         if not v or v.strip() == '':
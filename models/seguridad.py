@@ -5,6 +5,8 @@ Modelo Pydantic para validación de datos de seguridad
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 
+from .base import categorical_normalizer
+
 class Seguridad(BaseModel):
     """Modelo para validar datos de seguridad"""
     
@@ -36,6 +38,7 @@ class Seguridad(BaseModel):
         return round(float(v), 2)
     
     @validator('tendencia')
+    @categorical_normalizer
     def clean_tendencia(cls, v):
         """Limpiar y validar tendencia"""
         if not v or v.strip() == '':
@@ -52,6 +55,7 @@ class Seguridad(BaseModel):
             return v.title()
     
     @validator('impacto')
+    @categorical_normalizer
     def clean_impacto(cls, v):
         """Limpiar y validar impacto"""
         if not v or v.strip() == '':
@@ -0,0 +1,43 @@
+"""
+Página del perfil económico.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de Perfil Económico.
+
+    Esta sección se enfoca en la estructura económica del departamento,
+    incluyendo la composición del PIB y la productividad de sectores clave.
+
+    Returns:
+        dbc.Container: El componente de layout para la página económica.
+    """
+    return dbc.Container([
+        html.H1("📊 Perfil Económico", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Composición del PIB por Sectores", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-sectores-economico",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=12)
+        ], className="mb-4"),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Brechas de Productividad", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-cultivos",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=12)
+        ])
+    ], fluid=True)
@@ -0,0 +1,40 @@
+"""
+Página de educación.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de Educación.
+
+    Esta sección presenta indicadores sobre el capital humano, como el número
+    de graduados por área, y la eficiencia del sistema educativo, como la deserción.
+
+    Returns:
+        dbc.Container: El componente de layout para la página de educación.
+    """
+    return dbc.Container([
+        html.H1("🎓 Educación", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Capital Humano Formado", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-graduados-educacion",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=6),
+            dbc.Col([
+                html.H3("Permanencia en el Sistema", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-desercion",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=6)
+        ])
+    ], fluid=True)
@@ -0,0 +1,40 @@
+"""
+Página del tejido empresarial.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de Tejido Empresarial.
+
+    Aquí se analiza la distribución de las empresas por tamaño y su
+    concentración geográfica dentro del departamento.
+
+    Returns:
+        dbc.Container: El componente de layout para la página empresarial.
+    """
+    return dbc.Container([
+        html.H1("🏢 Tejido Empresarial", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Escala Empresarial", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-empresas-escala",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=6),
+            dbc.Col([
+                html.H3("Distribución Geográfica", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-empresas-geo",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=6)
+        ])
+    ], fluid=True)
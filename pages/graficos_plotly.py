@@ -6,8 +6,7 @@ Versión 3.0 - Correcciones finales de estética y renderizado.
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.loader import get_data_loader
-import textwrap
-import pandas as pd
+from utils.singleflight import coalesced
 
 # Paleta de colores para consistencia visual
 COLORS = {
@@ -29,17 +28,15 @@ def create_generic_error_figure(message="No hay datos disponibles"):
     )
     return fig
 
+@coalesced()
 def create_sectores_chart_plotly():
     """Crea un Treemap de Sectores Económicos con Plotly."""
-    df_raw = get_data_loader().get_sectores_economicos()
-    if df_raw.empty:
+    loader = get_data_loader()
+    if loader.get_sectores_economicos().empty:
         return create_generic_error_figure("Datos de Sectores No Disponibles")
 
-    # Aislar y limpiar los datos específicos para este gráfico
-    df = df_raw[['sector_econmico', 'participacin_porcentual']].copy()
-    df['participacin_porcentual'] = pd.to_numeric(df['participacin_porcentual'], errors='coerce')
-    df.dropna(subset=['participacin_porcentual'], inplace=True)
-    df_filtered = df[~df['sector_econmico'].str.contains("Total", na=False)]
+    # Tabla limpia precalculada (ver utils/derived.py)
+    df_filtered = loader.get_artifact('frame_sectores')
 
     if df_filtered.empty:
         return create_generic_error_figure("No hay datos válidos para el treemap")
@@ -56,14 +53,13 @@ def create_sectores_chart_plotly():
     fig.update_layout(height=400, font=dict(family="Inter, sans-serif"), margin=dict(t=50, r=10, b=10, l=10))
     return fig
 
+@coalesced()
 def create_empresas_chart_plotly():
     """Crea un Gráfico de Dona de Distribución Empresarial con Plotly."""
-    df = get_data_loader().get_empresas_por_tamano()
-    if df.empty:
+    df_filtered = get_data_loader().get_artifact('frame_empresas')
+    if df_filtered.empty:
         return create_generic_error_figure()
 
-    df_filtered = df[df['tamao_de_empresa'] != 'Total']
-
     fig = go.Figure(data=[go.Pie(
         labels=df_filtered['tamao_de_empresa'],
         values=df_filtered['nmero_de_empresas'],
@@ -81,19 +77,13 @@ def create_empresas_chart_plotly():
     )
     return fig
 
+@coalesced()
 def create_graduados_chart_plotly():
     """Crea un Gráfico de Barras de Graduados con Plotly."""
-    df = get_data_loader().get_graduados_por_area()
-    if df.empty:
+    df_sorted = get_data_loader().get_artifact('frame_graduados')
+    if df_sorted.empty:
         return create_generic_error_figure()
 
-    df_filtered = df[df['rea_de_conocimiento'] != 'Total']
-    df_sorted = df_filtered.sort_values('nmero_de_graduados', ascending=True)
-
-    df_sorted['rea_de_conocimiento'] = df_sorted['rea_de_conocimiento'].apply(
-        lambda x: '<br>'.join(textwrap.wrap(x, width=30))
-    )
-
     fig = go.Figure(go.Bar(
         y=df_sorted['rea_de_conocimiento'],
         x=df_sorted['nmero_de_graduados'],
@@ -113,9 +103,10 @@ def create_graduados_chart_plotly():
     )
     return fig
 
+@coalesced()
 def create_dengue_chart_plotly():
     """Crea un Gráfico de Líneas de Casos de Dengue con Plotly."""
-    df = get_data_loader().get_dengue_data()
+    df = get_data_loader().get_artifact('frame_dengue')
     if df.empty:
         return create_generic_error_figure()
 
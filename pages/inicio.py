@@ -0,0 +1,94 @@
+"""
+Página de inicio (Panorama General): KPIs y gráficos clave.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+from utils.loader import get_data_loader
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de inicio (Panorama General).
+
+    Esta página muestra los KPIs más importantes y una selección de
+    visualizaciones clave de diferentes áreas para ofrecer un resumen
+    rápido del estado de competitividad de Casanare.
+
+    Returns:
+        dbc.Container: El componente de layout para la página de inicio.
+    """
+    data_loader = get_data_loader()
+    kpis = data_loader.get_kpis()
+    empresas_total = data_loader.get_empresas_total()
+    
+    return dbc.Container([
+        html.H1("🏛️ Dashboard de Competitividad de Casanare", 
+               style={'color': '#1f77b4', 'marginBottom': '2rem', 'textAlign': 'center'}),
+        
+        # KPIs Principales
+        dbc.Row([
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H4("👥 Población", className="text-center"),
+                        html.H2(f"{kpis.get('poblacion', 0):,}", className="text-center", 
+                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
+                    ])
+                ])
+            ], width=3),
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H4("💰 PIB", className="text-center"),
+                        html.H2(f"${kpis.get('pib', 0)/1000000:.1f}B", className="text-center", 
+                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
+                    ])
+                ])
+            ], width=3),
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H4("🏢 Empresas", className="text-center"),
+                        html.H2(f"{empresas_total:,}", className="text-center", 
+                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
+                    ])
+                ])
+            ], width=3),
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardBody([
+                        html.H4("🏆 Ranking", className="text-center"),
+                        html.H2(f"#{kpis.get('ranking_idc', 0)}", className="text-center", 
+                                style={'color': '#1f77b4', 'fontSize': '2.5rem'})
+                    ])
+                ])
+            ], width=3)
+        ], className="mb-4"),
+        
+        # Visualizaciones principales
+        dbc.Row([
+            dbc.Col([
+                html.H3("📊 Sectores Económicos", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                dcc.Graph(id="grafico-sectores")
+            ], width=6),
+            dbc.Col([
+                html.H3("🏢 Distribución Empresarial", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                dcc.Graph(id="grafico-empresas")
+            ], width=6)
+        ], className="mb-4"),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("🎓 Graduados por Área", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                dcc.Graph(id="grafico-graduados")
+            ], width=6),
+            dbc.Col([
+                html.H3("🩺 Evolución de Dengue", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                dcc.Graph(id="grafico-dengue")
+            ], width=6)
+        ])
+    ], fluid=True)
@@ -0,0 +1,33 @@
+"""
+Página de salud pública.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de Salud Pública.
+
+    Contiene visualizaciones sobre tendencias de salud importantes,
+    como la incidencia de enfermedades de interés público.
+
+    Returns:
+        dbc.Container: El componente de layout para la página de salud.
+    """
+    return dbc.Container([
+        html.H1("🩺 Salud Pública", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Tendencias de Salud", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-salud-tendencias",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=12)
+        ])
+    ], fluid=True)
@@ -0,0 +1,33 @@
+"""
+Página de seguridad ciudadana.
+
+Se importa la primera vez que se visita su ruta (ver `PAGES` en dashboard.py).
+"""
+
+from dash import html
+import dash_bootstrap_components as dbc
+
+
+def layout() -> dbc.Container:
+    """
+    Genera el layout para la página de Seguridad Ciudadana.
+
+    Muestra indicadores clave sobre la incidencia de delitos y la
+    seguridad en el departamento.
+
+    Returns:
+        dbc.Container: El componente de layout para la página de seguridad.
+    """
+    return dbc.Container([
+        html.H1("🛡️ Seguridad Ciudadana", style={'color': '#1f77b4', 'marginBottom': '2rem'}),
+        
+        dbc.Row([
+            dbc.Col([
+                html.H3("Incidencia de Delitos", style={'color': '#1f77b4', 'marginBottom': '1rem'}),
+                html.Iframe(
+                    id="grafico-seguridad",
+                    style={'width': '100%', 'height': '600px', 'border': 'none'}
+                )
+            ], width=12)
+        ])
+    ], fluid=True)
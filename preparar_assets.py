@@ -0,0 +1,295 @@
+"""
+Prepara los recursos estáticos de terceros en `assets/vendor/`.
+
+Genera, con el hash del contenido en el nombre, los archivos que el
+dashboard sirve por sí mismo en lugar de pedirlos a un CDN:
+
+- ``bootstrap.css``: ``bootstrap.min.css`` de la distribución oficial de
+  Bootstrap (paquete npm ``bootstrap``, servido por jsDelivr como en
+  ``dash_bootstrap_components.themes``), comprobado con el hash SRI que
+  publica Bootstrap;
+- ``inter.woff2`` e ``inter.css``: la fuente Inter variable (pesos 300-700),
+  recortada a latín y convertida a WOFF2 (del wheel de Vizro);
+- ``vega.js``: Vega, Vega-Lite y vega-embed en un solo archivo, el mismo
+  paquete que usa Altair para el HTML autónomo (``vl-convert-python``), con
+  la versión de Vega-Lite del Altair instalado.
+
+Los wheels se descargan con pip, de modo que basta un espejo de PyPI (o una
+carpeta de wheels con ``--wheels``); sin salida a internet, Bootstrap se
+toma de una copia local del archivo oficial con ``--bootstrap``. El
+manifiesto registra el origen y la versión de cada recurso. Los archivos
+generados se versionan en el repositorio: en producción no hace falta
+ejecutar este script.
+
+Uso:
+    python preparar_assets.py
+    python preparar_assets.py --wheels /ruta/a/wheels --bootstrap /ruta/a/bootstrap.min.css
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import re
+import subprocess
+import sys
+import tempfile
+import urllib.request
+import zipfile
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.assets import HASHED_NAME, MANIFEST_FILE, VENDOR_DIR, hashed_name
+
+try:
+    import vl_convert
+    VL_CONVERT_AVAILABLE = True
+except ImportError:
+    VL_CONVERT_AVAILABLE = False
+
+try:
+    import dash_bootstrap_components as dbc
+    DBC_AVAILABLE = True
+except ImportError:
+    DBC_AVAILABLE = False
+
+try:
+    from fontTools import subset as font_subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+    FONTTOOLS_AVAILABLE = True
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+
+# --- Configuración ---
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+logger = logging.getLogger(__name__)
+logging.getLogger('fontTools').setLevel(logging.WARNING)
+
+# Archivos tomados de wheels de PyPI: nombre lógico → (requisito, ruta dentro del wheel)
+WHEEL_SOURCES = {
+    'inter.ttf': ('vizro==0.1.62', 'vizro/static/css/fonts/inter-variable-font.ttf'),
+}
+
+# Distribución oficial de Bootstrap (misma URL que dash_bootstrap_components.themes)
+# y su hash SRI publicado en getbootstrap.com
+BOOTSTRAP_VERSION = "5.3.8"
+BOOTSTRAP_URL = f"https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css"
+BOOTSTRAP_INTEGRITY = "sha384-sRIl4kxILFvY47J16cr9ZwB07vP4J8+LH7qKQnuqkuIAvNWLzeN8tE5YBujZqJLB"
+THEME_VERSION = re.compile(r"/bootstrap@([\d.]+)/")
+
+INTER_WEIGHTS = (300, 700)
+# Rango "latin" de Google Fonts: cubre el español (tildes, ñ, ¿¡) y la puntuación tipográfica
+LATIN_UNICODES = ("U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,"
+                  "U+0329,U+2000-206F,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD")
+SOURCE_MAP_COMMENT = re.compile(rb"\s*/\*# sourceMappingURL=[^*]*\*/\s*$")
+
+
+def _fetch_wheel_file(requirement: str, member: str, work_dir: Path, wheels: Optional[Path]) -> bytes:
+    """Descarga el wheel de un requisito con pip y devuelve uno de sus archivos."""
+    command = [sys.executable, '-m', 'pip', 'download', '--no-deps', '--only-binary=:all:',
+               '--quiet', '--dest', str(work_dir), requirement]
+    if wheels is not None:
+        command += ['--no-index', '--find-links', str(wheels)]
+    subprocess.run(command, check=True)
+
+    name = requirement.split('==')[0].replace('-', '_').lower()
+    candidates = [p for p in work_dir.glob('*.whl') if p.name.lower().startswith(f"{name}-")]
+    if not candidates:
+        raise FileNotFoundError(f"pip no descargó el wheel de {requirement}")
+    with zipfile.ZipFile(candidates[0]) as wheel:
+        return wheel.read(member)
+
+
+def _integrity(data: bytes) -> str:
+    """Hash SRI (sha384) de un archivo."""
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode('ascii')
+
+
+def fetch_bootstrap(local_file: Optional[Path] = None) -> bytes:
+    """
+    ``bootstrap.min.css`` oficial, descargado o desde una copia local.
+
+    Args:
+        local_file: Copia local del archivo de la distribución oficial (sin internet)
+
+    Returns:
+        bytes: El archivo, si coincide con el hash SRI de ``BOOTSTRAP_VERSION``
+    """
+    if local_file is not None:
+        css = Path(local_file).read_bytes()
+    else:
+        with urllib.request.urlopen(BOOTSTRAP_URL, timeout=60) as response:
+            css = response.read()
+    if _integrity(css) != BOOTSTRAP_INTEGRITY:
+        raise ValueError(f"bootstrap.min.css no coincide con la distribución oficial de Bootstrap {BOOTSTRAP_VERSION}")
+
+    if DBC_AVAILABLE:
+        # dash-bootstrap-components declara la versión de Bootstrap para la que se escribió
+        match = THEME_VERSION.search(dbc.themes.BOOTSTRAP)
+        expected = match.group(1) if match else None
+        if expected and expected.split('.')[:2] != BOOTSTRAP_VERSION.split('.')[:2]:
+            logger.warning(f"⚠️ dash-bootstrap-components {dbc.__version__} usa Bootstrap {expected}; "
+                           f"se empaqueta {BOOTSTRAP_VERSION}")
+    return css
+
+
+def build_bootstrap(css: bytes) -> bytes:
+    """Bootstrap sin el comentario del source map (el .map no se distribuye)."""
+    return SOURCE_MAP_COMMENT.sub(b"\n", css)
+
+
+def font_version(ttf: bytes) -> str:
+    """Versión de una fuente según su tabla ``name`` (ej. ``3.019``)."""
+    version = TTFont(BytesIO(ttf), lazy=True)['name'].getDebugName(5) or ''
+    return version.replace('Version ', '').split(';')[0]
+
+
+def build_inter(ttf: bytes) -> bytes:
+    """Inter variable recortada a latín y a los pesos usados, en WOFF2."""
+    font = TTFont(BytesIO(ttf), lazy=False)
+    options = font_subset.Options()
+    options.layout_features = ['*']
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=font_subset.parse_unicodes(LATIN_UNICODES))
+    subsetter.subset(font)
+
+    # Solo el eje de peso; el resto de ejes (ej. inclinación) se fija en su valor por defecto
+    limits = {axis.axisTag: (INTER_WEIGHTS if axis.axisTag == 'wght' else None) for axis in font['fvar'].axes}
+    font = instancer.instantiateVariableFont(font, limits)
+    font.flavor = 'woff2'
+    # Sin fecha de modificación nueva: el mismo origen produce el mismo archivo (y el mismo hash)
+    font.recalcTimestamp = False
+    output = BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
+def build_inter_css(woff2_name: str) -> bytes:
+    """Declaración @font-face de Inter apuntando al WOFF2 con hash (ruta relativa al CSS)."""
+    return (
+        "@font-face {\n"
+        "  font-family: 'Inter';\n"
+        "  font-style: normal;\n"
+        f"  font-weight: {INTER_WEIGHTS[0]} {INTER_WEIGHTS[1]};\n"
+        "  font-display: swap;\n"
+        f"  src: url({woff2_name}) format('woff2');\n"
+        f"  unicode-range: {LATIN_UNICODES.replace(',', ', ')};\n"
+        "}\n"
+    ).encode('utf-8')
+
+
+def vega_lite_version() -> str:
+    """Versión mayor.menor de Vega-Lite del Altair instalado."""
+    import altair as alt
+
+    major, minor = alt.SCHEMA_VERSION.lstrip('v').split('.')[:2]
+    return f"{major}.{minor}"
+
+
+def build_vega() -> bytes:
+    """Vega, Vega-Lite y vega-embed en un archivo, para la versión de Vega-Lite de Altair."""
+    major, minor = vega_lite_version().split('.')
+    bundle = vl_convert.javascript_bundle(vl_version=f"{major}.{minor}")
+    header = (f"// vega {vl_convert.get_vega_version()}, vega-lite {major}.{minor}, "
+              f"vega-embed {vl_convert.get_vega_embed_version()} (vl-convert-python {vl_convert.__version__})\n")
+    return (header + bundle).encode('utf-8')
+
+
+def write_vendor(files: Dict[str, bytes], sources: Dict[str, str], vendor_dir: Path = VENDOR_DIR,
+                 versions: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Escribe los archivos con hash y el manifiesto; elimina los de versiones anteriores.
+
+    Args:
+        files: Nombre lógico → contenido (ya con las referencias internas resueltas)
+        sources: Nombre lógico → origen, para el manifiesto
+        vendor_dir: Directorio de destino
+        versions: Biblioteca → versión empaquetada, para el manifiesto
+
+    Returns:
+        Dict[str, str]: Nombre lógico → nombre con hash
+    """
+    vendor_dir.mkdir(parents=True, exist_ok=True)
+    names = {name: hashed_name(name, data) for name, data in files.items()}
+    for name, data in files.items():
+        (vendor_dir / names[name]).write_bytes(data)
+
+    for path in vendor_dir.iterdir():
+        if HASHED_NAME.match(path.name) and path.name not in names.values():
+            path.unlink()
+            logger.info(f"🧹 Eliminado {path.name}")
+
+    manifest = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'files': dict(sorted(names.items())),
+        'sources': dict(sorted(sources.items())),
+        'versions': dict(sorted((versions or {}).items())),
+    }
+    with open(vendor_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return names
+
+
+def preparar_assets(wheels: Optional[Path] = None, vendor_dir: Path = VENDOR_DIR,
+                    bootstrap: Optional[Path] = None) -> Dict[str, str]:
+    """Genera todos los recursos estáticos en ``vendor_dir``."""
+    if not VL_CONVERT_AVAILABLE or not FONTTOOLS_AVAILABLE:
+        raise RuntimeError("Faltan dependencias: pip install vl-convert-python fonttools brotli")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = {name: _fetch_wheel_file(req, member, Path(tmp), wheels)
+               for name, (req, member) in WHEEL_SOURCES.items()}
+    raw['bootstrap.css'] = fetch_bootstrap(bootstrap)
+
+    files = {
+        'bootstrap.css': build_bootstrap(raw['bootstrap.css']),
+        'inter.woff2': build_inter(raw['inter.ttf']),
+        'vega.js': build_vega(),
+    }
+    files['inter.css'] = build_inter_css(hashed_name('inter.woff2', files['inter.woff2']))
+
+    sources = {
+        'bootstrap.css': BOOTSTRAP_URL,
+        'inter.woff2': WHEEL_SOURCES['inter.ttf'][0],
+        'inter.css': 'preparar_assets.py',
+        'vega.js': f"vl-convert-python=={vl_convert.__version__}",
+    }
+    versions = {
+        'bootstrap': BOOTSTRAP_VERSION,
+        'inter': f"{font_version(raw['inter.ttf'])} (subconjunto latino)",
+        'vega': vl_convert.get_vega_version(),
+        'vega-lite': vega_lite_version(),
+        'vega-embed': vl_convert.get_vega_embed_version(),
+    }
+    names = write_vendor(files, sources, vendor_dir, versions)
+    for name, data in files.items():
+        logger.info(f"📦 {name} → {names[name]} ({len(data) / 1024:.0f} KB)")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera los recursos estáticos con hash de assets/vendor/.")
+    parser.add_argument('--wheels', type=Path, default=None,
+                        help="Carpeta con los wheels (sin acceso a un índice de PyPI)")
+    parser.add_argument('--bootstrap', type=Path, default=None,
+                        help="Copia local de bootstrap.min.css oficial (sin acceso a jsDelivr)")
+    parser.add_argument('--destino', type=Path, default=VENDOR_DIR, help="Directorio de salida")
+    args = parser.parse_args()
+
+    try:
+        preparar_assets(args.wheels, args.destino, args.bootstrap)
+    except (RuntimeError, subprocess.CalledProcessError, OSError, KeyError, ValueError) as e:
+        logger.error(f"❌ No se pudieron preparar los recursos: {e}")
+        return 1
+    logger.info(f"✅ Recursos estáticos listos en '{args.destino}'")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
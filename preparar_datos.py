@@ -1,12 +1,31 @@
 import pandas as pd
 from pathlib import Path
+import argparse
+import os
 import re
+import shutil
+import sys
+import time
+import hashlib
 import logging
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from utils.storage import (
+    write_dataset, update_manifest, staged_output, file_hash, read_manifest,
+    write_manifest, replace_directory
+)
+from utils.artifacts import ARTIFACTS_DIR, build_artifacts
+from utils.history import HISTORY_DIR, merge_history
+from utils.partitions import PARTITIONED_DIR, PART_NAME, encode_source, partition_dir, split_by_year
 
 # --- Configuración ---
 EXCEL_FILE = Path("Indicadores generalidades oficial.xlsx")
 OUTPUT_DIR = Path("data/clean")
+# Datasets que no salen del Excel (ej. repitencia): CSV versionados en git que
+# se publican junto con las hojas
+SUPPLEMENTARY_DIR = Path("data/complementarios")
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
 # Configurar logging
@@ -73,50 +92,256 @@ def process_sheet(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def main():
+def sheet_hash(df: pd.DataFrame) -> str:
+    """Calcula un hash del contenido de una hoja tal como se leyó del Excel."""
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def write_sheet(df: pd.DataFrame, output_dir: Path, sheet_name: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Procesa una hoja leída del Excel y la guarda en el directorio indicado.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: Nombre del dataset y su entrada del manifiesto
+    """
+    source_hash = sheet_hash(df)
+    df_processed = process_sheet(df.copy())
+
+    # Sanitizar nombre de hoja para usar como nombre de archivo
+    dataset_name = _sanitize_string(sheet_name)
+    entry = write_dataset(df_processed, output_dir, dataset_name, decimal='.')
+    entry['sheet'] = sheet_name
+    entry['source_sha256'] = source_hash
+    return dataset_name, entry
+
+def write_supplementary(output_dir: Path, supplementary_dir: Path = SUPPLEMENTARY_DIR) -> Dict[str, Dict[str, Any]]:
+    """
+    Guarda en la salida los datasets complementarios (CSV que no salen del Excel).
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Entradas del manifiesto por nombre de dataset
+    """
+    entries = {}
+    for csv_file in sorted(Path(supplementary_dir).glob("*.csv")):
+        entry = write_dataset(pd.read_csv(csv_file), output_dir, csv_file.stem)
+        entry['source_file'] = str(csv_file)
+        entries[csv_file.stem] = entry
+        logger.info(f"  - Dataset complementario '{csv_file.name}' publicado")
+    return entries
+
+
+def main(excel_file: Path = EXCEL_FILE, output_dir: Path = OUTPUT_DIR,
+         history_dir: Optional[Path] = HISTORY_DIR, artifacts_dir: Optional[Path] = ARTIFACTS_DIR) -> bool:
     """
     Función principal que orquesta el pipeline de preparación de datos.
     Lee un archivo Excel, procesa cada hoja y la guarda como un archivo CSV
-    limpio en el directorio de salida.
+    limpio en el directorio de salida. Después fusiona las tablas largas de
+    indicadores en el historial (`history_dir`) y reconstruye los artefactos
+    derivados que cambiaron (`artifacts_dir`); None omite cada etapa.
+
+    Returns:
+        bool: True si el pipeline terminó y publicó los datos
     """
+    excel_file, output_dir = Path(excel_file), Path(output_dir)
     logger.info("🚀 Iniciando el pipeline de preparación de datos...")
 
-    if not EXCEL_FILE.exists():
-        logger.error(f"❌ Archivo no encontrado: '{EXCEL_FILE}'. Asegúrate de que exista.")
-        return
+    if not excel_file.exists():
+        logger.error(f"❌ Archivo no encontrado: '{excel_file}'. Asegúrate de que exista.")
+        return False
 
-    # Crear directorio de salida si no existe
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    logger.info(f"📂 Directorio de salida: '{OUTPUT_DIR}'")
+    logger.info(f"📂 Directorio de salida: '{output_dir}'")
 
     try:
-        xls = pd.ExcelFile(EXCEL_FILE)
+        xls = pd.ExcelFile(excel_file)
         sheet_names = xls.sheet_names
         logger.info(f"📄 Encontradas {len(sheet_names)} hojas en el archivo Excel.")
+        manifest_entries = {}
+
+        # Escribir en un directorio temporal y publicar solo al terminar todas las hojas
+        with staged_output(output_dir) as staging_dir:
+            for sheet_name in sheet_names:
+                logger.info(f"  - Procesando hoja: '{sheet_name}'...")
+
+                df = pd.read_excel(xls, sheet_name=sheet_name)
+                
+                if df.empty:
+                    logger.warning(f"    ⚠️ La hoja '{sheet_name}' está vacía. Se omitirá.")
+                    continue
+
+                dataset_name, entry = write_sheet(df, staging_dir, sheet_name)
+                manifest_entries[dataset_name] = entry
+                logger.info(f"    ✅ Hoja procesada y guardada en: '{output_dir / entry['csv']}'")
+
+            manifest_entries.update(write_supplementary(staging_dir))
+            update_manifest(staging_dir, manifest_entries, source=excel_file)
+
+        if history_dir is not None:
+            logger.info(f"🗂️ Fusionando indicadores en el historial '{history_dir}'...")
+            merge_history(output_dir, history_dir)
+
+        if artifacts_dir is not None:
+            logger.info(f"🧩 Construyendo artefactos derivados en '{artifacts_dir}'...")
+            build_artifacts(output_dir, artifacts_dir)
+
+        logger.info("\n🎉 ¡Pipeline de datos completado exitosamente!")
+        logger.info(f"Los archivos CSV limpios están listos en '{output_dir}'.")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Ocurrió un error inesperado durante el procesamiento: {e}", exc_info=True)
+        return False
+
+def _ingest_workbook(excel_file: Path, staging_root: Path, source: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Procesa un libro y escribe sus particiones por año en un directorio temporal.
 
-        for sheet_name in sheet_names:
-            logger.info(f"  - Procesando hoja: '{sheet_name}'...")
+    Se ejecuta en un proceso aparte por cada libro.
 
+    Returns:
+        Dict[str, Dict[str, Any]]: Entradas del manifiesto por ruta relativa de partición
+    """
+    entries = {}
+    with pd.ExcelFile(excel_file) as xls:
+        for sheet_name in xls.sheet_names:
             df = pd.read_excel(xls, sheet_name=sheet_name)
-            
             if df.empty:
-                logger.warning(f"    ⚠️ La hoja '{sheet_name}' está vacía. Se omitirá.")
                 continue
 
+            source_hash = sheet_hash(df)
             df_processed = process_sheet(df.copy())
-            
-            # Sanitizar nombre de hoja para usar como nombre de archivo
-            clean_filename = f"{_sanitize_string(sheet_name)}.csv"
-            output_path = OUTPUT_DIR / clean_filename
-            
-            df_processed.to_csv(output_path, index=False, decimal='.')
-            logger.info(f"    ✅ Hoja procesada y guardada en: '{output_path}'")
+            dataset_name = _sanitize_string(sheet_name)
 
-        logger.info("\n🎉 ¡Pipeline de datos completado exitosamente!")
-        logger.info(f"Los archivos CSV limpios están listos en '{OUTPUT_DIR}'.")
+            for year, part in split_by_year(df_processed):
+                part_dir = partition_dir(staging_root, dataset_name, year, source)
+                part_dir.mkdir(parents=True, exist_ok=True)
+                entry = write_dataset(part, part_dir, PART_NAME, decimal='.')
+                entry.update(dataset=dataset_name, year=year, source=source,
+                             sheet=sheet_name, source_sha256=source_hash)
+                entries[part_dir.relative_to(staging_root).as_posix()] = entry
 
-    except Exception as e:
-        logger.error(f"❌ Ocurrió un error inesperado durante el procesamiento: {e}", exc_info=True)
+    return entries
+
+def ingest_directory(input_dir: Path, output_dir: Path = PARTITIONED_DIR,
+                     workers: Optional[int] = None, force: bool = False) -> bool:
+    """
+    Ingiere todos los libros de un directorio en datasets particionados por año y libro.
+
+    Los libros se procesan en paralelo. Solo se procesan los libros nuevos o
+    modificados (según su hash); las particiones de los demás se conservan.
+    El árbol completo (particiones anteriores más las nuevas y el manifiesto)
+    se prepara en un directorio temporal y se publica de una vez con
+    `staged_output`, que asigna la versión bajo `publish_lock`.
+
+    Args:
+        input_dir: Directorio con los libros `.xlsx` (uno por periodo)
+        output_dir: Raíz de los datasets particionados
+        workers: Procesos en paralelo (por defecto, según los CPUs)
+        force: Reprocesar también los libros que no cambiaron
+
+    Returns:
+        bool: True si todos los libros se procesaron sin errores
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    logger.info(f"🚀 Ingiriendo libros de '{input_dir}' en '{output_dir}'...")
+
+    workbooks = sorted(p for p in input_dir.glob("*.xlsx") if not p.name.startswith("~$"))
+    if not workbooks:
+        logger.error(f"❌ No hay libros .xlsx en '{input_dir}'.")
+        return False
+
+    manifest = read_manifest(output_dir)
+    known_sources = manifest.setdefault('sources', {})
+
+    pending = {}
+    for workbook in workbooks:
+        # El nombre del libro tal cual: `load_partitioned(sources=[...])` lo usa sin transformar
+        source = workbook.stem
+        digest = file_hash(workbook)
+        if not force and known_sources.get(source, {}).get('sha256') == digest:
+            logger.info(f"  - '{workbook.name}' sin cambios. Se omitirá.")
+            continue
+        pending[source] = (workbook, digest)
+
+    if not pending:
+        logger.info("📭 No hay libros nuevos o modificados.")
+        return True
+
+    # Cada libro se escribe aparte; solo lo que termina bien entra en la publicación
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    work_root = output_dir.parent / f".{output_dir.name}.ingest-{os.getpid()}-{time.time_ns()}"
+    ok = True
+    try:
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_ingest_workbook, workbook, work_root / encode_source(source), source): source
+                for source, (workbook, _) in pending.items()
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    results[source] = future.result()
+                    logger.info(f"  ✅ '{pending[source][0].name}': {len(results[source])} particiones")
+                except Exception as e:
+                    ok = False
+                    logger.error(f"  ❌ Error procesando '{pending[source][0].name}': {e}", exc_info=True)
+
+        if not results:
+            return ok
+
+        with staged_output(output_dir) as staging:
+            datasets = manifest.setdefault('datasets', {})
+            for source, entries in results.items():
+                # Eliminar particiones del libro que ya no existen en su nueva versión
+                for key in [k for k, e in datasets.items() if e.get('source') == source and k not in entries]:
+                    shutil.rmtree(staging / key, ignore_errors=True)
+                    del datasets[key]
+
+                for key, entry in entries.items():
+                    target = staging / key
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    replace_directory(work_root / encode_source(source) / key, target)
+                    datasets[key] = entry
+
+                workbook, digest = pending[source]
+                known_sources[source] = {
+                    'file': workbook.name,
+                    'sha256': digest,
+                    'partitions': len(entries),
+                    'ingested_at': datetime.now().isoformat(timespec='seconds'),
+                }
+            write_manifest(staging, manifest)
+        logger.info(f"📦 {len(results)} libros nuevos o modificados publicados en '{output_dir}'")
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    return ok
+
+def cli() -> int:
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Pipeline de preparación de datos del dashboard.")
+    parser.add_argument('--excel', type=Path, default=EXCEL_FILE, help="Libro de Excel a procesar")
+    parser.add_argument('--directorio', type=Path, default=None,
+                        help="Directorio con un libro por periodo (salida particionada por año y libro)")
+    parser.add_argument('--salida', type=Path, default=None,
+                        help=f"Directorio de salida (default: {OUTPUT_DIR} o {PARTITIONED_DIR} con --directorio)")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos en paralelo para --directorio")
+    parser.add_argument('--forzar', action='store_true', help="Reprocesar libros sin cambios (--directorio)")
+    parser.add_argument('--historial', type=Path, default=HISTORY_DIR,
+                        help=f"Historial de indicadores a actualizar (default: {HISTORY_DIR})")
+    parser.add_argument('--sin-historial', action='store_true', help="No fusionar en el historial")
+    parser.add_argument('--sin-artefactos', action='store_true', help="No construir los artefactos derivados")
+    args = parser.parse_args()
+
+    if args.directorio:
+        ok = ingest_directory(args.directorio, args.salida or PARTITIONED_DIR, args.workers, args.forzar)
+    else:
+        ok = main(args.excel, args.salida or OUTPUT_DIR,
+                  None if args.sin_historial else args.historial,
+                  None if args.sin_artefactos else ARTIFACTS_DIR)
+    return 0 if ok else 1
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(cli())
@@ -0,0 +1,169 @@
+"""
+Servidor de producción del dashboard.
+
+`python dashboard.py` usa el servidor de desarrollo de Flask: un proceso que
+no sirve para tráfico real. Este punto de entrada sirve `dashboard.server`
+(la aplicación WSGI de Dash) con gunicorn:
+
+- `preload_app`: el proceso maestro importa el dashboard, carga los datos y
+  precalienta artefactos y figuras (`dashboard.warm_up`) antes de crear los
+  workers, que comparten esa memoria copy-on-write;
+- cada worker atiende varias peticiones a la vez con hilos (`gthread`);
+- con un backend SQL (`DASHBOARD_BACKEND=sqlite`) cada worker abre su propia
+  conexión al arrancar (`post_fork`): una conexión heredada del maestro no se
+  puede usar en varios procesos. `duckdb` se sustituye por `sqlite`, porque
+  DuckDB no deja abrir el archivo a otros procesos mientras el maestro lo
+  tiene abierto;
+- `kill -HUP <pid del maestro>` reinicia sin corte: el maestro recarga los
+  datos si hay una versión publicada nueva, vuelve a precalentar y crea los
+  workers nuevos antes de retirar los anteriores, que terminan sus
+  peticiones en curso.
+
+Uso:
+    python servir.py [--host 0.0.0.0] [--puerto 8057] [--workers 4] [--hilos 8]
+
+También se puede lanzar gunicorn directamente (sin la recarga de datos en HUP
+y solo con el backend pandas, porque no hay `post_fork`):
+    gunicorn --preload -k gthread -w 4 --threads 8 dashboard:server
+"""
+
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import sys
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:  # Windows o sin la dependencia opcional
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+from utils.backends import BACKEND_ENV
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = os.environ.get("DASHBOARD_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.environ.get("DASHBOARD_PORT", "8057"))
+DEFAULT_WORKERS = int(os.environ.get("DASHBOARD_WORKERS", min(2 * multiprocessing.cpu_count() + 1, 8)))
+DEFAULT_THREADS = int(os.environ.get("DASHBOARD_THREADS", "4"))
+DEFAULT_TIMEOUT = 60
+GRACEFUL_TIMEOUT = 30
+
+
+def check_backend():
+    """Sustituye duckdb por sqlite antes de cargar el dashboard en el maestro."""
+    if os.environ.get(BACKEND_ENV, "").lower() == "duckdb":
+        logger.warning("⚠️ DuckDB no admite que los workers abran el archivo que tiene abierto el maestro. "
+                       "Se usará el backend sqlite.")
+        os.environ[BACKEND_ENV] = "sqlite"
+
+
+def post_fork(server, worker):
+    """Hook de gunicorn: cada worker abre sus propias conexiones al backend."""
+    import dashboard
+
+    dashboard.data_loader.backend.reopen()
+
+
+def load_dashboard(refresh: bool = False):
+    """
+    Importa el dashboard (carga los datos) y lo precalienta.
+
+    Args:
+        refresh: Recargar los datos si se publicó una versión nueva (reinicio por HUP)
+
+    Returns:
+        La aplicación WSGI del dashboard
+    """
+    check_backend()
+    import dashboard
+
+    if refresh:
+        gc.unfreeze()
+    if refresh and dashboard.data_loader.reload_if_changed():
+        logger.info(f"🔄 Datos recargados en el maestro (versión {dashboard.data_loader.data_version})")
+    dashboard.warm_up()
+    # Lo cargado hasta aquí no cambia: sacarlo del GC evita que las
+    # recolecciones de los workers escriban en las páginas compartidas.
+    # La conexión del maestro al backend se conserva para la recarga en HUP;
+    # los workers (también los creados tras un HUP) abren la suya en post_fork.
+    gc.freeze()
+    return dashboard.server
+
+
+class DashboardServer(BaseApplication):
+    """Aplicación gunicorn que precarga y precalienta el dashboard en el maestro."""
+
+    def __init__(self, options):
+        self.options = options
+        self.application = None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        if self.application is None:
+            self.application = load_dashboard()
+        return self.application
+
+    def reload(self):
+        # HUP: se ejecuta en el maestro antes de crear los workers nuevos
+        super().reload()
+        self.application = load_dashboard(refresh=True)
+        self.callable = self.application
+
+
+def server_options(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+                   threads: int = DEFAULT_THREADS, timeout: int = DEFAULT_TIMEOUT,
+                   max_requests: int = 0):
+    """Opciones de gunicorn del servidor de producción."""
+    return {
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'timeout': timeout,
+        'graceful_timeout': GRACEFUL_TIMEOUT,
+        'keepalive': 5,
+        'post_fork': post_fork,
+        # Reciclar workers es barato: se bifurcan del maestro ya precalentado
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests // 10 if max_requests else 0,
+        'accesslog': '-',
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sirve el dashboard en producción con gunicorn.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Dirección de escucha (default: {DEFAULT_HOST})")
+    parser.add_argument('--puerto', type=int, default=DEFAULT_PORT, help=f"Puerto (default: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Procesos worker (default: {DEFAULT_WORKERS}, o DASHBOARD_WORKERS)")
+    parser.add_argument('--hilos', type=int, default=DEFAULT_THREADS,
+                        help=f"Hilos por worker (default: {DEFAULT_THREADS}, o DASHBOARD_THREADS)")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="Segundos máximos por petición")
+    parser.add_argument('--max-peticiones', type=int, default=0,
+                        help="Reciclar cada worker tras N peticiones (0 = nunca)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not GUNICORN_AVAILABLE:
+        logger.error("❌ gunicorn no está instalado (pip install gunicorn). "
+                     "En Windows, use `python dashboard.py` o un servidor WSGI como waitress.")
+        return 1
+
+    options = server_options(args.host, args.puerto, args.workers, args.hilos, args.timeout, args.max_peticiones)
+    logger.info(f"🚀 Sirviendo en {options['bind']} con {args.workers} workers × {args.hilos} hilos")
+    DashboardServer(options).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
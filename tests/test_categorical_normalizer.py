@@ -0,0 +1,89 @@
+"""
+La normalización categórica por valor distinto (DataValidator) debe dar el
+mismo resultado que validar fila por fila con el modelo.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from data_processor.validator import DataValidator
+from models import Desercion, MunicipiosModel
+from models.base import CATEGORICAL_CACHE_SIZE, get_categorical_normalizers
+
+# Más valores distintos que la caché de cada normalizador
+DISTINCT = CATEGORICAL_CACHE_SIZE + 476
+
+
+def _clear_caches(model_class):
+    for normalizer in get_categorical_normalizers(model_class).values():
+        normalizer.cache_clear()
+
+
+def _row_by_row(model_class, df):
+    """Validación de referencia: cada fila directamente contra el modelo."""
+    _clear_caches(model_class)
+    rows, errors = [], set()
+    for index, row in df.iterrows():
+        try:
+            rows.append(model_class(**row.to_dict()).model_dump())
+        except ValidationError as e:
+            errors.update((index, error['loc'][0]) for error in e.errors())
+    return pd.DataFrame(rows), errors
+
+
+def _vectorized(sheet_name, model_class, df):
+    _clear_caches(model_class)
+    result = DataValidator().validate_sheet(sheet_name, df)
+    store = result.error_store
+    errors = {(row, store.fields[code]) for row, code in zip(store.row_indices, store.field_codes)}
+    return result.data, errors
+
+
+def _categorical_values(rng, n):
+    """Nombres con espacios y mayúsculas variables, repetidos, nulos y vacíos."""
+    names = [f"  {'MUNICIPIO' if i % 3 else 'municipio'} {i} " for i in range(DISTINCT)]
+    values = rng.choice(np.array(names, dtype=object), size=n).astype(object)
+    values[::97] = np.nan
+    values[5::211] = ''
+    values[7::307] = '   '
+    return values
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_municipios_matches_row_by_row(seed):
+    rng = np.random.default_rng(seed)
+    n = 3 * DISTINCT
+    df = pd.DataFrame({
+        'municipio': _categorical_values(rng, n),
+        'numero_de_empresas': rng.integers(0, 1000, size=n).astype(float),
+        'porcentaje_del_total': rng.uniform(0, 100, size=n),
+    })
+    df.loc[::13, 'porcentaje_del_total'] = np.nan
+    assert df['municipio'].nunique() > CATEGORICAL_CACHE_SIZE
+
+    expected, expected_errors = _row_by_row(MunicipiosModel, df)
+    data, errors = _vectorized('municipios', MunicipiosModel, df)
+
+    pd.testing.assert_frame_equal(data, expected)
+    assert errors == expected_errors
+    assert expected_errors  # los nulos y vacíos se reportan igual en ambos caminos
+
+
+def test_desercion_matches_row_by_row():
+    rng = np.random.default_rng(2)
+    n = 2 * DISTINCT
+    df = pd.DataFrame({
+        'municipio': _categorical_values(rng, n),
+        'año': rng.integers(2015, 2025, size=n),
+        'tasa_desercion': rng.uniform(0, 1, size=n).round(4),
+        'sector': rng.choice(np.array([' Oficial', 'oficial ', 'Privado', np.nan, ''], dtype=object), size=n),
+        'observaciones': 'Sin dato',
+    })
+
+    expected, expected_errors = _row_by_row(Desercion, df)
+    data, errors = _vectorized('desercion', Desercion, df)
+
+    pd.testing.assert_frame_equal(data, expected)
+    assert errors == expected_errors
@@ -0,0 +1,313 @@
+"""
+Artefactos derivados de los datos limpios, como un grafo de dependencias.
+
+Cada artefacto (KPIs, totales, tablas listas para graficar) se declara con
+``@artifact`` indicando los datasets limpios que lee (``inputs``) y los
+artefactos de los que depende (``deps``). ``build_artifacts``:
+
+- calcula la clave de cada nodo a partir del hash de sus entradas, de las
+  claves de sus dependencias y de la versión de su código (el código
+  completo de los módulos de la función y de las funciones que declara en
+  ``uses``, así los auxiliares privados de esos módulos también cuentan);
+- reconstruye solo los nodos cuya clave cambió, en paralelo cuando el grafo
+  lo permite;
+- guarda cada resultado en ``data/artifacts/`` junto a un manifiesto con la
+  versión de datos de la que se derivaron.
+
+El dashboard carga los artefactos al iniciar (``DataLoader.get_artifact``) y
+solo los calcula en caliente si no hay una versión precalculada vigente.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIR = Path("data/artifacts")
+ARTIFACTS_MANIFEST = "artifacts.json"
+
+# Artefactos declarados por nombre (ver utils/derived.py)
+REGISTRY: Dict[str, "ArtifactSpec"] = {}
+
+
+def _source(obj: Any) -> str:
+    """Código fuente de una función o módulo (su nombre si no está disponible)."""
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, '__qualname__', None) or obj.__name__
+
+
+def _code_sources(funcs: Iterable[Callable]) -> List[str]:
+    """Código de cada función y del módulo que la define (cada módulo una vez)."""
+    sources, modules = [], []
+    for func in funcs:
+        sources.append(_source(func))
+        module = inspect.getmodule(func)
+        if module is not None and module not in modules:
+            modules.append(module)
+    return sources + [_source(module) for module in modules]
+
+
+class ArtifactSpec:
+    """Declaración de un artefacto derivado."""
+
+    def __init__(self, name: str, func: Callable, inputs: Iterable[str] = (),
+                 deps: Iterable[str] = (), version: str = "1", uses: Iterable[Callable] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.deps = tuple(deps)
+        self.version = version
+        self.uses = tuple(uses)
+
+    @property
+    def code_hash(self) -> str:
+        """Hash de la versión declarada y del código de la función, de las que usa y de sus módulos."""
+        sources = [self.version] + _code_sources((self.func,) + self.uses)
+        return hashlib.sha256('\x1f'.join(sources).encode('utf-8')).hexdigest()
+
+    def compute(self, loader, deps: Dict[str, Any]) -> Any:
+        """Calcula el artefacto con el loader de datos limpios y sus dependencias."""
+        return self.func(loader, deps)
+
+
+def artifact(name: Optional[str] = None, inputs: Iterable[str] = (),
+             deps: Iterable[str] = (), version: str = "1", uses: Iterable[Callable] = ()):
+    """
+    Decorador que registra una función como artefacto derivado.
+
+    La función recibe ``(loader, deps)``: un ``DataLoader`` sobre los datos
+    limpios y un diccionario con los valores de sus dependencias. Debe leer
+    solo los datasets declarados en ``inputs`` (claves de
+    ``DataLoader.file_mappings``) para que la caché sea correcta. Si delega
+    el cálculo en funciones de otros módulos (ej. ``DataLoader.compute_kpis``
+    o ``DataLoader.query``), deben declararse en ``uses``: su código y el de
+    su módulo forman parte de la clave, así editarlas (o editar los
+    auxiliares de ese módulo en que se apoyan) invalida el artefacto.
+    """
+    def decorator(func: Callable) -> Callable:
+        spec = ArtifactSpec(name or func.__name__, func, inputs, deps, version, uses)
+        REGISTRY[spec.name] = spec
+        func.artifact_spec = spec
+        return func
+    return decorator
+
+
+def load_definitions():
+    """Importa el módulo que declara los artefactos del dashboard."""
+    import utils.derived  # noqa: F401
+
+
+def topological_order(specs: Dict[str, ArtifactSpec]) -> List[str]:
+    """Ordena los artefactos para que cada uno aparezca después de sus dependencias."""
+    order: List[str] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str, path: tuple):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Ciclo en el grafo de artefactos: {' -> '.join(path + (name,))}")
+        if name not in specs:
+            raise ValueError(f"Artefacto desconocido: '{name}' (requerido por {path[-1] if path else '?'})")
+        state[name] = 'visiting'
+        for dep in specs[name].deps:
+            visit(dep, path + (name,))
+        state[name] = 'done'
+        order.append(name)
+
+    for name in specs:
+        visit(name, ())
+    return order
+
+
+def _input_hashes(loader, inputs: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Hash de contenido de cada dataset de entrada, según el manifiesto de datos limpios."""
+    from utils.storage import file_hash, read_manifest
+
+    datasets = read_manifest(loader.data_dir).get('datasets', {})
+    hashes = {}
+    for key in inputs:
+        filename = loader.file_mappings.get(key, f"{key}.csv")
+        entry = datasets.get(Path(filename).stem, {})
+        csv_file = loader.data_dir / filename
+        if entry.get('sha256'):
+            hashes[key] = entry['sha256']
+        elif csv_file.exists():
+            hashes[key] = file_hash(csv_file)
+        else:
+            hashes[key] = None
+    return hashes
+
+
+def node_keys(loader, specs: Dict[str, ArtifactSpec]) -> Dict[str, str]:
+    """Clave de caché de cada nodo: entradas, claves de dependencias y código."""
+    keys: Dict[str, str] = {}
+    for name in topological_order(specs):
+        spec = specs[name]
+        payload = {
+            'name': name,
+            'code': spec.code_hash,
+            'inputs': _input_hashes(loader, spec.inputs),
+            'deps': {dep: keys[dep] for dep in spec.deps},
+        }
+        keys[name] = hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    return keys
+
+
+def read_artifacts_manifest(artifacts_dir: Path) -> Dict[str, Any]:
+    """Lee el manifiesto de artefactos (vacío si no existe)."""
+    manifest_file = Path(artifacts_dir) / ARTIFACTS_MANIFEST
+    try:
+        with open(manifest_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'artifacts': {}}
+
+
+def read_artifact(artifacts_dir: Path, entry: Dict[str, Any]) -> Any:
+    """Lee el valor guardado de un artefacto."""
+    with open(Path(artifacts_dir) / entry['file'], 'rb') as f:
+        return pickle.load(f)
+
+
+def _write_artifact(artifacts_dir: Path, name: str, key: str, value: Any) -> str:
+    """Guarda el valor de un artefacto de forma atómica y devuelve su nombre de archivo."""
+    filename = f"{name}-{key[:16]}.pkl"
+    tmp_file = artifacts_dir / f".{filename}.tmp-{os.getpid()}"
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_file.replace(artifacts_dir / filename)
+    return filename
+
+
+def compute_artifact(name: str, loader, memo: Dict[str, Any]) -> Any:
+    """Calcula un artefacto en memoria (y sus dependencias), sin caché en disco."""
+    load_definitions()
+    if name not in memo:
+        spec = REGISTRY[name]
+        deps = {dep: compute_artifact(dep, loader, memo) for dep in spec.deps}
+        memo[name] = spec.compute(loader, deps)
+    return memo[name]
+
+
+def build_artifacts(data_dir: Path = Path("data/clean"), artifacts_dir: Path = ARTIFACTS_DIR,
+                    workers: Optional[int] = None, force: bool = False,
+                    loader=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Construye los artefactos cuyas entradas o código cambiaron.
+
+    Args:
+        data_dir: Directorio de datos limpios
+        artifacts_dir: Directorio de artefactos
+        workers: Hilos en paralelo (por defecto, según los CPUs)
+        force: Reconstruir todos los nodos
+        loader: DataLoader ya abierto sobre ``data_dir`` (se recarga si hay
+            una versión nueva). Sin él se abre uno con el backend ``pandas``,
+            para no competir por el archivo de una base duckdb que tenga
+            abierta otro proceso (ej. el dashboard)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Estado de cada nodo (``cached``, ``built``,
+        ``failed`` o ``skipped``) con su clave y duración
+    """
+    from utils.loader import DataLoader
+    from utils.storage import read_data_version
+
+    load_definitions()
+    artifacts_dir = Path(artifacts_dir)
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+
+    if loader is None:
+        loader = DataLoader(str(data_dir), backend="pandas")
+    if not loader.reload_if_changed():
+        loader.load_all_data()
+    keys = node_keys(loader, REGISTRY)
+    previous = read_artifacts_manifest(artifacts_dir).get('artifacts', {})
+
+    results: Dict[str, Dict[str, Any]] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name, key in keys.items():
+        entry = previous.get(name)
+        if not force and entry and entry.get('key') == key and (artifacts_dir / entry['file']).exists():
+            entries[name] = entry
+            results[name] = {'status': 'cached', 'key': key, 'duration_s': 0.0}
+
+    values: Dict[str, Any] = {}
+
+    def dep_values(spec: ArtifactSpec) -> Dict[str, Any]:
+        for dep in spec.deps:
+            if dep not in values:
+                values[dep] = read_artifact(artifacts_dir, entries[dep])
+        return {dep: values[dep] for dep in spec.deps}
+
+    def run(name: str, deps: Dict[str, Any]):
+        started = time.perf_counter()
+        value = REGISTRY[name].compute(loader, deps)
+        return value, round(time.perf_counter() - started, 4)
+
+    pending = [name for name in topological_order(REGISTRY) if name not in results]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            # Lanzar los nodos cuyas dependencias ya están resueltas
+            for name in list(pending):
+                spec = REGISTRY[name]
+                if any(results.get(dep, {}).get('status') in ('failed', 'skipped') for dep in spec.deps):
+                    results[name] = {'status': 'skipped', 'key': keys[name], 'duration_s': 0.0}
+                    pending.remove(name)
+                elif all(dep in entries for dep in spec.deps):
+                    running[executor.submit(run, name, dep_values(spec))] = name
+                    pending.remove(name)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    value, duration = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Artefacto '{name}' falló: {e}", exc_info=True)
+                    results[name] = {'status': 'failed', 'key': keys[name], 'error': f"{type(e).__name__}: {e}"}
+                    continue
+                values[name] = value
+                entries[name] = {
+                    'key': keys[name],
+                    'file': _write_artifact(artifacts_dir, name, keys[name], value),
+                    'built_at': datetime.now().isoformat(timespec='seconds'),
+                    'duration_s': duration,
+                }
+                results[name] = {'status': 'built', 'key': keys[name], 'duration_s': duration}
+                logger.info(f"  🧩 Artefacto '{name}' construido en {duration}s")
+
+    manifest = {
+        'data_version': read_data_version(data_dir),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+        'artifacts': entries,
+    }
+    tmp_file = artifacts_dir / f"{ARTIFACTS_MANIFEST}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(artifacts_dir / ARTIFACTS_MANIFEST)
+
+    # Eliminar archivos de claves antiguas
+    current = {entry['file'] for entry in entries.values()}
+    for old_file in artifacts_dir.glob("*.pkl"):
+        if old_file.name not in current:
+            old_file.unlink(missing_ok=True)
+
+    built = sum(r['status'] == 'built' for r in results.values())
+    logger.info(f"🧩 Artefactos: {built} construidos, {len(results) - built} sin cambios o con errores")
+    return results
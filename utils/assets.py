@@ -0,0 +1,181 @@
+"""
+Recursos estáticos de terceros servidos por el propio dashboard.
+
+Bootstrap, la fuente Inter y Vega (para los gráficos de Altair en iframes)
+viven en `assets/vendor/` con el hash del contenido en el nombre
+(ej. ``bootstrap.3f9a1c2b7d4e.css``), generados por `preparar_assets.py`.
+`assets/vendor/manifest.json` relaciona cada nombre lógico con su archivo
+y registra el origen y la versión de cada biblioteca.
+
+De Inter solo se incluye el subconjunto latino (el rango ``latin`` de Google
+Fonts: español, tildes, ñ, ¿¡ y puntuación tipográfica) y los pesos 300-700.
+El ``@font-face`` declara ese ``unicode-range``, así que un texto con otros
+alfabetos (cirílico, griego, vietnamita...) se muestra con la fuente de
+respaldo del sistema.
+Así el dashboard funciona sin red saliente (intranet sin acceso a CDN) y:
+
+- cada archivo con hash se sirve con ``Cache-Control: immutable`` y un año
+  de vida: un archivo nuevo tiene otro nombre, nunca hay que revalidar;
+- CSS y JS salen comprimidos (brotli o gzip) desde una caché en memoria;
+- opcionalmente, la página lleva un encabezado ``Link: rel=preload`` para
+  que el navegador pida el CSS y la fuente antes de analizar el HTML
+  (desactivable con `DASHBOARD_PRELOAD=0`).
+
+Dash incluye automáticamente los CSS y JS de `assets/`; los archivos con
+hash se excluyen con ``assets_ignore=VENDOR_IGNORE`` y se enlazan a mano.
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.compression import CompressedCache, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+VENDOR_DIR = ASSETS_DIR / "vendor"
+MANIFEST_FILE = "manifest.json"
+ASSETS_URL = "/assets/vendor"
+PRELOAD_ENV = "DASHBOARD_PRELOAD"
+
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(rf"^[\w-]+\.[0-9a-f]{{{HASH_LENGTH}}}\.\w+$")
+# Para `dash.Dash(assets_ignore=...)`: Dash compara solo el nombre del archivo
+VENDOR_IGNORE = rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.(css|js)$"
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+COMPRESSIBLE_SUFFIXES = ('.css', '.js', '.svg')
+STATIC_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+STYLESHEETS = ('bootstrap.css', 'inter.css')
+PRELOADS = (('bootstrap.css', 'style', None), ('inter.woff2', 'font', 'font/woff2'))
+
+mimetypes.add_type('font/woff2', '.woff2')
+
+
+def content_hash(data: bytes) -> str:
+    """Hash corto del contenido para el nombre de un archivo."""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    """Nombre con hash: ``bootstrap.css`` → ``bootstrap.<hash>.css``."""
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{suffix}"
+
+
+@lru_cache(maxsize=1)
+def load_manifest(vendor_dir: Path = VENDOR_DIR) -> Dict[str, str]:
+    """Nombre lógico → archivo con hash, según `assets/vendor/manifest.json`."""
+    path = Path(vendor_dir) / MANIFEST_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['files']
+    except (OSError, ValueError, KeyError) as e:
+        raise RuntimeError(f"No se encontraron los recursos estáticos ({path}): ejecute preparar_assets.py") from e
+
+
+def asset_url(name: str) -> str:
+    """URL del recurso con hash para un nombre lógico (ej. ``vega.js``)."""
+    manifest = load_manifest()
+    if name not in manifest:
+        raise KeyError(f"Recurso '{name}' no está en {MANIFEST_FILE}: ejecute preparar_assets.py")
+    return f"{ASSETS_URL}/{manifest[name]}"
+
+
+def vendor_stylesheets() -> List[str]:
+    """Hojas de estilo locales para `external_stylesheets` de Dash."""
+    return [asset_url(name) for name in STYLESHEETS]
+
+
+def preload_header() -> str:
+    """Valor del encabezado ``Link`` con las precargas del CSS y la fuente."""
+    links = []
+    for name, kind, mimetype in PRELOADS:
+        link = f"<{asset_url(name)}>; rel=preload; as={kind}"
+        if mimetype:
+            # Las fuentes se piden siempre en modo CORS; sin crossorigin la precarga no se reutiliza
+            link += f'; type="{mimetype}"; crossorigin'
+        links.append(link)
+    return ', '.join(links)
+
+
+@lru_cache(maxsize=64)
+def _read_vendor_file(name: str) -> Optional[bytes]:
+    # Los archivos con hash no cambian: se leen una sola vez
+    path = VENDOR_DIR / name
+    return path.read_bytes() if path.is_file() else None
+
+
+def install_static_assets(server, preload: Optional[bool] = None,
+                          cache: Optional[CompressedCache] = None) -> CompressedCache:
+    """
+    Sirve `assets/vendor/` con caché inmutable y compresión, y añade las precargas.
+
+    Args:
+        server: Aplicación Flask (ej. `app.server`)
+        preload: Añadir ``Link: rel=preload`` a las páginas (por defecto, según `DASHBOARD_PRELOAD`)
+        cache: Caché de cuerpos comprimidos (una nueva si es None)
+
+    Returns:
+        CompressedCache: La caché usada
+    """
+    from flask import Response, request
+
+    if preload is None:
+        preload = os.environ.get(PRELOAD_ENV, '1').lower() not in ('0', 'false', 'no', 'off')
+    cache = cache or CompressedCache(max_bytes=STATIC_CACHE_MAX_BYTES)
+    prefix = f"{ASSETS_URL}/"
+    link_header = preload_header() if preload else None
+
+    @server.before_request
+    def _serve_vendor_file():
+        if not request.path.startswith(prefix) or request.method not in ('GET', 'HEAD'):
+            return None
+        name = request.path[len(prefix):]
+        if not HASHED_NAME.match(name):
+            return None
+        body = _read_vendor_file(name)
+        if body is None:
+            return None
+
+        etag = name
+        encoding = None
+        if name.endswith(COMPRESSIBLE_SUFFIXES):
+            encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+            etag = f"{name}-{encoding or 'identity'}"
+
+        response = Response(mimetype=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.set_etag(etag)
+        if encoding is not None:
+            response.vary.add('Accept-Encoding')
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+            return response
+
+        if encoding is not None:
+            body = cache.get(content_hash(body), encoding, body)
+            response.headers['Content-Encoding'] = encoding
+        response.set_data(body)
+        return response
+
+    if link_header:
+        @server.after_request
+        def _add_preload(response):
+            if request.method == 'GET' and response.mimetype == 'text/html' and response.status_code == 200:
+                response.headers.add('Link', link_header)
+            return response
+
+    logger.info(f"📦 Recursos estáticos locales en {ASSETS_URL} ({len(load_manifest())} archivos"
+                f"{', con precarga' if link_header else ''})")
+    return cache
@@ -0,0 +1,547 @@
+"""
+Backends de almacenamiento del DataLoader.
+
+- ``pandas``: DataFrames en memoria (comportamiento original).
+- ``duckdb``: base analítica embebida en un archivo (``data/warehouse.duckdb``),
+  sin servidor. Requiere el paquete opcional ``duckdb``.
+- ``sqlite``: misma idea con ``sqlite3`` de la biblioteca estándar.
+
+Los backends SQL guardan cada dataset como una tabla junto al hash de
+contenido del CSV de origen, así que al reiniciar solo se vuelven a cargar
+los datasets que cambiaron. Los filtros y agregaciones de ``query`` se
+ejecutan dentro de la base, y a pandas solo llega el resultado.
+
+Filtros (``where``): lista de tuplas ``(columna, operador, valor)`` con los
+operadores de ``WHERE_OPERATORS``; ``contains`` no distingue mayúsculas.
+Agregaciones (``agg``): ``{columna: función}`` con las funciones de
+``AGG_FUNCTIONS``. Orden (``order_by``): columnas, con ``-`` para descendente.
+
+Los backends SQL cargan cada dataset en una tabla de preparación y
+``commit`` las renombra todas en una sola transacción: una consulta ve la
+carga anterior completa o la nueva completa, nunca una mezcla.
+
+Las columnas indexadas (``create_index``) aceleran los filtros ``==``, ``in``
+y ``contains``: en SQL con un índice de la base y en pandas con un mapa de
+valor a posiciones de fila.
+"""
+
+import importlib.util
+import logging
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# duckdb se importa solo al crear ese backend: con el backend pandas no suma al arranque
+DUCKDB_AVAILABLE = importlib.util.find_spec("duckdb") is not None
+
+BACKEND_ENV = "DASHBOARD_BACKEND"
+DEFAULT_BACKEND = "pandas"
+DATABASE_NAME = "warehouse"
+META_TABLE = "_datasets"
+STAGING_PREFIX = "_staging_"
+
+WHERE_OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not in',
+                   'contains', 'not contains', 'isnull', 'notnull')
+AGG_FUNCTIONS = ('sum', 'count', 'mean', 'min', 'max', 'nunique')
+
+Condition = Tuple[str, str, Any]
+
+
+def _check_where(where: Optional[Sequence[Condition]]):
+    """Valida los operadores de los filtros."""
+    for condition in where or ():
+        if len(condition) != 3 or condition[1] not in WHERE_OPERATORS:
+            raise ValueError(f"Filtro inválido: {condition!r}. Operadores: {', '.join(WHERE_OPERATORS)}")
+
+
+def _check_agg(agg: Optional[Dict[str, str]]):
+    """Valida las funciones de agregación."""
+    for col, func in (agg or {}).items():
+        if func not in AGG_FUNCTIONS:
+            raise ValueError(f"Agregación inválida para '{col}': {func}. Funciones: {', '.join(AGG_FUNCTIONS)}")
+
+
+def _order_columns(order_by: Optional[Sequence[str]]) -> List[Tuple[str, bool]]:
+    """(columna, ascendente) de cada criterio de orden."""
+    return [(col[1:], False) if col.startswith('-') else (col, True) for col in order_by or ()]
+
+
+def apply_query(df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                where: Optional[Sequence[Condition]] = None, group_by: Optional[Sequence[str]] = None,
+                agg: Optional[Dict[str, str]] = None, order_by: Optional[Sequence[str]] = None,
+                limit: Optional[int] = None) -> pd.DataFrame:
+    """Ejecuta una consulta sobre un DataFrame en memoria (mismas reglas que los backends SQL)."""
+    _check_where(where)
+    _check_agg(agg)
+    if df.empty:
+        return pd.DataFrame(columns=list(group_by or ()) + list(agg or columns or ()))
+
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in where or ():
+        series = df[col]
+        if op == '==':
+            cond = series.isna() if value is None else series == value
+        elif op == '!=':
+            cond = series.notna() if value is None else series != value
+        elif op == '<':
+            cond = series < value
+        elif op == '<=':
+            cond = series <= value
+        elif op == '>':
+            cond = series > value
+        elif op == '>=':
+            cond = series >= value
+        elif op == 'in':
+            cond = series.isin(list(value))
+        elif op == 'not in':
+            cond = ~series.isin(list(value))
+        elif op == 'contains':
+            cond = series.astype(str).str.contains(str(value), case=False, regex=False, na=False)
+        elif op == 'not contains':
+            cond = ~series.astype(str).str.contains(str(value), case=False, regex=False, na=False)
+        elif op == 'isnull':
+            cond = series.isna()
+        else:
+            cond = series.notna()
+        mask &= cond.fillna(False).astype(bool)
+    result = df[mask]
+
+    if agg:
+        funcs = {col: ('nunique' if func == 'nunique' else func) for col, func in agg.items()}
+        if group_by:
+            result = result.groupby(list(group_by), dropna=False, sort=True).agg(funcs).reset_index()
+        else:
+            result = result.agg(funcs).to_frame().T.reset_index(drop=True)
+    elif columns:
+        result = result[list(columns)]
+
+    order = _order_columns(order_by)
+    if order:
+        result = result.sort_values([c for c, _ in order], ascending=[a for _, a in order])
+    if limit is not None:
+        result = result.head(limit)
+    return result.reset_index(drop=True)
+
+
+class DataBackend(ABC):
+    """Interfaz de almacenamiento de datasets del DataLoader."""
+
+    name = "base"
+
+    def is_current(self, key: str, sha256: Optional[str]) -> bool:
+        """Indica si el dataset ya está cargado con ese contenido."""
+        return False
+
+    @abstractmethod
+    def store(self, key: str, df: pd.DataFrame, sha256: Optional[str] = None):
+        """Guarda (o reemplaza) un dataset; se publica en el siguiente ``commit``."""
+
+    def commit(self):
+        """Confirma los datasets guardados desde la última confirmación."""
+
+    @abstractmethod
+    def read(self, key: str) -> pd.DataFrame:
+        """Devuelve un dataset completo (vacío si no existe)."""
+
+    @abstractmethod
+    def columns(self, key: str) -> List[str]:
+        """Columnas de un dataset."""
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Datasets disponibles."""
+
+    @abstractmethod
+    def query(self, key: str, columns: Optional[Sequence[str]] = None,
+              where: Optional[Sequence[Condition]] = None, group_by: Optional[Sequence[str]] = None,
+              agg: Optional[Dict[str, str]] = None, order_by: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """Proyección, filtro, agregación y orden sobre un dataset."""
+
+    def create_index(self, key: str, column: str):
+        """Indexa una columna de un dataset para acelerar los filtros por valor."""
+
+    def view(self) -> Mapping:
+        """Vista de solo lectura de los datasets por clave."""
+        return BackendView(self)
+
+    def close(self):
+        """Libera los recursos del backend."""
+
+    def reopen(self):
+        """Abre recursos propios en un proceso bifurcado (worker de gunicorn)."""
+
+
+class BackendView(Mapping):
+    """Mapping perezoso: cada dataset se lee del backend al accederlo."""
+
+    def __init__(self, backend: DataBackend):
+        self._backend = backend
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        if key not in self._backend.keys():
+            raise KeyError(key)
+        return self._backend.read(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._backend.keys())
+
+    def __len__(self) -> int:
+        return len(self._backend.keys())
+
+
+class PandasBackend(DataBackend):
+    """DataFrames en memoria; una carga nueva reemplaza a la anterior de una vez."""
+
+    name = "pandas"
+    INDEXED_OPERATORS = ('==', 'in', 'contains')
+
+    def __init__(self):
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self._staged: Dict[str, pd.DataFrame] = {}
+        self._index_columns: Dict[str, Set[str]] = {}
+        # (dataset, columna) -> {valor: posiciones de fila}; se construye al primer uso
+        self._indexes: Dict[Tuple[str, str], Dict[Any, np.ndarray]] = {}
+        self._index_lock = threading.Lock()
+
+    def store(self, key: str, df: pd.DataFrame, sha256: Optional[str] = None):
+        self._staged[key] = df
+
+    def commit(self):
+        self.frames, self._staged = self._staged, {}
+        self._indexes = {}
+
+    def create_index(self, key: str, column: str):
+        self._index_columns.setdefault(key, set()).add(column)
+
+    def _index(self, key: str, column: str) -> Dict[Any, np.ndarray]:
+        """Mapa de valor a posiciones de fila de una columna indexada."""
+        with self._index_lock:
+            if (key, column) not in self._indexes:
+                series = self.read(key)[column]
+                self._indexes[(key, column)] = series.groupby(series, sort=False).indices
+            return self._indexes[(key, column)]
+
+    def _index_positions(self, key: str, column: str, op: str, value: Any) -> np.ndarray:
+        """Posiciones de las filas que cumplen un filtro sobre una columna indexada."""
+        index = self._index(key, column)
+        if op == '==':
+            matches = [value]
+        elif op == 'in':
+            matches = list(value)
+        else:
+            # contains: se evalúa sobre los valores distintos, no sobre todas las filas
+            needle = str(value).lower()
+            matches = [v for v in index if needle in str(v).lower()]
+        found = [index[v] for v in matches if v in index]
+        return np.unique(np.concatenate(found)) if found else np.array([], dtype=np.intp)
+
+    def read(self, key: str) -> pd.DataFrame:
+        return self.frames.get(key, pd.DataFrame())
+
+    def columns(self, key: str) -> List[str]:
+        return list(self.read(key).columns)
+
+    def keys(self) -> List[str]:
+        return list(self.frames)
+
+    def query(self, key, columns=None, where=None, group_by=None, agg=None, order_by=None, limit=None):
+        df = self.read(key)
+        _check_where(where)
+        indexed = self._index_columns.get(key, set())
+        remaining = []
+        positions = None
+        for col, op, value in where or ():
+            if col in indexed and op in self.INDEXED_OPERATORS and value is not None and col in df.columns:
+                found = self._index_positions(key, col, op, value)
+                positions = found if positions is None else np.intersect1d(positions, found)
+            else:
+                remaining.append((col, op, value))
+
+        if positions is not None:
+            df = df.iloc[positions]
+        return apply_query(df, columns, remaining, group_by, agg, order_by, limit)
+
+    def view(self) -> Mapping:
+        return self.frames
+
+
+def _quote(identifier: str) -> str:
+    """Cita un identificador SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def build_sql(table: str, columns: Optional[Sequence[str]] = None,
+              where: Optional[Sequence[Condition]] = None, group_by: Optional[Sequence[str]] = None,
+              agg: Optional[Dict[str, str]] = None, order_by: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None, contains_sql: str = "lower({col}) LIKE lower(?)") -> Tuple[str, List[Any]]:
+    """
+    Traduce una consulta a SQL parametrizado.
+
+    Returns:
+        Tuple[str, List[Any]]: Sentencia SQL y sus parámetros
+    """
+    _check_where(where)
+    _check_agg(agg)
+    sql_funcs = {'sum': 'SUM({})', 'count': 'COUNT({})', 'mean': 'AVG({})',
+                 'min': 'MIN({})', 'max': 'MAX({})', 'nunique': 'COUNT(DISTINCT {})'}
+
+    if agg:
+        select = [_quote(col) for col in group_by or ()]
+        select += [f"{sql_funcs[func].format(_quote(col))} AS {_quote(col)}" for col, func in agg.items()]
+    elif columns:
+        select = [_quote(col) for col in columns]
+    else:
+        select = ['*']
+
+    clauses, params = [], []
+    for col, op, value in where or ():
+        qcol = _quote(col)
+        if op in ('==', '!=') and value is None:
+            clauses.append(f"{qcol} IS {'' if op == '==' else 'NOT '}NULL")
+        elif op == '!=':
+            # Como en pandas, los nulos cumplen '!=' y 'not in'
+            clauses.append(f"({qcol} != ? OR {qcol} IS NULL)")
+            params.append(value)
+        elif op in ('==', '<', '<=', '>', '>='):
+            clauses.append(f"{qcol} {'=' if op == '==' else op} ?")
+            params.append(value)
+        elif op in ('in', 'not in'):
+            values = list(value)
+            if not values:
+                clauses.append("1 = 0" if op == 'in' else "1 = 1")
+                continue
+            placeholders = ', '.join('?' * len(values))
+            clauses.append(f"{qcol} IN ({placeholders})" if op == 'in'
+                           else f"({qcol} NOT IN ({placeholders}) OR {qcol} IS NULL)")
+            params.extend(values)
+        elif op in ('contains', 'not contains'):
+            condition = contains_sql.format(col=f"CAST({qcol} AS VARCHAR)")
+            clauses.append(condition if op == 'contains' else f"NOT COALESCE({condition}, FALSE)")
+            params.append(f"%{value}%")
+        else:
+            clauses.append(f"{qcol} IS {'' if op == 'isnull' else 'NOT '}NULL")
+
+    sql = f"SELECT {', '.join(select)} FROM {_quote(table)}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if agg and group_by:
+        sql += " GROUP BY " + ", ".join(_quote(col) for col in group_by)
+
+    order = _order_columns(order_by)
+    if not order and agg and group_by:
+        order = [(col, True) for col in group_by]
+    if order:
+        sql += " ORDER BY " + ", ".join(f"{_quote(col)} {'ASC' if asc else 'DESC'}" for col, asc in order)
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+class SQLBackend(DataBackend):
+    """Base común de los backends SQL embebidos en un archivo."""
+
+    contains_sql = "lower({col}) LIKE lower(?)"
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        self._inherited: List[Any] = []
+        self._columns: Dict[str, List[str]] = {}
+        # Datasets guardados en tablas de preparación, pendientes de commit
+        self._pending: Dict[str, Tuple[Optional[str], int, bool]] = {}
+        self._index_columns: Dict[str, Set[str]] = {}
+        self._execute(
+            f"CREATE TABLE IF NOT EXISTS {META_TABLE} "
+            "(name VARCHAR PRIMARY KEY, sha256 VARCHAR, rows_count INTEGER, loaded_at VARCHAR)"
+        )
+
+    # --- Métodos específicos de cada motor ---
+    @abstractmethod
+    def _connect(self):
+        """Abre la conexión a la base."""
+
+    @abstractmethod
+    def _write_table(self, table: str, df: pd.DataFrame):
+        """Crea una tabla con el contenido de un DataFrame."""
+
+    @abstractmethod
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Ejecuta una consulta y devuelve el resultado como DataFrame."""
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()):
+        with self._lock:
+            self._conn.execute(sql, list(params))
+
+    # --- Interfaz DataBackend ---
+    def is_current(self, key: str, sha256: Optional[str]) -> bool:
+        if sha256 is None:
+            return False
+        with self._lock:
+            rows = self._conn.execute(f"SELECT sha256 FROM {META_TABLE} WHERE name = ?", [key]).fetchall()
+        return bool(rows) and rows[0][0] == sha256
+
+    def store(self, key: str, df: pd.DataFrame, sha256: Optional[str] = None):
+        staging = STAGING_PREFIX + key
+        with self._lock:
+            self._execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+            has_columns = len(df.columns) > 0
+            if has_columns:
+                self._write_table(staging, df)
+            self._pending[key] = (sha256, int(len(df)), has_columns)
+
+    def commit(self):
+        with self._lock:
+            if not self._pending:
+                self._conn.commit()
+                return
+            loaded_at = datetime.now().isoformat(timespec='seconds')
+            self._execute("BEGIN TRANSACTION")
+            try:
+                for key, (sha256, rows, has_columns) in self._pending.items():
+                    self._execute(f"DROP TABLE IF EXISTS {_quote(key)}")
+                    self._execute(f"DELETE FROM {META_TABLE} WHERE name = ?", [key])
+                    if not has_columns:
+                        continue
+                    self._execute(f"ALTER TABLE {_quote(STAGING_PREFIX + key)} RENAME TO {_quote(key)}")
+                    self._execute(
+                        f"INSERT INTO {META_TABLE} (name, sha256, rows_count, loaded_at) VALUES (?, ?, ?, ?)",
+                        [key, sha256, rows, loaded_at],
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            published, self._pending = self._pending, {}
+            for key, (_, _, has_columns) in published.items():
+                self._columns.pop(key, None)
+                # Los índices se crean sobre la tabla ya renombrada
+                for column in self._index_columns.get(key, ()) if has_columns else ():
+                    if column in self.columns(key):
+                        self._create_sql_index(key, column)
+
+    def _create_sql_index(self, key: str, column: str):
+        self._execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{key}_{column}')} "
+                      f"ON {_quote(key)} ({_quote(column)})")
+
+    def create_index(self, key: str, column: str):
+        self._index_columns.setdefault(key, set()).add(column)
+        if column in self.columns(key):
+            self._create_sql_index(key, column)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(f"SELECT name FROM {META_TABLE} ORDER BY name").fetchall()]
+
+    def columns(self, key: str) -> List[str]:
+        if key not in self._columns:
+            if key not in self.keys():
+                return []
+            self._columns[key] = list(self._fetch(f"SELECT * FROM {_quote(key)} LIMIT 0").columns)
+        return self._columns[key]
+
+    def read(self, key: str) -> pd.DataFrame:
+        if key not in self.keys():
+            return pd.DataFrame()
+        return self._fetch(f"SELECT * FROM {_quote(key)}")
+
+    def query(self, key, columns=None, where=None, group_by=None, agg=None, order_by=None, limit=None):
+        available = self.columns(key)
+        if not available:
+            return pd.DataFrame(columns=list(group_by or ()) + list(agg or columns or ()))
+
+        requested = set(columns or ()) | set(group_by or ()) | set(agg or ())
+        requested |= {col for col, _, _ in where or ()} | {col for col, _ in _order_columns(order_by)}
+        missing = requested - set(available)
+        if missing:
+            raise KeyError(f"Columnas inexistentes en '{key}': {sorted(missing)}")
+
+        sql, params = build_sql(key, columns, where, group_by, agg, order_by, limit, self.contains_sql)
+        return self._fetch(sql, params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def reopen(self):
+        # La conexión heredada del maestro no se usa ni se cierra en el worker
+        # (cerrarla tocaría el estado que comparte con el maestro): se conserva
+        # la referencia y se abre una conexión propia.
+        with self._lock:
+            self._inherited.append(self._conn)
+            self._conn = self._connect()
+
+
+class DuckDBBackend(SQLBackend):
+    """Base analítica embebida DuckDB."""
+
+    name = "duckdb"
+    contains_sql = "{col} ILIKE ?"
+
+    def _connect(self):
+        import duckdb
+
+        try:
+            return duckdb.connect(str(self.db_file))
+        except duckdb.IOException as e:
+            # Otro proceso tiene el archivo abierto en escritura: usar una base en memoria
+            logger.warning(f"⚠️ No se pudo abrir '{self.db_file}' ({e}). Se usará una base DuckDB en memoria.")
+            return duckdb.connect(":memory:")
+
+    def _write_table(self, table: str, df: pd.DataFrame):
+        self._conn.register("_nuevo_dataset", df)
+        try:
+            self._conn.execute(f"CREATE TABLE {_quote(table)} AS SELECT * FROM _nuevo_dataset")
+        finally:
+            self._conn.unregister("_nuevo_dataset")
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        with self._lock:
+            return self._conn.execute(sql, list(params)).df()
+
+
+class SQLiteBackend(SQLBackend):
+    """Base embebida SQLite (sin dependencias adicionales)."""
+
+    name = "sqlite"
+
+    def _connect(self):
+        return sqlite3.connect(str(self.db_file), check_same_thread=False)
+
+    def _write_table(self, table: str, df: pd.DataFrame):
+        df.to_sql(table, self._conn, if_exists='replace', index=False)
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=list(params))
+
+
+def create_backend(name: Optional[str], db_dir: Path) -> DataBackend:
+    """
+    Crea un backend por nombre (``pandas``, ``duckdb`` o ``sqlite``).
+
+    Si se pide ``duckdb`` y el paquete no está instalado, se usa ``sqlite``.
+    """
+    name = (name or DEFAULT_BACKEND).lower()
+    if name == "duckdb" and not DUCKDB_AVAILABLE:
+        logger.warning("⚠️ duckdb no está instalado. Se usará el backend sqlite.")
+        name = "sqlite"
+
+    if name == "pandas":
+        return PandasBackend()
+    if name == "duckdb":
+        return DuckDBBackend(Path(db_dir) / f"{DATABASE_NAME}.duckdb")
+    if name == "sqlite":
+        return SQLiteBackend(Path(db_dir) / f"{DATABASE_NAME}.sqlite")
+    raise ValueError(f"Backend desconocido: '{name}'. Opciones: pandas, duckdb, sqlite")
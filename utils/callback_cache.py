@@ -0,0 +1,275 @@
+"""
+Caché de resultados de los callbacks de Dash.
+
+`cached_callback` memoiza un callback por su identificador, sus argumentos
+y la versión de datos cargada. Los resultados viven en un backend
+intercambiable:
+
+- ``memory``: LRU en memoria del proceso (por defecto);
+- ``disk``: archivos en `data/cache/callbacks/`, compartidos por todos los
+  workers del servidor (ver servir.py), de modo que una figura pedida en
+  un worker no se vuelve a calcular en los demás.
+
+Ambos aceptan TTL y límite de tamaño y llevan contadores de aciertos y
+fallos. El backend se elige con `DASHBOARD_CALLBACK_CACHE` (``memory``,
+``disk`` u ``off``).
+
+Uso::
+
+    @callback(Output(...), Input(...))
+    @cached_callback()
+    def update_chart(value):
+        ...
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV = "DASHBOARD_CALLBACK_CACHE"
+CACHE_DIR = Path("data/cache/callbacks")
+DEFAULT_BACKEND = "memory"
+DEFAULT_TTL = 3600
+MEMORY_MAX_ENTRIES = 256
+DISK_MAX_BYTES = 256 * 1024 * 1024
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Interfaz de un backend de caché de callbacks."""
+
+    name = "base"
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_TTL):
+        self.ttl = ttl
+        self.stats = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expired': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Valor guardado, o ``_MISSING`` si no existe o expiró."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """Guarda un valor."""
+
+    @abstractmethod
+    def clear(self):
+        """Elimina todas las entradas."""
+
+    def metrics(self) -> Dict[str, Any]:
+        """Contadores y tasa de aciertos."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['backend'] = self.name
+        return stats
+
+
+class MemoryCache(CacheBackend):
+    """LRU en memoria del proceso, acotado en número de entradas."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                self._count('expired')
+                entry = None
+            if entry is None:
+                self._count('misses')
+                return _MISSING
+            self._entries.move_to_end(key)
+        self._count('hits')
+        return entry[1]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count('evictions')
+        self._count('sets')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(CacheBackend):
+    """
+    Archivos pickle en un directorio compartido entre procesos.
+
+    Cada entrada se escribe de forma atómica (archivo temporal y rename), así
+    que los workers nunca leen una entrada a medias. El TTL se mide con la
+    fecha de modificación del archivo y, al superar ``max_bytes``, se
+    eliminan primero las entradas usadas hace más tiempo.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = DISK_MAX_BYTES,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        super().__init__(ttl)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self.ttl is not None and time.time() - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                self._count('expired')
+                self._count('misses')
+                return _MISSING
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self._count('misses')
+            return _MISSING
+        # Marca de último uso para el desalojo (no cambia el mtime del TTL)
+        try:
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+        self._count('hits')
+        return value
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        tmp_file = self.directory / f".{path.name}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_file.replace(path)
+        except Exception as e:
+            tmp_file.unlink(missing_ok=True)
+            logger.warning(f"⚠️ No se pudo guardar la entrada de caché {key[:12]}: {e}")
+            return
+        self._count('sets')
+        self._evict()
+
+    def _evict(self):
+        """Elimina las entradas usadas hace más tiempo hasta quedar bajo ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            self._count('evictions')
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        for path in self.directory.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+def create_cache(name: Optional[str] = None, ttl: Optional[float] = DEFAULT_TTL) -> Optional[CacheBackend]:
+    """Backend de caché por nombre (``memory``, ``disk`` u ``off``; por defecto según el entorno)."""
+    name = (name or os.environ.get(CACHE_ENV) or DEFAULT_BACKEND).lower()
+    if name in ('off', 'none', '0'):
+        return None
+    if name == 'disk':
+        return DiskCache(ttl=ttl)
+    if name == 'memory':
+        return MemoryCache(ttl=ttl)
+    raise ValueError(f"Backend de caché desconocido: '{name}' (use memory, disk u off)")
+
+
+_default_cache: Optional[CacheBackend] = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> Optional[CacheBackend]:
+    """Backend compartido por los callbacks decorados sin un backend propio."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = create_cache()
+        return _default_cache
+
+
+def _data_version():
+    from utils.loader import get_data_loader
+    return get_data_loader().data_version
+
+
+def callback_key(callback_id: str, args: tuple, kwargs: Dict[str, Any], version: Any) -> str:
+    """Clave de caché de una llamada: callback, argumentos y versión de datos."""
+    payload = json.dumps([callback_id, args, kwargs, version], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached_callback(cache: Optional[CacheBackend] = None, name: Optional[str] = None,
+                    version: Callable[[], Any] = _data_version):
+    """
+    Decorador que memoiza un callback de Dash.
+
+    Debe ir debajo de ``@callback`` para que Dash registre la función ya
+    memoizada. Las excepciones (incluida ``PreventUpdate``) no se cachean.
+
+    Args:
+        cache: Backend (por defecto, el compartido que indica ``DASHBOARD_CALLBACK_CACHE``)
+        name: Identificador del callback (por defecto, módulo y nombre de la función)
+        version: Función que devuelve la versión de datos vigente
+    """
+    def decorator(func: Callable) -> Callable:
+        callback_id = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = cache or get_cache()
+            if backend is None:
+                return func(*args, **kwargs)
+
+            key = callback_key(callback_id, args, kwargs, version())
+            value = backend.get(key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                backend.set(key, value)
+            return value
+
+        wrapper.callback_id = callback_id
+        return wrapper
+    return decorator
@@ -0,0 +1,154 @@
+"""
+Compresión y validación de las respuestas del servidor del dashboard.
+
+El layout (`_dash-layout`, `_dash-dependencies`, la página) y las figuras
+que devuelven los callbacks (`_dash-update-component`) salen como JSON sin
+comprimir. `install_compression` añade al servidor Flask de Dash:
+
+- compresión negociada por petición según `Accept-Encoding`: brotli si está
+  instalado y el cliente lo acepta, si no gzip;
+- ETag fuerte (hash del contenido y de la codificación) en las respuestas
+  GET, con respuesta 304 cuando el cliente ya tiene esa versión;
+- una caché LRU de cuerpos ya comprimidos por hash de contenido. Las figuras
+  cacheadas devuelven siempre el mismo JSON, así que se comprimen una sola
+  vez; la caché se vacía al cambiar la versión de datos.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript', 'image/svg+xml',
+)
+MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Codificación preferida para un encabezado `Accept-Encoding` ('br', 'gzip' o None)."""
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding)
+    candidates = (['br'] if BROTLI_AVAILABLE else []) + ['gzip']
+    best = max(candidates, key=lambda enc: accepted.quality(enc))
+    return best if accepted.quality(best) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Comprime un cuerpo con la codificación indicada."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def content_etag(digest: str, encoding: Optional[str]) -> str:
+    """ETag fuerte de una representación (sin comillas)."""
+    return f"{digest[:32]}-{encoding or 'identity'}"
+
+
+class CompressedCache:
+    """Cuerpos comprimidos por (hash, codificación), acotados en bytes y por versión de datos."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.version = None
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, encoding: str, body: bytes, version=None) -> bytes:
+        """Cuerpo comprimido, comprimiendo solo si no está en caché."""
+        key = (digest, encoding)
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self._size = 0
+                self.version = version
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached
+            self.stats['misses'] += 1
+
+        compressed = compress(body, encoding)
+        with self._lock:
+            if key not in self._entries and len(compressed) <= self.max_bytes:
+                self._entries[key] = compressed
+                self._size += len(compressed)
+                while self._size > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._size -= len(old)
+        return compressed
+
+
+def _compressible(response) -> bool:
+    if response.direct_passthrough or response.is_streamed or response.status_code != 200:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    return (response.mimetype or '') in COMPRESSIBLE_TYPES
+
+
+def install_compression(server, version: Optional[Callable[[], object]] = None,
+                        cache: Optional[CompressedCache] = None) -> CompressedCache:
+    """
+    Activa la compresión, los ETag y los 304 en un servidor Flask (ej. `app.server`).
+
+    Args:
+        server: Aplicación Flask
+        version: Función que devuelve la versión de datos vigente (invalida la caché)
+        cache: Caché de cuerpos comprimidos (una nueva si es None)
+
+    Returns:
+        CompressedCache: La caché usada, para consultar sus estadísticas
+    """
+    from flask import request
+
+    cache = cache or CompressedCache()
+
+    @server.after_request
+    def _compress_response(response):
+        if not _compressible(response):
+            return response
+
+        body = response.get_data()
+        digest = hashlib.sha256(body).hexdigest()
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding')) if len(body) >= MIN_SIZE else None
+        response.vary.add('Accept-Encoding')
+
+        if request.method in ('GET', 'HEAD'):
+            etag = content_etag(digest, encoding)
+            response.set_etag(etag)
+            if not response.cache_control.max_age:
+                response.cache_control.no_cache = True
+            if request.if_none_match.contains(etag):
+                response.status_code = 304
+                response.set_data(b'')
+                return response
+
+        if encoding:
+            response.set_data(cache.get(digest, encoding, body, version() if version else None))
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    logger.info(f"🗜️ Compresión de respuestas activada ({'brotli, ' if BROTLI_AVAILABLE else ''}gzip)")
+    return cache
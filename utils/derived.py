@@ -0,0 +1,89 @@
+"""
+Artefactos derivados que consume el dashboard.
+
+Cada función recibe ``(loader, deps)`` y declara con ``@artifact`` los
+datasets que lee, para que ``build_artifacts`` la reconstruya solo cuando
+cambian (ver utils/artifacts.py). Las funciones de otros módulos en que
+delega cada artefacto se declaran en ``uses`` (``LOADER_CODE`` para las
+consultas al loader), para que editarlas lo invalide. Las funciones
+``prepare_*`` preparan las tablas listas para graficar con
+``DataLoader.query`` y son independientes de Plotly.
+"""
+
+import textwrap
+
+import pandas as pd
+
+from utils.artifacts import artifact
+from utils.backends import create_backend
+from utils.loader import DataLoader
+
+# Código con que el loader resuelve las consultas: utils/loader.py (query,
+# _first_indicator_row...) y los backends de utils/backends.py
+LOADER_CODE = [DataLoader.query, create_backend]
+
+
+def prepare_sectores_frame(loader) -> pd.DataFrame:
+    """Participación porcentual por sector económico, sin la fila de total."""
+    if not {'sector_econmico', 'participacin_porcentual'} <= set(loader.columns('sector_economico')):
+        return pd.DataFrame()
+    return loader.query(
+        'sector_economico',
+        columns=['sector_econmico', 'participacin_porcentual'],
+        where=[('participacin_porcentual', 'notnull', None), ('sector_econmico', 'not contains', 'Total')],
+    )
+
+
+def prepare_empresas_frame(loader) -> pd.DataFrame:
+    """Empresas por tamaño, sin la fila de total."""
+    if 'tamao_de_empresa' not in loader.columns('empresarial'):
+        return pd.DataFrame()
+    return loader.query('empresarial', where=[('tamao_de_empresa', '!=', 'Total')])
+
+
+def prepare_graduados_frame(loader) -> pd.DataFrame:
+    """Graduados por área ordenados de menor a mayor, con etiquetas partidas en líneas."""
+    if not {'rea_de_conocimiento', 'nmero_de_graduados'} <= set(loader.columns('graduados')):
+        return pd.DataFrame()
+
+    df_sorted = loader.query(
+        'graduados',
+        where=[('rea_de_conocimiento', '!=', 'Total')],
+        order_by=['nmero_de_graduados'],
+    )
+    df_sorted['rea_de_conocimiento'] = df_sorted['rea_de_conocimiento'].apply(
+        lambda x: '<br>'.join(textwrap.wrap(x, width=30))
+    )
+    return df_sorted
+
+
+@artifact('kpis', inputs=['generalidades'], uses=[DataLoader.compute_kpis, *LOADER_CODE])
+def kpis(loader, deps):
+    """KPIs de la página de inicio."""
+    return loader.compute_kpis()
+
+
+@artifact('empresas_total', inputs=['empresarial'], uses=[DataLoader.compute_empresas_total, *LOADER_CODE])
+def empresas_total(loader, deps):
+    """Número total de empresas."""
+    return loader.compute_empresas_total()
+
+
+@artifact('frame_sectores', inputs=['sector_economico'], uses=LOADER_CODE)
+def frame_sectores(loader, deps):
+    return prepare_sectores_frame(loader)
+
+
+@artifact('frame_empresas', inputs=['empresarial'], uses=LOADER_CODE)
+def frame_empresas(loader, deps):
+    return prepare_empresas_frame(loader)
+
+
+@artifact('frame_graduados', inputs=['graduados'], uses=LOADER_CODE)
+def frame_graduados(loader, deps):
+    return prepare_graduados_frame(loader)
+
+
+@artifact('frame_dengue', inputs=['morbilidad'], uses=[DataLoader.get_dengue_data, *LOADER_CODE])
+def frame_dengue(loader, deps):
+    return loader.get_dengue_data()
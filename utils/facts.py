@@ -0,0 +1,217 @@
+"""
+Tabla de hechos unificada de los indicadores de salud.
+
+`morbilidad1`, `mortalidad1`, `estructura_demografica`,
+`condiciones_maternas_y_nutricio` y las hojas `sexualiadad_*` comparten las
+mismas 18 columnas y repiten textos largos (`variables`, `fuente_indicador`,
+`observaciones`) en cada fila. Al cargarlas se consolidan en:
+
+- una tabla de hechos con claves enteras por dimensión, `item`, `ao` y
+  `valor` numéricos (NaN donde el valor no es numérico, ej. "ND") y la hoja
+  de origen;
+- una tabla pequeña por dimensión (código -> texto), compartida por todas
+  las hojas.
+
+Las búsquedas por indicador se resuelven sobre los códigos, y los
+DataFrames de cada hoja se reconstruyen como columnas categóricas que
+comparten los diccionarios, sin copiar los textos.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HEALTH_DATASETS = ('morbilidad1', 'mortalidad1', 'estructura_demografica', 'condiciones_maternas_y_nutricio')
+HEALTH_PREFIXES = ('sexualiadad_',)
+HEALTH_COLUMNS = (
+    'item', 'sector', 'programa', 'tema', 'subtema', 'dimensin', 'variables', 'indicador',
+    'tipo_de_medida', 'nivel_de_desgragacin_indicadores', 'ao', 'valor', 'estado',
+    'ao_de_creacin', 'ao_de_baja', 'fuente_indicador', 'periodo_tiempo', 'observaciones',
+)
+MEASURE_COLUMNS = ('item', 'ao', 'valor', 'ao_de_creacin', 'ao_de_baja')
+DIMENSION_COLUMNS = tuple(col for col in HEALTH_COLUMNS if col not in MEASURE_COLUMNS)
+DATASET_COLUMN = 'dataset'
+CODE_SUFFIX = '_id'
+
+
+def is_health_dataset(name: str) -> bool:
+    """Indica si un dataset limpio pertenece a las hojas de salud de 18 columnas."""
+    return name in HEALTH_DATASETS or name.startswith(HEALTH_PREFIXES)
+
+
+def find_health_files(data_dir: Path) -> Dict[str, Path]:
+    """CSV de salud de un directorio de datos limpios cuyo encabezado es el actual."""
+    files = {}
+    for csv_file in sorted(Path(data_dir).glob("*.csv")):
+        if not is_health_dataset(csv_file.stem):
+            continue
+        header = pd.read_csv(csv_file, nrows=0, encoding='utf-8-sig').columns
+        if tuple(header) != HEALTH_COLUMNS:
+            logger.warning(f"⚠️ '{csv_file.name}' no tiene el formato de 18 columnas vigente. Se omitirá.")
+            continue
+        files[csv_file.stem] = csv_file
+    return files
+
+
+def _compact_measure(values: pd.Series) -> np.ndarray:
+    """Medida numérica: entero pequeño si todos los valores son enteros, float64 si no."""
+    numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64')
+    if len(numeric) and not np.isnan(numeric).any() and (numeric % 1 == 0).all():
+        return pd.to_numeric(pd.Series(numeric.astype('int64')), downcast='integer').to_numpy()
+    return numeric
+
+
+def _restore_measure(values: np.ndarray) -> np.ndarray:
+    """Medida decodificada como int64 si las filas elegidas son enteras, como al leer el CSV."""
+    if values.dtype.kind == 'i':
+        return values.astype('int64')
+    if len(values) and not np.isnan(values).any() and (values % 1 == 0).all():
+        return values.astype('int64')
+    return values
+
+
+class HealthFacts:
+    """Tabla de hechos de salud codificada por diccionario."""
+
+    def __init__(self, facts: pd.DataFrame, dimensions: Dict[str, pd.Index]):
+        self.facts = facts
+        self.dimensions = dimensions
+        self._by_indicator: Optional[Dict[int, np.ndarray]] = None
+
+    @classmethod
+    def build(cls, frames: Dict[str, pd.DataFrame]) -> "HealthFacts":
+        """
+        Consolida las hojas de salud en una tabla de hechos.
+
+        Las filas repetidas entre hojas (ej. una hoja copiada con otro
+        nombre) se conservan una vez.
+        """
+        parts = []
+        for name in sorted(frames):
+            df = frames[name]
+            if df.empty:
+                continue
+            parts.append(df.reindex(columns=HEALTH_COLUMNS).assign(**{DATASET_COLUMN: name}))
+
+        if not parts:
+            return cls(pd.DataFrame(), {})
+
+        combined = pd.concat(parts, ignore_index=True).dropna(how='all', subset=list(HEALTH_COLUMNS))
+
+        facts = pd.DataFrame(index=pd.RangeIndex(len(combined)))
+        dimensions: Dict[str, pd.Index] = {}
+        for col in (DATASET_COLUMN, *DIMENSION_COLUMNS):
+            codes, uniques = pd.factorize(combined[col].to_numpy(dtype=object), use_na_sentinel=True)
+            facts[col + CODE_SUFFIX] = codes.astype(np.int32)
+            dimensions[col] = pd.Index(uniques, dtype=object)
+        for col in MEASURE_COLUMNS:
+            facts[col] = _compact_measure(combined[col])
+
+        # Comparar sobre los códigos es mucho más barato que sobre los textos
+        duplicated = facts.drop(columns=DATASET_COLUMN + CODE_SUFFIX).duplicated(keep='first')
+        if duplicated.any():
+            logger.info(f"🩺 {int(duplicated.sum())} filas repetidas entre hojas de salud descartadas")
+            facts = facts[~duplicated.to_numpy()].reset_index(drop=True)
+
+        logger.info(f"🩺 Tabla de hechos de salud: {len(facts)} filas de {len(parts)} hojas, "
+                    f"{sum(len(d) for d in dimensions.values())} valores de dimensión")
+        return cls(facts, dimensions)
+
+    @classmethod
+    def from_directory(cls, data_dir: Path, reader=pd.read_csv) -> "HealthFacts":
+        """Construye la tabla a partir de los CSV de salud de un directorio."""
+        return cls.build({name: reader(path) for name, path in find_health_files(data_dir).items()})
+
+    @property
+    def empty(self) -> bool:
+        return self.facts.empty
+
+    @property
+    def datasets(self) -> List[str]:
+        """Hojas consolidadas."""
+        return list(self.dimensions.get(DATASET_COLUMN, []))
+
+    def dimension(self, name: str) -> pd.DataFrame:
+        """Tabla de una dimensión (código, valor)."""
+        values = self.dimensions[name]
+        return pd.DataFrame({'codigo': np.arange(len(values), dtype=np.int32), name: values})
+
+    def codes(self, name: str, values: Optional[Iterable[str]] = None, contains: Optional[str] = None) -> np.ndarray:
+        """Códigos de una dimensión por valor exacto o por texto contenido (sin mayúsculas)."""
+        dictionary = self.dimensions.get(name, pd.Index([], dtype=object))
+        mask = np.zeros(len(dictionary), dtype=bool)
+        if values is not None:
+            mask |= np.asarray(dictionary.isin(list(values)))
+        if contains is not None:
+            mask |= np.asarray(dictionary.astype(str).str.contains(contains, case=False, regex=False))
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def _indicator_positions(self, codes: np.ndarray) -> np.ndarray:
+        """Filas de los indicadores dados, con un índice código -> filas."""
+        if self._by_indicator is None:
+            column = self.facts['indicador' + CODE_SUFFIX]
+            self._by_indicator = column.groupby(column, sort=False).indices
+        found = [self._by_indicator[c] for c in codes if c in self._by_indicator]
+        return np.sort(np.concatenate(found)) if found else np.array([], dtype=np.intp)
+
+    def lookup(self, indicador: Optional[Iterable[str]] = None, contains: Optional[str] = None,
+               dataset: Optional[Iterable[str]] = None, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Filas de los indicadores pedidos, decodificadas con las 18 columnas.
+
+        Args:
+            indicador: Nombres exactos de indicador
+            contains: Texto contenido en el nombre del indicador
+            dataset: Hojas de origen (todas si es None)
+            years: Años (todos si es None)
+
+        Returns:
+            pd.DataFrame: Filas con las columnas originales y texto plano
+        """
+        if self.empty:
+            return pd.DataFrame(columns=list(HEALTH_COLUMNS))
+
+        if indicador is None and contains is None:
+            positions = np.arange(len(self.facts))
+        else:
+            positions = self._indicator_positions(self.codes('indicador', indicador, contains))
+
+        rows = self.facts.iloc[positions]
+        if dataset is not None:
+            if isinstance(dataset, str):
+                dataset = [dataset]
+            rows = rows[rows[DATASET_COLUMN + CODE_SUFFIX].isin(self.codes(DATASET_COLUMN, dataset))]
+        if years is not None:
+            rows = rows[rows['ao'].isin(list(years))]
+        return self.decode(rows, categorical=False)
+
+    def frame(self, dataset: str) -> pd.DataFrame:
+        """Hoja reconstruida con columnas categóricas que comparten los diccionarios."""
+        if self.empty:
+            return pd.DataFrame()
+        codes = self.codes(DATASET_COLUMN, [dataset])
+        rows = self.facts[self.facts[DATASET_COLUMN + CODE_SUFFIX].isin(codes)]
+        return self.decode(rows, categorical=True)
+
+    def decode(self, rows: pd.DataFrame, categorical: bool = True) -> pd.DataFrame:
+        """Convierte filas de la tabla de hechos a las columnas originales."""
+        out = {}
+        for col in HEALTH_COLUMNS:
+            if col in DIMENSION_COLUMNS:
+                values = pd.Categorical.from_codes(rows[col + CODE_SUFFIX].to_numpy(),
+                                                   categories=self.dimensions[col])
+                out[col] = values if categorical else np.asarray(values, dtype=object)
+            else:
+                out[col] = _restore_measure(rows[col].to_numpy())
+        return pd.DataFrame(out)
+
+    def memory_usage_mb(self) -> float:
+        """Memoria de la tabla de hechos y de sus dimensiones, en MB."""
+        total = self.facts.memory_usage(deep=True).sum()
+        total += sum(values.memory_usage(deep=True) for values in self.dimensions.values())
+        return round(total / (1024 * 1024), 3)
@@ -0,0 +1,100 @@
+"""
+Endpoints de vida y de preparación del servidor del dashboard.
+
+- `/healthz`: el proceso está vivo y atiende peticiones (siempre 200).
+- `/readyz`: 200 solo cuando el proceso puede atender tráfico real, 503 si
+  no (``status`` = ``loading`` mientras se cargan los datos o se precalienta,
+  ``not_ready`` si la carga terminó con problemas). Se publica antes de la
+  carga. Comprueba que todos los datasets se cargaron sin errores y desde su
+  archivo (un archivo faltante no cuenta como cargado), que las
+  figuras precalentadas ya están en caché y que se conoce la versión de
+  datos cargada. Responde un JSON con los tiempos de carga y las filas de
+  cada dataset, para que el balanceador envíe tráfico solo a workers listos.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict
+
+from utils.storage import VERSION_FILE
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PATH = "/healthz"
+READY_PATH = "/readyz"
+
+_STARTED_AT = time.time()
+
+
+def readiness(loader, warm_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Estado de preparación del proceso.
+
+    Args:
+        loader: DataLoader del dashboard
+        warm_state: Estado del precalentamiento (``done``, ``version``, ``figures``, ``duration_s``)
+
+    Returns:
+        Dict[str, Any]: ``ready``, ``status``, el resultado de cada comprobación y los detalles de la carga
+    """
+    datasets = loader.load_stats.get('datasets', {})
+    errors = {key: stats['error'] for key, stats in datasets.items() if stats.get('error')}
+    missing = [key for key, stats in datasets.items() if stats.get('missing')]
+    pending = [key for key in loader.file_mappings if key not in datasets]
+    # Sin version.json (datos sin publicar por el pipeline) la versión conocida es "ninguna"
+    published = (loader.data_dir / VERSION_FILE).exists()
+    loaded = loader.loaded and not loader.loading
+
+    checks = {
+        'data_loaded': loaded,
+        'datasets_ok': loaded and not pending and not errors and not missing,
+        'figures_warmed': bool(warm_state.get('done')) and all(warm_state.get('figures', {}).values())
+                          and warm_state.get('version') == loader.data_version,
+        'data_version_known': loaded and (loader.data_version is not None or not published),
+    }
+    ready = all(checks.values())
+    if ready:
+        status = 'ready'
+    elif not loaded or not warm_state.get('done') or warm_state.get('version') != loader.data_version:
+        status = 'loading'
+    else:
+        status = 'not_ready'
+    return {
+        'ready': ready,
+        'status': status,
+        'checks': checks,
+        'data_version': loader.data_version,
+        'backend': loader.backend.name,
+        'load': {
+            'duration_s': loader.load_stats.get('duration_s'),
+            'loaded_at': loader.load_stats.get('loaded_at'),
+        },
+        'warm_up': {
+            'duration_s': warm_state.get('duration_s'),
+            'figures': warm_state.get('figures', {}),
+        },
+        'datasets': datasets,
+        'pending': pending,
+        'errors': errors,
+        'missing': missing,
+    }
+
+
+def install_health(server, loader, warm_state: Dict[str, Any]):
+    """Publica `/healthz` y `/readyz` en un servidor Flask."""
+    from flask import jsonify
+
+    @server.route(HEALTH_PATH)
+    def _healthz():
+        return jsonify({'status': 'ok', 'pid': os.getpid(), 'uptime_s': round(time.time() - _STARTED_AT, 1)})
+
+    @server.route(READY_PATH)
+    def _readyz():
+        state = readiness(loader, warm_state)
+        response = jsonify(state)
+        response.status_code = 200 if state['ready'] else 503
+        response.cache_control.no_store = True
+        return response
+
+    logger.info(f"🩺 Estado publicado en {HEALTH_PATH} y {READY_PATH}")
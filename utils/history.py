@@ -0,0 +1,271 @@
+"""
+Historial persistente de las tablas largas de indicadores.
+
+`morbilidad1`, `mortalidad1` y `estructura_demografica` tienen una fila por
+(`item`, `indicador`, `ao`). En lugar de reescribirlas completas en cada
+ejecución, la etapa de fusión inserta o actualiza solo las filas nuevas o
+modificadas según esa clave natural, reescribe únicamente las particiones
+por año afectadas y registra cada cambio en `changes.jsonl`:
+
+    data/history/<dataset>/ao=<año>/origen=historia/part.csv (+ .parquet)
+
+Los consumidores comparan la versión de `version.json` con la que tienen
+cargada y, con `changes_since`, invalidan solo los indicadores que cambiaron.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from utils.partitions import PARTITION_COLUMN, PART_NAME, _year_label, partition_dir, split_by_year
+from utils.storage import (
+    read_data_version, read_dataset, read_manifest, replace_directory,
+    write_data_version, write_dataset, write_manifest
+)
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR = Path("data/history")
+HISTORY_DATASETS = ('morbilidad1', 'mortalidad1', 'estructura_demografica')
+KEY_COLUMNS = ('item', 'indicador', 'ao')
+HISTORY_SOURCE = "historia"
+HASH_COLUMN = "_hash_fila"
+CHANGES_FILE = "changes.jsonl"
+
+
+def _key_part(series: pd.Series) -> pd.Series:
+    """Representación canónica de una columna de la clave (números sin '.0')."""
+    numeric = pd.to_numeric(series, errors='coerce')
+    canonical = numeric.map(lambda v: _year_label(v) if float(v).is_integer() else repr(float(v)),
+                            na_action='ignore')
+    text = series.astype(object).map(lambda v: '' if pd.isna(v) else str(v).strip())
+    return canonical.where(numeric.notna(), text).astype(str)
+
+
+def natural_keys(df: pd.DataFrame) -> pd.Series:
+    """Clave natural de cada fila (item|indicador|ao) estable entre formatos."""
+    parts = [_key_part(df[col]) for col in KEY_COLUMNS]
+    keys = parts[0]
+    for part in parts[1:]:
+        keys = keys + "|" + part
+    return keys
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash del contenido de cada fila, fuera de la clave y de las columnas internas."""
+    columns = sorted(c for c in df.columns if c not in KEY_COLUMNS and not c.startswith('_'))
+    values = pd.DataFrame({col: _key_part(df[col]) for col in columns}, index=df.index)
+    # Prefijo no numérico para que el formato columnar lo guarde como texto
+    return pd.util.hash_pandas_object(values, index=False).map(lambda h: f"h{h:016x}")
+
+
+def _plain(value: Any) -> Any:
+    """Convierte escalares de numpy/pandas a tipos JSON."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _read_partition(part_dir: Path) -> pd.DataFrame:
+    """Lee una partición del historial (vacía si no existe)."""
+    csv_file = part_dir / f"{PART_NAME}.csv"
+    if not csv_file.exists():
+        return pd.DataFrame()
+    return read_dataset(csv_file)
+
+
+def _merge_partition(existing: pd.DataFrame, incoming: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Fusiona las filas entrantes de un año con la partición guardada.
+
+    Returns:
+        Dict[str, Any]: Partición fusionada (``merged``, None si no cambió) y
+        las claves insertadas y actualizadas
+    """
+    incoming = incoming.assign(**{HASH_COLUMN: row_hashes(incoming).values})
+    incoming_keys = natural_keys(incoming)
+
+    if existing.empty:
+        return {'merged': incoming, 'inserted': incoming_keys.tolist(), 'updated': [], 'rows': incoming}
+
+    existing_keys = natural_keys(existing)
+    stored = dict(zip(existing_keys, existing[HASH_COLUMN].astype(str)))
+
+    previous = incoming_keys.map(stored)
+    is_new = previous.isna()
+    is_changed = ~is_new & (previous != incoming[HASH_COLUMN].values)
+    touched = (is_new | is_changed).values
+    if not touched.any():
+        return {'merged': None, 'inserted': [], 'updated': [], 'rows': incoming.iloc[0:0]}
+
+    rows = incoming[touched]
+    kept = existing[~existing_keys.isin(set(incoming_keys[is_changed]))]
+    merged = pd.concat([kept, rows], ignore_index=True)
+    return {
+        'merged': merged,
+        'inserted': incoming_keys[is_new].tolist(),
+        'updated': incoming_keys[is_changed].tolist(),
+        'rows': rows,
+    }
+
+
+def _append_changes(history_dir: Path, records: List[Dict[str, Any]]):
+    """Añade registros al log de cambios del historial."""
+    if not records:
+        return
+    with open(history_dir / CHANGES_FILE, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def upsert_dataset(df: pd.DataFrame, dataset: str, history_dir: Path = HISTORY_DIR,
+                   run: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Inserta o actualiza las filas de un dataset en el historial por su clave natural.
+
+    Solo se reescriben las particiones por año con filas nuevas o modificadas;
+    las filas del historial que no llegan en ``df`` se conservan.
+
+    Args:
+        df: Dataset limpio con las columnas ``item``, ``indicador`` y ``ao``
+        dataset: Nombre del dataset
+        history_dir: Raíz del historial
+        run: Datos de la ejecución (``run_id``, ``version``) para el log de cambios
+
+    Returns:
+        Dict[str, Any]: Resumen con filas insertadas, actualizadas, sin cambios,
+        particiones reescritas e indicadores afectados
+    """
+    history_dir = Path(history_dir)
+    run = run or {}
+    missing = [col for col in KEY_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"'{dataset}' no tiene las columnas de la clave natural: {missing}")
+
+    df = df.dropna(subset=['indicador'])
+    keys = natural_keys(df)
+    duplicated = keys.duplicated(keep='last')
+    if duplicated.any():
+        logger.warning(f"⚠️ {dataset}: {int(duplicated.sum())} filas con clave repetida; se conserva la última.")
+        df = df[~duplicated.values]
+
+    summary = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'partitions': {}, 'indicators': set()}
+    changes = []
+
+    for year, incoming in split_by_year(df):
+        target = partition_dir(history_dir, dataset, year, HISTORY_SOURCE)
+        result = _merge_partition(_read_partition(target), incoming)
+        n_touched = len(result['inserted']) + len(result['updated'])
+        summary['unchanged'] += len(incoming) - n_touched
+        if result['merged'] is None:
+            continue
+
+        # Escribir la partición aparte y reemplazarla con un renombre
+        staging = history_dir / f".{dataset}-{year}.staging-{os.getpid()}-{time.time_ns()}"
+        staging.mkdir(parents=True)
+        try:
+            entry = write_dataset(result['merged'], staging, PART_NAME, decimal='.')
+            target.parent.mkdir(parents=True, exist_ok=True)
+            replace_directory(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        entry.update(dataset=dataset, year=year, source=HISTORY_SOURCE)
+        summary['partitions'][target.relative_to(history_dir).as_posix()] = entry
+        summary['inserted'] += len(result['inserted'])
+        summary['updated'] += len(result['updated'])
+
+        rows = result['rows'].set_axis(natural_keys(result['rows']).tolist(), axis=0)
+        for change, key_list in (('insert', result['inserted']), ('update', result['updated'])):
+            for key in key_list:
+                row = rows.loc[key]
+                summary['indicators'].add(str(row['indicador']))
+                changes.append({
+                    **run,
+                    'dataset': dataset,
+                    'change': change,
+                    'item': _plain(row['item']),
+                    'indicador': _plain(row['indicador']),
+                    PARTITION_COLUMN: year,
+                    'valor': _plain(row.get('valor')),
+                })
+
+    _append_changes(history_dir, changes)
+    summary['indicators'] = sorted(summary['indicators'])
+    return summary
+
+
+def merge_history(clean_dir: Path, history_dir: Path = HISTORY_DIR,
+                  datasets: Iterable[str] = HISTORY_DATASETS) -> Dict[str, Dict[str, Any]]:
+    """
+    Etapa de fusión: lleva los datasets limpios al historial persistente.
+
+    Se publica una nueva versión del historial solo si alguna fila cambió.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Resumen de ``upsert_dataset`` por dataset
+    """
+    clean_dir, history_dir = Path(clean_dir), Path(history_dir)
+    history_dir.mkdir(parents=True, exist_ok=True)
+    version = (read_data_version(history_dir) or 0) + 1
+    run = {
+        'run_id': uuid.uuid4().hex[:12],
+        'version': version,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+    summaries = {}
+    for dataset in datasets:
+        csv_file = clean_dir / f"{dataset}.csv"
+        if not csv_file.exists():
+            logger.warning(f"⚠️ '{csv_file}' no existe. No se fusionará en el historial.")
+            continue
+        summary = upsert_dataset(read_dataset(csv_file), dataset, history_dir, run)
+        summaries[dataset] = summary
+        logger.info(f"  🗂️ {dataset}: {summary['inserted']} nuevas, {summary['updated']} actualizadas, "
+                    f"{summary['unchanged']} sin cambios")
+
+    partitions = {k: e for s in summaries.values() for k, e in s['partitions'].items()}
+    if partitions:
+        manifest = read_manifest(history_dir)
+        manifest.setdefault('datasets', {}).update(partitions)
+        write_manifest(history_dir, manifest)
+        write_data_version(history_dir, version)
+        logger.info(f"📦 Historial actualizado a la versión {version} ({len(partitions)} particiones reescritas)")
+
+    return summaries
+
+
+def changes_since(history_dir: Path, version: Optional[int]) -> Dict[str, Set[str]]:
+    """
+    Indicadores que cambiaron en el historial después de una versión.
+
+    Args:
+        history_dir: Raíz del historial
+        version: Última versión conocida por el consumidor (None = todas)
+
+    Returns:
+        Dict[str, Set[str]]: Indicadores modificados por dataset
+    """
+    changed: Dict[str, Set[str]] = {}
+    changes_file = Path(history_dir) / CHANGES_FILE
+    if not changes_file.exists():
+        return changed
+
+    with open(changes_file, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if version is None or record.get('version', 0) > version:
+                changed.setdefault(record['dataset'], set()).add(str(record['indicador']))
+    return changed
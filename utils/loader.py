@@ -4,21 +4,83 @@ Versión 3.1 - Corregido para compatibilidad con el nuevo pipeline de limpieza
 """
 
 import pandas as pd
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 import logging
 
+from utils.storage import file_hash, read_data_version, read_dataset, read_manifest
+from utils.backends import BACKEND_ENV, create_backend
+from utils.partitions import PARTITIONED_DIR, PART_NAME, SOURCE_COLUMN, list_partitions
+from utils.history import HISTORY_DIR, HISTORY_SOURCE, changes_since
+from utils.streaming import CHUNK_ROWS, STREAMING_AGGREGATES, load_aggregated
+from utils.artifacts import ARTIFACTS_DIR, compute_artifact, read_artifact, read_artifacts_manifest
+from utils.facts import HealthFacts
+from utils.rollups import ROLLUP_DATASETS, RollupCube
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reintentos de carga cuando se publica una versión nueva a mitad de la lectura
+MAX_LOAD_ATTEMPTS = 3
+
+# Variable de entorno que activa la carga por bloques en la instancia compartida
+STREAMING_ENV = "DASHBOARD_STREAMING"
+
+# Resultados de `query` guardados por consulta normalizada y versión de datos
+QUERY_CACHE_SIZE = 256
+
+# Columnas que el loader indexa en cada backend (filtros por valor frecuentes)
+INDEXED_COLUMNS = {
+    'generalidades': ('indicador',),
+    'sector_economico': ('sector_econmico',),
+    'empresarial': ('tamao_de_empresa',),
+    'graduados': ('rea_de_conocimiento',),
+    'morbilidad': ('indicador', 'ao'),
+    'seguridad': ('indicador',),
+    'desercion': ('municipio', 'ao'),
+}
+
 class DataLoader:
     """Cargador centralizado y optimizado de datos para el dashboard."""
 
-    def __init__(self, data_dir: str = "data/clean"):
+    def __init__(self, data_dir: str = "data/clean", partitioned_dir: str = str(PARTITIONED_DIR),
+                 history_dir: str = str(HISTORY_DIR), artifacts_dir: Optional[str] = None,
+                 streaming: bool = False, chunk_rows: int = CHUNK_ROWS, backend: Optional[str] = None):
         self.data_dir = Path(data_dir)
-        self._cache: Dict[str, pd.DataFrame] = {}
+        # Almacenamiento de los datasets: 'pandas' (memoria), 'duckdb' o 'sqlite'
+        # (archivo data/warehouse.* junto a los datos limpios). Ver utils/backends.py
+        self.backend = create_backend(backend or os.environ.get(BACKEND_ENV), self.data_dir.parent)
+        # Modo por bloques: los datasets de STREAMING_AGGREGATES se cargan ya agregados
+        self.streaming = streaming
+        self.chunk_rows = chunk_rows
+        # Por defecto, los artefactos viven junto a los datos limpios (data/artifacts)
+        self.artifacts_dir = Path(artifacts_dir) if artifacts_dir else self.data_dir.parent / ARTIFACTS_DIR.name
+        # Artefactos derivados (KPIs, tablas para gráficos) de la versión cargada
+        self._artifacts: Dict[str, Any] = {}
+        self.partitioned_dir = Path(partitioned_dir)
+        self.history_dir = Path(history_dir)
+        # Series históricas por (dataset, indicador) y versión del historial cargada
+        self._indicator_cache: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.history_version = read_data_version(self.history_dir)
         self._loaded = False
+        self._loading = False
+        # Hojas de salud de 18 columnas consolidadas (ver utils/facts.py)
+        self.health_facts = HealthFacts(pd.DataFrame(), {})
+        # Cubos municipio × año por dataset y hash de la fuente con que se construyeron
+        self.rollups: Dict[str, RollupCube] = {}
+        self._rollup_hashes: Dict[str, Optional[str]] = {}
+        self._query_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._query_lock = threading.Lock()
+        self.query_stats = {'hits': 0, 'misses': 0}
+        # Versión publicada por el pipeline de los datos en caché (None si no hay)
+        self.data_version = None
+        # Duración de la última carga completa y, por dataset, filas y segundos de lectura
+        self.load_stats: Dict[str, Any] = {'duration_s': None, 'loaded_at': None, 'datasets': {}}
 
         # Mapeo de archivos a funciones de carga. Nombres de archivo sanitizados.
         self.file_mappings = {
@@ -29,39 +91,359 @@ class DataLoader:
             'morbilidad': 'morbilidad1.csv',
             'seguridad': 'seguridad.csv',
             'desercion': 'tasa_desercin_sector_oficial.csv', # Corregido
+            'repitencia': 'tasa_de_repitencia_sector_ofici.csv',
             'municipios_empresas': 'numero_de_empresas_por_municipi.csv',
             'cultivos': 'cultivos.csv',
             'calidad_agua': 'calidad_del_agua.csv'
         }
 
-    def load_all_data(self) -> Dict[str, pd.DataFrame]:
+    @property
+    def loaded(self) -> bool:
+        """Indica si hay una carga completa de los datos disponible."""
+        return self._loaded
+
+    @property
+    def loading(self) -> bool:
+        """Indica si hay una carga (o recarga) de los datos en curso."""
+        return self._loading
+
+    def load_all_data(self) -> Mapping[str, pd.DataFrame]:
         """Carga, procesa y cachea todos los datasets necesarios para el dashboard."""
         if self._loaded:
             logger.info("📦 Datos ya cargados desde caché.")
-            return self._cache
+            return self.backend.view()
+
+        self._loading = True
+        try:
+            return self._load_all_data()
+        finally:
+            self._loading = False
 
+    def _load_all_data(self) -> Mapping[str, pd.DataFrame]:
         logger.info("🚀 Cargando y procesando todos los datos...")
+        started = time.perf_counter()
+
+        # Si el pipeline publica una versión nueva durante la carga, se repite
+        # para no mezclar datasets de dos publicaciones distintas.
+        for attempt in range(MAX_LOAD_ATTEMPTS):
+            version = read_data_version(self.data_dir)
+            self._load_files()
+            self._load_health_facts()
+            self._load_rollups()
+            if read_data_version(self.data_dir) == version:
+                break
+            logger.warning("🔄 Los datos se publicaron durante la carga. Reintentando...")
+
+        # Confirmar la carga completa de una vez para no exponer cargas parciales
+        self.backend.commit()
+        self._create_indexes()
+        with self._query_lock:
+            self._query_cache.clear()
+        self.data_version = version
+        self._loaded = True
+        self._artifacts = self._load_artifacts()
+        self.load_stats['duration_s'] = round(time.perf_counter() - started, 4)
+        self.load_stats['loaded_at'] = time.time()
+        logger.info(f"📊 Total de datasets cargados: {len(self.backend.keys())} "
+                    f"(versión {self.data_version}, backend {self.backend.name})")
+        return self.backend.view()
 
+    def _create_indexes(self):
+        """Declara en el backend las columnas indexadas de cada dataset."""
+        for key, columns in INDEXED_COLUMNS.items():
+            available = self.backend.columns(key)
+            for column in columns:
+                if column in available:
+                    self.backend.create_index(key, column)
+
+    def _dataset_key(self, dataset: str) -> str:
+        """Clave del mapeo para un nombre de dataset (acepta la clave o el nombre de archivo)."""
+        if dataset in self.file_mappings:
+            return dataset
+        return next((k for k, f in self.file_mappings.items() if Path(f).stem == dataset), dataset)
+
+    def columns(self, dataset: str) -> List[str]:
+        """Columnas de un dataset cargado."""
+        if not self._loaded:
+            self.load_all_data()
+        return self.backend.columns(self._dataset_key(dataset))
+
+    def query(self, dataset: str, columns: Optional[Sequence[str]] = None,
+              where: Optional[Sequence[Tuple[str, str, Any]]] = None,
+              group_by: Optional[Sequence[str]] = None, agg: Optional[Dict[str, str]] = None,
+              order_by: Optional[Sequence[str]] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Consulta un dataset resolviendo proyección, filtros y agregaciones en el backend.
+
+        Los resultados se cachean por consulta normalizada y versión de datos.
+
+        Args:
+            dataset: Clave del mapeo (ej. 'morbilidad') o nombre del dataset (ej. 'morbilidad1')
+            columns: Columnas a devolver (todas si es None; se ignora con ``agg``)
+            where: Filtros ``(columna, operador, valor)``; ver utils/backends.py
+            group_by: Columnas de agrupación
+            agg: Agregaciones ``{columna: función}`` (sum, count, mean, min, max, nunique)
+            order_by: Columnas de orden; prefijo ``-`` para descendente
+            limit: Máximo de filas
+
+        Returns:
+            pd.DataFrame: Resultado (una copia que el llamador puede modificar)
+        """
+        if not self._loaded:
+            self.load_all_data()
+
+        key = self._dataset_key(dataset)
+        cache_key = (
+            self.data_version, key,
+            tuple(columns or ()),
+            tuple(sorted((col, op.lower(), _normalize_value(value)) for col, op, value in where or ())),
+            tuple(group_by or ()),
+            tuple(sorted((agg or {}).items())),
+            tuple(order_by or ()),
+            limit,
+        )
+
+        with self._query_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._query_cache.move_to_end(cache_key)
+                self.query_stats['hits'] += 1
+                return cached.copy()
+            self.query_stats['misses'] += 1
+
+        where = [(col, op.lower(), value) for col, op, value in where or ()]
+        result = self.backend.query(key, columns, where, group_by, agg, order_by, limit)
+
+        with self._query_lock:
+            self._query_cache[cache_key] = result
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return result.copy()
+
+    def _source_hash(self, filename: str, datasets: Dict[str, Any]) -> Optional[str]:
+        """Hash de contenido de un archivo limpio (del manifiesto si está disponible)."""
+        entry = datasets.get(Path(filename).stem, {})
+        if entry.get('sha256'):
+            return entry['sha256']
+        file_path = self.data_dir / filename
+        return file_hash(file_path) if file_path.exists() else None
+
+    def _load_files(self):
+        """Lee, optimiza y guarda en el backend cada archivo del mapeo que cambió."""
+        datasets = read_manifest(self.data_dir).get('datasets', {})
         for key, filename in self.file_mappings.items():
             try:
                 file_path = self.data_dir / filename
                 if not file_path.exists():
                     logger.warning(f"⚠️ Archivo no encontrado: {filename}. Se creará un DataFrame vacío.")
-                    self._cache[key] = pd.DataFrame()
+                    self.backend.store(key, pd.DataFrame())
+                    self.load_stats['datasets'][key] = {'rows': 0, 'duration_s': 0.0, 'missing': True}
+                    continue
+
+                streamed = self.streaming and key in STREAMING_AGGREGATES
+                sha256 = self._source_hash(filename, datasets)
+                if sha256 is not None and streamed:
+                    sha256 += ":agregado"
+                if self.backend.is_current(key, sha256):
+                    logger.info(f"✅ {key}: sin cambios en el backend {self.backend.name}.")
+                    self.load_stats['datasets'].setdefault(key, {'rows': None, 'duration_s': 0.0})
                     continue
 
-                df = pd.read_csv(file_path)
+                started = time.perf_counter()
+                if streamed:
+                    df = load_aggregated(file_path, STREAMING_AGGREGATES[key], self.chunk_rows)
+                else:
+                    df = self._read_dataset(file_path)
                 df = self._optimize_dataframe(df, key)
-                self._cache[key] = df
+                self.backend.store(key, df, sha256)
+                self.load_stats['datasets'][key] = {
+                    'rows': len(df), 'duration_s': round(time.perf_counter() - started, 4),
+                }
                 logger.info(f"✅ {key}: {len(df)} registros cargados y optimizados.")
 
             except Exception as e:
                 logger.error(f"❌ Error cargando el archivo {filename} para '{key}': {e}", exc_info=True)
-                self._cache[key] = pd.DataFrame()
+                self.backend.store(key, pd.DataFrame())
+                self.load_stats['datasets'][key] = {'rows': 0, 'duration_s': 0.0, 'error': f"{type(e).__name__}: {e}"}
 
-        self._loaded = True
-        logger.info(f"📊 Total de datasets cargados: {len(self._cache)}")
-        return self._cache
+    def _load_health_facts(self):
+        """Consolida las hojas de salud en la tabla de hechos (no en modo por bloques)."""
+        if self.streaming:
+            return
+        try:
+            self.health_facts = HealthFacts.from_directory(self.data_dir, reader=self._read_dataset)
+        except Exception as e:
+            logger.error(f"❌ Error construyendo la tabla de hechos de salud: {e}", exc_info=True)
+            self.health_facts = HealthFacts(pd.DataFrame(), {})
+
+    def _load_rollups(self):
+        """Reconstruye los cubos de ROLLUP_DATASETS cuya fuente cambió."""
+        datasets = read_manifest(self.data_dir).get('datasets', {})
+        for key in ROLLUP_DATASETS:
+            filename = self.file_mappings[key]
+            file_path = self.data_dir / filename
+            sha256 = self._source_hash(filename, datasets)
+            if key in self.rollups and sha256 is not None and self._rollup_hashes.get(key) == sha256:
+                continue
+
+            self.rollups.pop(key, None)
+            self._rollup_hashes.pop(key, None)
+            if not file_path.exists():
+                continue
+            try:
+                # Desde el archivo y no del backend: la tasa publicada no se usa
+                self.rollups[key] = RollupCube.build(key, self._read_dataset(file_path))
+                self._rollup_hashes[key] = sha256
+            except Exception as e:
+                logger.error(f"❌ Error construyendo el cubo de '{key}': {e}", exc_info=True)
+
+    def get_rollup(self, key: str) -> Optional[RollupCube]:
+        """
+        Cubo municipio × año de un dataset de tasas (ver utils/rollups.py).
+
+        Ejemplo: ``get_rollup('desercion').cell(municipio='Aguazul', ao=2023)``.
+        """
+        if not self._loaded:
+            self.load_all_data()
+        return self.rollups.get(self._dataset_key(key))
+
+    def _load_artifacts(self) -> Dict[str, Any]:
+        """Carga los artefactos precalculados si corresponden a la versión de datos cargada."""
+        manifest = read_artifacts_manifest(self.artifacts_dir)
+        if self.data_version is None or manifest.get('data_version') != self.data_version:
+            return {}
+
+        artifacts = {}
+        for name, entry in manifest.get('artifacts', {}).items():
+            try:
+                artifacts[name] = read_artifact(self.artifacts_dir, entry)
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo leer el artefacto '{name}': {e}")
+        logger.info(f"🧩 {len(artifacts)} artefactos precalculados cargados.")
+        return artifacts
+
+    def get_artifact(self, name: str) -> Any:
+        """
+        Obtiene un artefacto derivado (ver utils/derived.py).
+
+        Usa la versión precalculada por el pipeline si existe; si no, lo
+        calcula a partir de los datos cargados y lo guarda en memoria.
+        """
+        if not self._loaded:
+            self.load_all_data()
+        if name not in self._artifacts:
+            compute_artifact(name, self, self._artifacts)
+        return self._artifacts[name]
+
+    def has_new_version(self) -> bool:
+        """Indica si el pipeline publicó una versión distinta a la cargada."""
+        current = read_data_version(self.data_dir)
+        return self._loaded and current is not None and current != self.data_version
+
+    def reload_if_changed(self) -> bool:
+        """
+        Recarga los datos si hay una nueva publicación completa.
+
+        Returns:
+            bool: True si se recargaron los datos
+        """
+        if not self.has_new_version():
+            return False
+
+        logger.info(f"🔄 Nueva versión de datos detectada (actual: {self.data_version}). Recargando...")
+        self._loaded = False
+        self.load_all_data()
+        return True
+
+    def _read_dataset(self, file_path: Path) -> pd.DataFrame:
+        """Lee un dataset, prefiriendo su versión columnar tipada si existe."""
+        return read_dataset(file_path)
+
+    def load_partitioned(self, dataset: str, years: Optional[Iterable] = None,
+                         sources: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Carga un dataset particionado leyendo solo los años y libros pedidos.
+
+        Args:
+            dataset: Nombre del dataset (ej. 'morbilidad1') o clave del mapeo (ej. 'morbilidad')
+            years: Años a leer (todos si es None)
+            sources: Libros de origen a leer (todos si es None)
+
+        Returns:
+            pd.DataFrame: Particiones concatenadas, con la columna ``origen``
+        """
+        key = self._dataset_key(dataset)
+        if key in self.file_mappings:
+            dataset = Path(self.file_mappings[key]).stem
+
+        frames = self._read_partitions(self.partitioned_dir, dataset, years, sources)
+        if not frames:
+            logger.warning(f"⚠️ Sin particiones para '{dataset}' (años={years}, libros={sources}).")
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        df = self._optimize_dataframe(df, key)
+        logger.info(f"✅ {dataset}: {len(df)} registros de {len(frames)} particiones.")
+        return df
+
+    def _read_partitions(self, root: Path, dataset: str, years: Optional[Iterable] = None,
+                         sources: Optional[Iterable[str]] = None) -> List[pd.DataFrame]:
+        """Lee las particiones pedidas; repite si se publica una versión durante la lectura."""
+        for attempt in range(MAX_LOAD_ATTEMPTS):
+            version = read_data_version(root)
+            frames = []
+            for year, source, part_dir in list_partitions(root, dataset, years, sources):
+                try:
+                    part = self._read_dataset(part_dir / f"{PART_NAME}.csv")
+                except Exception as e:
+                    logger.error(f"❌ Error leyendo la partición {part_dir}: {e}", exc_info=True)
+                    continue
+                part[SOURCE_COLUMN] = source
+                frames.append(part)
+            if read_data_version(root) == version:
+                break
+            logger.warning("🔄 Se publicaron particiones durante la carga. Reintentando...")
+        return frames
+
+    def get_indicator_history(self, dataset: str, indicador: str) -> pd.DataFrame:
+        """
+        Serie histórica de un indicador desde el historial persistente.
+
+        Se cachea por indicador; ``refresh_history`` invalida solo los que cambiaron.
+        """
+        cache_key = (dataset, indicador)
+        if cache_key not in self._indicator_cache:
+            frames = self._read_partitions(self.history_dir, dataset, sources=[HISTORY_SOURCE])
+            if not frames:
+                return pd.DataFrame()
+            df = pd.concat(frames, ignore_index=True)
+            df = df[df['indicador'].astype(str) == indicador]
+            self._indicator_cache[cache_key] = df.drop(
+                columns=[c for c in df.columns if c.startswith('_') or c == SOURCE_COLUMN]
+            ).sort_values('ao').reset_index(drop=True)
+        return self._indicator_cache[cache_key]
+
+    def refresh_history(self) -> Dict[str, Set[str]]:
+        """
+        Invalida las series cacheadas de los indicadores que cambiaron en el historial.
+
+        Returns:
+            Dict[str, Set[str]]: Indicadores invalidados por dataset
+        """
+        current = read_data_version(self.history_dir)
+        if current is None or current == self.history_version:
+            return {}
+
+        changed = changes_since(self.history_dir, self.history_version)
+        for cache_key in list(self._indicator_cache):
+            dataset, indicador = cache_key
+            if indicador in changed.get(dataset, ()):
+                del self._indicator_cache[cache_key]
+
+        logger.info(f"🔄 Historial en versión {current}: "
+                    f"{sum(len(v) for v in changed.values())} indicadores invalidados.")
+        self.history_version = current
+        return changed
 
     def _optimize_dataframe(self, df: pd.DataFrame, key: str) -> pd.DataFrame:
         """Aplica optimizaciones numéricas y de tipos a un DataFrame."""
@@ -94,12 +476,16 @@ class DataLoader:
         """Obtiene un DataFrame específico del caché."""
         if not self._loaded:
             self.load_all_data()
-        return self._cache.get(key, pd.DataFrame())
+        return self.backend.read(key)
 
     def get_kpis(self) -> Dict[str, Any]:
+        """KPIs principales (precalculados por el pipeline si están disponibles)."""
+        return self.get_artifact('kpis')
+
+    def compute_kpis(self) -> Dict[str, Any]:
         """Extrae los KPIs principales de forma robusta desde el dataset de generalidades."""
-        df_general = self.get_data('generalidades')
-        if df_general.empty:
+        columns = self.columns('generalidades')
+        if 'indicador' not in columns:
             return {}
 
         kpis = {
@@ -109,17 +495,17 @@ class DataLoader:
         }
 
         # Extraer Población
-        pop_row = df_general[df_general['indicador'].str.contains('Población Total', case=False, na=False)]
+        pop_row = self._first_indicator_row('generalidades', 'Población Total')
         if not pop_row.empty:
             kpis['poblacion'] = int(pop_row['valor'].iloc[0])
 
         # Extraer PIB
-        pib_row = df_general[df_general['indicador'].str.contains('PIB Departamental', case=False, na=False)]
+        pib_row = self._first_indicator_row('generalidades', 'PIB Departamental')
         if not pib_row.empty:
             kpis['pib'] = float(pib_row['valor'].iloc[0])
 
         # Extraer Ranking del IDC
-        rank_row = df_general[df_general['indicador'].str.contains('Puntaje General IDC', case=False, na=False)]
+        rank_row = self._first_indicator_row('generalidades', 'Puntaje General IDC')
         if not rank_row.empty and 'rankingnacional2025' in rank_row.columns:
             # Asegurarse de que el valor no sea nulo antes de convertir a entero
             ranking_value = rank_row['rankingnacional2025'].iloc[0]
@@ -128,13 +514,22 @@ class DataLoader:
 
         return kpis
     
+    def _first_indicator_row(self, key: str, text: str) -> pd.DataFrame:
+        """Primera fila cuyo indicador contiene el texto (filtro resuelto en el backend)."""
+        return self.query(key, where=[('indicador', 'contains', text)], limit=1)
+
     def get_empresas_total(self) -> int:
+        """Número total de empresas (precalculado por el pipeline si está disponible)."""
+        return self.get_artifact('empresas_total')
+
+    def compute_empresas_total(self) -> int:
         """Calcula el número total de empresas usando el nombre de columna correcto."""
-        df_empresas = self.get_data('empresarial')
         # Corregido: usar el nombre de columna sanitizado 'nmero_de_empresas'
-        if df_empresas.empty or 'nmero_de_empresas' not in df_empresas.columns:
+        if 'nmero_de_empresas' not in self.columns('empresarial'):
             return 0
-        return int(df_empresas['nmero_de_empresas'].sum())
+        total = self.query('empresarial', agg={'nmero_de_empresas': 'sum'})
+        value = total['nmero_de_empresas'].iloc[0] if not total.empty else 0
+        return int(value) if pd.notna(value) else 0
     
     def get_sectores_economicos(self) -> pd.DataFrame:
         """Obtiene datos de sectores económicos."""
@@ -148,14 +543,40 @@ class DataLoader:
         """Obtiene datos de graduados por área de conocimiento."""
         return self.get_data('graduados') # El nombre de la columna ya está sanitizado
     
+    def get_health_data(self, indicador: Optional[Iterable[str]] = None, contains: Optional[str] = None,
+                        dataset: Optional[Iterable[str]] = None,
+                        years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Filas de indicadores de salud desde la tabla de hechos consolidada.
+
+        Args:
+            indicador: Nombres exactos de indicador
+            contains: Texto contenido en el nombre del indicador (sin mayúsculas)
+            dataset: Hojas de origen (ej. 'mortalidad1'); todas si es None
+            years: Años (todos si es None)
+
+        Returns:
+            pd.DataFrame: Filas con las 18 columnas de las hojas de salud
+        """
+        if not self._loaded:
+            self.load_all_data()
+        return self.health_facts.lookup(indicador=indicador, contains=contains, dataset=dataset, years=years)
+
     def get_dengue_data(self) -> pd.DataFrame:
         """Filtra y obtiene datos específicos sobre el dengue."""
-        df_morbilidad = self.get_data('morbilidad')
-        if df_morbilidad.empty or 'indicador' not in df_morbilidad.columns:
+        if not self._loaded:
+            self.load_all_data()
+        dataset = Path(self.file_mappings['morbilidad']).stem
+        if dataset in self.health_facts.datasets:
+            df_dengue = self.get_health_data(contains='Dengue', dataset=dataset)
+            return df_dengue.dropna(subset=['ao', 'valor']).reset_index(drop=True)
+
+        if 'indicador' not in self.columns('morbilidad'):
             return pd.DataFrame()
 
-        df_morbilidad['indicador'] = df_morbilidad['indicador'].astype(str)
-        return df_morbilidad[df_morbilidad['indicador'].str.contains('Dengue', case=False, na=False)]
+        df_dengue = self.query('morbilidad', where=[('indicador', 'contains', 'Dengue')])
+        df_dengue['indicador'] = df_dengue['indicador'].astype(str)
+        return df_dengue
     
     def get_seguridad_data(self) -> pd.DataFrame:
         """Obtiene datos de seguridad."""
@@ -172,14 +593,26 @@ class DataLoader:
     def get_desercion_data(self) -> pd.DataFrame:
         """Obtiene datos de deserción escolar."""
         return self.get_data('desercion')
+
+    def get_repitencia_data(self) -> pd.DataFrame:
+        """Obtiene datos de repitencia escolar."""
+        return self.get_data('repitencia')
     
     def get_calidad_agua_data(self) -> pd.DataFrame:
         """Obtiene datos de calidad del agua."""
         return self.get_data('calidad_agua')
 
+def _normalize_value(value: Any) -> Any:
+    """Valor de filtro hashable y en forma canónica para la clave de caché."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(value, key=repr))
+    if isinstance(value, str):
+        return value
+    return value.item() if hasattr(value, 'item') else value
+
 # --- Instancia Singleton ---
 # Se crea una única instancia que será compartida por toda la aplicación
-data_loader_instance = DataLoader()
+data_loader_instance = DataLoader(streaming=os.environ.get(STREAMING_ENV, '') in ('1', 'true', 'yes'))
 
 def get_data_loader() -> DataLoader:
     """Devuelve la instancia única del DataLoader."""
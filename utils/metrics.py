@@ -0,0 +1,280 @@
+"""
+Métricas del servidor del dashboard en formato de exposición de Prometheus.
+
+`install_metrics` instrumenta el servidor Flask de Dash y publica `/metrics`
+(texto plano, sin servicios externos):
+
+- latencia y tamaño de respuesta por ruta y, en `_dash-update-component`,
+  por callback (la salida que actualiza, ej. ``grafico-dengue.figure``);
+- tiempo de cálculo de cada callback decorado con ``timed_callback``: la
+  diferencia con la latencia de la petición es la serialización de la
+  figura y el resto del trabajo de Dash;
+- tasas de acierto de las cachés (callbacks, consultas del loader,
+  respuestas comprimidas, coalescencia) y duración y filas de la última
+  carga de datos, leídas en el momento de la consulta.
+
+Cada proceso publica sus propias métricas; con varios workers, Prometheus
+las agrega por instancia.
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CALLBACK_ROUTE = "/_dash-update-component"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Métrica con etiquetas; las series se crean al primer uso."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> Labels:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Líneas de cada serie en el formato de exposición de Prometheus."""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+        # Por serie: conteos por cubeta (no acumulados), suma y total
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0]))
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, (total, count)) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, n in zip((*self.buckets, float('inf')), counts):
+                    cumulative += n
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(round(total, 6))}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {int(count)}")
+        return lines
+
+
+class GaugeCollector(Metric):
+    """Valores leídos en el momento de la consulta: ``collect()`` devuelve ``[(labels, valor)]``."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, help_text)
+        self.collect = collect
+
+    def samples(self) -> List[str]:
+        try:
+            values = list(self.collect())
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo leer la métrica {self.name}: {e}")
+            return []
+        return [f"{self.name}{_format_labels(self._key(labels))} {_format_value(value)}"
+                for labels, value in values if value is not None]
+
+
+class Registry:
+    """Conjunto de métricas publicadas en `/metrics`."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.register(Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets))
+
+    def gauge(self, name: str, help_text: str, collect) -> GaugeCollector:
+        return self.register(GaugeCollector(name, help_text, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "dashboard_request_duration_seconds", "Latencia de las peticiones HTTP por ruta y callback")
+RESPONSE_BYTES = REGISTRY.histogram(
+    "dashboard_response_size_bytes", "Tamaño enviado de las respuestas por ruta y callback", SIZE_BUCKETS)
+REQUESTS_TOTAL = REGISTRY.counter(
+    "dashboard_requests_total", "Peticiones HTTP por ruta, callback y código de estado")
+CALLBACK_SECONDS = REGISTRY.histogram(
+    "dashboard_callback_compute_seconds", "Tiempo de cálculo de los callbacks (sin serialización)")
+
+
+def timed_callback(name: Optional[str] = None):
+    """Decorador que mide el tiempo de cálculo de un callback (debajo de ``@callback``)."""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                CALLBACK_SECONDS.observe(time.perf_counter() - started, callback=label)
+
+        return wrapper
+    return decorator
+
+
+def _ratio_samples(name: str, stats: Dict[str, float], hits: str = 'hits', misses: str = 'misses'):
+    lookups = stats.get(hits, 0) + stats.get(misses, 0)
+    return [({'cache': name}, stats.get(hits, 0) / lookups if lookups else 0.0)]
+
+
+def register_runtime_metrics(loader=None, compression_cache=None, registry: Registry = REGISTRY):
+    """Registra las métricas leídas al consultar: cachés y carga de datos."""
+
+    def cache_hit_ratio():
+        from utils.callback_cache import get_cache
+        from utils.singleflight import get_group
+
+        samples = []
+        callback_cache = get_cache()
+        if callback_cache is not None:
+            samples += _ratio_samples('callbacks', callback_cache.metrics())
+        if loader is not None:
+            samples += _ratio_samples('queries', loader.query_stats)
+        if compression_cache is not None:
+            samples += _ratio_samples('compression', compression_cache.stats)
+        samples += _ratio_samples('singleflight', get_group().stats, hits='shared', misses='leaders')
+        return samples
+
+    registry.gauge("dashboard_cache_hit_ratio", "Tasa de aciertos de cada caché del proceso", cache_hit_ratio)
+
+    if loader is None:
+        return
+
+    registry.gauge("dashboard_data_load_duration_seconds", "Duración de la última carga completa de datos",
+                   lambda: [({}, loader.load_stats.get('duration_s'))])
+    registry.gauge("dashboard_dataset_load_duration_seconds", "Segundos de lectura de cada dataset",
+                   lambda: [({'dataset': k}, v.get('duration_s')) for k, v in loader.load_stats['datasets'].items()])
+    registry.gauge("dashboard_dataset_rows", "Filas cargadas de cada dataset",
+                   lambda: [({'dataset': k}, v.get('rows')) for k, v in loader.load_stats['datasets'].items()])
+    registry.gauge("dashboard_data_version", "Versión de datos publicada que está cargada",
+                   lambda: [({}, loader.data_version if isinstance(loader.data_version, (int, float)) else None)])
+
+
+def _request_labels(request) -> Dict[str, str]:
+    """Ruta (patrón de Flask, para acotar la cardinalidad) y callback si aplica."""
+    route = request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+    labels = {'route': route, 'callback': ''}
+    if request.path == CALLBACK_ROUTE:
+        payload = request.get_json(silent=True) or {}
+        labels['callback'] = str(payload.get('output', ''))[:200]
+    return labels
+
+
+def install_metrics(server, loader=None, compression_cache=None, registry: Registry = REGISTRY):
+    """
+    Instrumenta un servidor Flask y publica `/metrics`.
+
+    Instalar antes que la compresión: Flask ejecuta los ``after_request`` en
+    orden inverso, así la latencia y el tamaño medidos incluyen la compresión.
+    """
+    from flask import Response, g, request
+
+    register_runtime_metrics(loader, compression_cache, registry)
+
+    @server.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @server.after_request
+    def _record_request(response):
+        started = getattr(g, '_metrics_started', None)
+        if started is None or request.path == METRICS_PATH:
+            return response
+        labels = _request_labels(request)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, **labels)
+        REQUESTS_TOTAL.inc(status=str(response.status_code), **labels)
+        size = response.calculate_content_length()
+        if size is not None:
+            RESPONSE_BYTES.observe(size, **labels)
+        return response
+
+    @server.route(METRICS_PATH)
+    def _metrics():
+        return Response(registry.render(), mimetype='text/plain', content_type=CONTENT_TYPE)
+
+    logger.info(f"📈 Métricas publicadas en {METRICS_PATH}")
@@ -0,0 +1,113 @@
+"""
+Datasets particionados por año y libro de origen.
+
+Cada dataset se guarda en un árbol de directorios al estilo Hive:
+
+    data/partitioned/<dataset>/ao=<año>/origen=<libro>/part.csv (+ .parquet)
+
+Así, incorporar un año nuevo solo agrega particiones, y el loader puede
+leer únicamente los años o libros que necesita a partir de las rutas. El
+nombre del directorio coincide con la columna (``ao``, ``origen``), de modo
+que un lector al estilo Hive obtiene las mismas columnas que el loader.
+El libro se guarda con su nombre tal cual (``periodo_2024``); solo los
+caracteres distintos de letras ASCII, dígitos, ``_`` y ``-`` se codifican
+como ``%XX``, así el nombre es reversible y dos libros no pueden compartir
+partición.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_DIR = Path("data/partitioned")
+PARTITION_COLUMN = "ao"
+SOURCE_COLUMN = "origen"
+PART_NAME = "part"
+UNKNOWN_YEAR = "desconocido"
+SAFE_SOURCE_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+
+def encode_source(source: str) -> str:
+    """Nombre de libro para una ruta: ``periodo 2024`` → ``periodo%202024``."""
+    return ''.join(
+        char if char in SAFE_SOURCE_CHARS else ''.join(f"%{byte:02X}" for byte in char.encode('utf-8'))
+        for char in str(source)
+    )
+
+
+def decode_source(encoded: str) -> str:
+    """Inverso de `encode_source`."""
+    return unquote(encoded, encoding='utf-8', errors='strict')
+
+
+def partition_dir(root: Path, dataset: str, year: str, source: str) -> Path:
+    """Directorio de una partición."""
+    return Path(root) / dataset / f"{PARTITION_COLUMN}={year}" / f"{SOURCE_COLUMN}={encode_source(source)}"
+
+
+def _year_label(value) -> str:
+    """Etiqueta de partición para un valor de año (entero o ``desconocido``)."""
+    year = pd.to_numeric(value, errors='coerce')
+    if pd.isna(year):
+        return UNKNOWN_YEAR
+    return str(int(year))
+
+
+def split_by_year(df: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Divide un dataset en particiones por año.
+
+    Los datasets sin columna de año quedan en una única partición
+    ``desconocido``.
+    """
+    if PARTITION_COLUMN not in df.columns:
+        yield UNKNOWN_YEAR, df
+        return
+
+    labels = df[PARTITION_COLUMN].map(_year_label)
+    for label, part in df.groupby(labels, sort=True):
+        yield label, part
+
+
+def list_partitions(root: Path, dataset: str, years: Optional[Iterable] = None,
+                    sources: Optional[Iterable[str]] = None) -> List[Tuple[str, str, Path]]:
+    """
+    Lista las particiones de un dataset, filtrando por año y libro de origen.
+
+    El filtro se resuelve con los nombres de directorio, sin abrir archivos.
+
+    Returns:
+        List[Tuple[str, str, Path]]: (año, libro, directorio) de cada partición
+    """
+    dataset_dir = Path(root) / dataset
+    if not dataset_dir.is_dir():
+        return []
+
+    wanted_years = {_year_label(y) for y in years} if years is not None else None
+    wanted_sources = {encode_source(s) for s in sources} if sources is not None else None
+
+    partitions = []
+    for year_dir in sorted(dataset_dir.glob(f"{PARTITION_COLUMN}=*")):
+        year = year_dir.name.split("=", 1)[1]
+        if wanted_years is not None and year not in wanted_years:
+            continue
+        for source_dir in sorted(year_dir.glob(f"{SOURCE_COLUMN}=*")):
+            encoded = source_dir.name.split("=", 1)[1]
+            if wanted_sources is not None and encoded not in wanted_sources:
+                continue
+            partitions.append((year, decode_source(encoded), source_dir))
+
+    return partitions
+
+
+def list_datasets(root: Path) -> List[str]:
+    """Nombres de los datasets particionados disponibles."""
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith('.'))
@@ -6,6 +6,8 @@ Versión 3.5 - Desactivar MaxRowsError para forzar el embebido de datos
 import altair as alt
 import pandas as pd
 from utils.loader import get_data_loader
+from utils.singleflight import coalesced
+from utils.assets import asset_url
 
 # --- Configuración Global de Altair ---
 
@@ -39,15 +41,18 @@ alt.themes.register("casanare_theme", altair_theme)
 alt.themes.enable("casanare_theme")
 
 def chart_to_html(chart):
-    """Convierte un gráfico de Altair a HTML con un template robusto."""
+    """
+    Convierte un gráfico de Altair a HTML con un template robusto.
+
+    Vega se carga desde `assets/vendor/` (un solo archivo con hash, en caché
+    inmutable y compartido por todos los iframes), no desde un CDN.
+    """
     chart_json = chart.to_json(indent=None)
     return f"""
     <!DOCTYPE html>
     <html>
     <head>
-      <script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
-      <script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
-      <script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+      <script src="{asset_url('vega.js')}"></script>
     </head>
     <body>
       <div id="vis"></div>
@@ -66,14 +71,15 @@ def create_placeholder_chart(title: str) -> str:
     ).properties(width=500, height=400).configure_view(stroke=None)
     return chart_to_html(chart)
 
+@coalesced()
 def create_sectores_chart():
     """Crea un treemap de los sectores económicos de Casanare."""
     data_loader = get_data_loader()
-    df = data_loader.get_sectores_economicos()
-
-    if df.empty or 'participacin_porcentual' not in df.columns or 'sector_econmico' not in df.columns:
+    if not {'participacin_porcentual', 'sector_econmico'} <= set(data_loader.columns('sector_economico')):
         return create_placeholder_chart("Datos de Sectores No Disponibles")
 
+    df = data_loader.query('sector_economico', columns=['sector_econmico', 'participacin_porcentual'])
+
     df['sector_econmico'] = df['sector_econmico'].astype(str)
     
     chart = alt.Chart(df).mark_treemap(stroke=PALETA_COLORES["fondo"], strokeWidth=2).encode(
@@ -94,14 +100,15 @@ def create_sectores_chart():
     )
     return chart_to_html(chart + text)
 
+@coalesced()
 def create_empresas_chart():
     """Crea un gráfico de dona para la distribución de empresas por tamaño."""
     data_loader = get_data_loader()
-    df = data_loader.get_empresas_por_tamano()
-
-    if df.empty or 'nmero_de_empresas' not in df.columns or 'tamao_de_empresa' not in df.columns:
+    if not {'nmero_de_empresas', 'tamao_de_empresa'} <= set(data_loader.columns('empresarial')):
         return create_placeholder_chart("Datos de Empresas No Disponibles")
 
+    df = data_loader.get_empresas_por_tamano()
+
     chart = alt.Chart(df).mark_arc(innerRadius=90, outerRadius=120, cornerRadius=10).encode(
         theta=alt.Theta(field="nmero_de_empresas", type="quantitative", stack=True),
         color=alt.Color(field="tamao_de_empresa", type="nominal", legend=alt.Legend(title="Tamaño de Empresa", orient="right"), scale=alt.Scale(scheme='category10')),
@@ -116,15 +123,15 @@ def create_empresas_chart():
     )
     return chart_to_html(chart)
 
+@coalesced()
 def create_graduados_chart():
     """Crea un gráfico de barras horizontales de graduados por área de conocimiento."""
     data_loader = get_data_loader()
-    df = data_loader.get_graduados_por_area()
-
-    if df.empty or 'nmero_de_graduados' not in df.columns or 'rea_de_conocimiento' not in df.columns:
+    if not {'nmero_de_graduados', 'rea_de_conocimiento'} <= set(data_loader.columns('graduados')):
         return create_placeholder_chart("Datos de Graduados No Disponibles")
 
-    df = df.sort_values('nmero_de_graduados', ascending=False)
+    df = data_loader.query('graduados', columns=['rea_de_conocimiento', 'nmero_de_graduados'],
+                           order_by=['-nmero_de_graduados'])
     chart = alt.Chart(df).mark_bar(cornerRadius=5, height=25).encode(
         x=alt.X('nmero_de_graduados:Q', title='Número de Graduados'),
         y=alt.Y('rea_de_conocimiento:N', title='Área de Conocimiento', sort='-x'),
@@ -139,6 +146,7 @@ def create_graduados_chart():
     )
     return chart_to_html(chart)
 
+@coalesced()
 def create_dengue_chart():
     """Crea un gráfico de líneas para la evolución de casos de dengue."""
     data_loader = get_data_loader()
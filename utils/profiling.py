@@ -0,0 +1,80 @@
+"""
+Medición de etapas del pipeline de datos.
+
+Registra tiempo real, tiempo de CPU y pico de memoria de un bloque de
+código, para benchmarks y para la instrumentación del procesamiento.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Pico absoluto observado por cada medición activa (las anidadas reinician el
+# pico de tracemalloc, así que lo propagan a la medición que las contiene)
+_active_peaks: List[int] = []
+
+
+def max_rss_mb() -> float:
+    """Memoria residente máxima del proceso en MB (0 si no está disponible)."""
+    if resource is None:
+        return 0.0
+    # En Linux ru_maxrss está en KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def measure(name: str, trace_memory: bool = True, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Mide un bloque de código.
+
+    Entrega un diccionario al que el bloque puede añadir campos propios
+    (ej. filas procesadas). Al salir se completa con ``wall_s``, ``cpu_s``
+    y ``peak_mb`` (pico de memoria asignada por Python durante el bloque).
+    Las mediciones pueden anidarse dentro de un mismo hilo.
+
+    Args:
+        name: Nombre de la etapa
+        trace_memory: Si medir el pico de memoria (tracemalloc añade sobrecosto)
+        **fields: Campos iniciales del registro
+    """
+    record: Dict[str, Any] = {'stage': name, **fields}
+
+    if not trace_memory:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall_start, 4)
+            record['cpu_s'] = round(time.process_time() - cpu_start, 4)
+            record['peak_mb'] = None
+        return
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if _active_peaks:
+        _active_peaks[-1] = max(_active_peaks[-1], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    base_memory = tracemalloc.get_traced_memory()[0]
+    _active_peaks.append(base_memory)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record['wall_s'] = round(time.perf_counter() - wall_start, 4)
+        record['cpu_s'] = round(time.process_time() - cpu_start, 4)
+        peak = max(_active_peaks.pop(), tracemalloc.get_traced_memory()[1])
+        record['peak_mb'] = round(max(peak - base_memory, 0) / (1024 * 1024), 2)
+        if _active_peaks:
+            _active_peaks[-1] = max(_active_peaks[-1], peak)
+        if started_tracing:
+            tracemalloc.stop()
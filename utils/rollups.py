@@ -0,0 +1,195 @@
+"""
+Cubos de agregados por municipio y año (deserción, repitencia).
+
+Las tablas de tasas del sector oficial traen una fila por municipio y año
+con el numerador (desertores o repitentes) y la matrícula. Al cargar, cada
+tabla se resume en un cubo con todas las combinaciones de sus dimensiones:
+
+- (municipio, año), por año, por municipio y el total general;
+- la tasa recalculada como numerador / matrícula (en %), en lugar de la
+  publicada, que mezcla formatos ("2.49%", "0.0313", "2.49");
+- la variación frente al año anterior de la tasa y de los conteos.
+
+Cada celda se consulta en O(1) con ``RollupCube.cell``; las series por año
+de un municipio ya quedan armadas para los drill-down. Si la tabla trae más
+dimensiones (ej. ``nivel`` educativo), se incluyen en el cubo.
+"""
+
+import logging
+from collections import defaultdict
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Datasets del DataLoader que se resumen en un cubo
+ROLLUP_DATASETS = ('desercion', 'repitencia')
+
+YEAR_COLUMN = 'ao'
+MUNICIPIO_COLUMN = 'municipio'
+LEVEL_COLUMN = 'nivel'
+COUNT_COLUMN = 'casos'
+ENROLLMENT_COLUMN = 'matricula'
+RATE_COLUMN = 'tasa'
+DELTA_PREFIX = 'var_'
+TOTAL_LABEL = 'Total general'
+
+# Prefijos de los nombres sanitizados de cada columna, según la versión del pipeline
+COLUMN_PREFIXES = {
+    YEAR_COLUMN: ('ao', 'a_o', 'ano'),
+    MUNICIPIO_COLUMN: ('municipio',),
+    LEVEL_COLUMN: ('nivel',),
+    COUNT_COLUMN: ('desert', 'repit', 'reprob'),
+    ENROLLMENT_COLUMN: ('matr',),
+}
+
+CellKey = Tuple[Any, ...]
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Renombra las columnas de una tabla de tasas a los nombres del cubo."""
+    renames = {}
+    for target, prefixes in COLUMN_PREFIXES.items():
+        for col in df.columns:
+            name = str(col)
+            exact = target == YEAR_COLUMN and name in prefixes
+            if exact or (target != YEAR_COLUMN and name.startswith(prefixes)):
+                renames[col] = target
+                break
+    return df.rename(columns=renames)
+
+
+def parse_count(values: pd.Series) -> pd.Series:
+    """
+    Conteos numéricos, corrigiendo los separadores de miles leídos como decimales.
+
+    Un conteo no puede tener decimales: "7.077" en el Excel es 7077 y llega
+    como 7.077 (y "55.060" como 55.06), así que los valores con parte
+    decimal se multiplican por 1000.
+    """
+    numeric = pd.to_numeric(values, errors='coerce')
+    fractional = (numeric % 1).abs() > 1e-9
+    numeric = numeric.where(~fractional, numeric * 1000)
+    return numeric.round().astype('Int64')
+
+
+def _rate(cases: pd.Series, enrollment: pd.Series) -> pd.Series:
+    """Tasa en % (NaN si no hay matrícula)."""
+    cases = cases.astype('float64')
+    enrollment = enrollment.astype('float64').replace(0, np.nan)
+    return (cases / enrollment * 100).round(2)
+
+
+class RollupCube:
+    """Agregados de una tabla de tasas por todas las combinaciones de sus dimensiones."""
+
+    def __init__(self, name: str, frame: pd.DataFrame, dimensions: Tuple[str, ...]):
+        self.name = name
+        self.frame = frame
+        self.dimensions = dimensions
+        # Celda -> fila, y (dimensión fija, valor) -> serie por año
+        self._cells: Dict[CellKey, Dict[str, Any]] = {
+            self._key(row): row for row in frame.to_dict('records')
+        }
+        self._series: Dict[CellKey, pd.DataFrame] = {}
+        if YEAR_COLUMN in dimensions:
+            others = [d for d in dimensions if d != YEAR_COLUMN]
+            yearly = frame[frame[YEAR_COLUMN].notna()].sort_values(YEAR_COLUMN)
+            positions: Dict[CellKey, List[int]] = defaultdict(list)
+            for i, values in enumerate(yearly[others].itertuples(index=False, name=None)):
+                positions[tuple(None if pd.isna(v) else v for v in values)].append(i)
+            self._series = {key: yearly.iloc[rows].reset_index(drop=True) for key, rows in positions.items()}
+
+    @classmethod
+    def build(cls, name: str, df: pd.DataFrame) -> "RollupCube":
+        """
+        Construye el cubo a partir de la tabla por municipio y año.
+
+        Las filas "Total general" de la fuente se descartan: los totales se
+        recalculan sumando los municipios.
+        """
+        df = normalize_columns(df)
+        missing = {YEAR_COLUMN, MUNICIPIO_COLUMN, COUNT_COLUMN, ENROLLMENT_COLUMN} - set(df.columns)
+        if missing:
+            raise ValueError(f"'{name}' no tiene las columnas {sorted(missing)}")
+
+        dimensions = tuple(d for d in (LEVEL_COLUMN, MUNICIPIO_COLUMN, YEAR_COLUMN) if d in df.columns)
+        base = pd.DataFrame({
+            **{d: df[d].astype('string').str.strip() for d in dimensions if d != YEAR_COLUMN},
+            YEAR_COLUMN: pd.to_numeric(df[YEAR_COLUMN], errors='coerce').astype('Int64'),
+            COUNT_COLUMN: parse_count(df[COUNT_COLUMN]),
+            ENROLLMENT_COLUMN: parse_count(df[ENROLLMENT_COLUMN]),
+        })
+        is_total = pd.Series(False, index=base.index)
+        for d in dimensions:
+            if d != YEAR_COLUMN:
+                is_total |= base[d].str.casefold().eq(TOTAL_LABEL.casefold()).fillna(False)
+        base = base[~is_total].dropna(subset=[YEAR_COLUMN, COUNT_COLUMN, ENROLLMENT_COLUMN])
+
+        levels = []
+        for size in range(len(dimensions), -1, -1):
+            for kept in combinations(dimensions, size):
+                levels.append(cls._rollup(base, dimensions, kept))
+        frame = pd.concat(levels, ignore_index=True)
+
+        logger.info(f"🧊 Cubo '{name}': {len(base)} filas base, {len(frame)} celdas "
+                    f"({' × '.join(dimensions)})")
+        return cls(name, frame, dimensions)
+
+    @staticmethod
+    def _rollup(base: pd.DataFrame, dimensions: Tuple[str, ...], kept: Tuple[str, ...]) -> pd.DataFrame:
+        """Totales por las dimensiones ``kept``, con la tasa y la variación anual."""
+        measures = [COUNT_COLUMN, ENROLLMENT_COLUMN]
+        if kept:
+            level = base.groupby(list(kept), sort=True, dropna=False)[measures].sum().reset_index()
+        else:
+            level = base[measures].sum().to_frame().T
+        for d in dimensions:
+            if d not in kept:
+                level[d] = pd.NA
+        level[RATE_COLUMN] = _rate(level[COUNT_COLUMN], level[ENROLLMENT_COLUMN])
+
+        for col in (RATE_COLUMN, COUNT_COLUMN, ENROLLMENT_COLUMN):
+            level[DELTA_PREFIX + col] = np.nan
+        if YEAR_COLUMN in kept:
+            others = [d for d in kept if d != YEAR_COLUMN]
+            level = level.sort_values([*others, YEAR_COLUMN], ignore_index=True)
+            grouped = level.groupby(others, sort=False, dropna=False) if others else None
+            for col in (RATE_COLUMN, COUNT_COLUMN, ENROLLMENT_COLUMN):
+                values = level[col].astype('float64')
+                previous = grouped[col].shift(1).astype('float64') if grouped is not None else values.shift(1)
+                level[DELTA_PREFIX + col] = (values - previous).round(2)
+
+        return level[[*dimensions, COUNT_COLUMN, ENROLLMENT_COLUMN, RATE_COLUMN,
+                      *(DELTA_PREFIX + c for c in (RATE_COLUMN, COUNT_COLUMN, ENROLLMENT_COLUMN))]]
+
+    def _key(self, row: Dict[str, Any]) -> CellKey:
+        return tuple(None if pd.isna(row[d]) else row[d] for d in self.dimensions)
+
+    def cell(self, **coords) -> Optional[Dict[str, Any]]:
+        """
+        Celda del cubo; las dimensiones omitidas se toman como total.
+
+        Ejemplo: ``cell(municipio='Aguazul', ao=2023)``, ``cell(ao=2023)``, ``cell()``.
+
+        Returns:
+            Optional[Dict[str, Any]]: Conteos, matrícula, tasa y variaciones, o None
+        """
+        unknown = set(coords) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Dimensiones desconocidas para '{self.name}': {sorted(unknown)}")
+        key = tuple(coords.get(d) for d in self.dimensions)
+        return self._cells.get(key)
+
+    def series(self, **coords) -> pd.DataFrame:
+        """Serie por año de una celda (ej. ``series(municipio='Aguazul')``; sin argumentos, el total)."""
+        others = tuple(coords.get(d) for d in self.dimensions if d != YEAR_COLUMN)
+        series = self._series.get(others)
+        return series.copy() if series is not None else pd.DataFrame(columns=self.frame.columns)
+
+    def members(self, dimension: str) -> List[Any]:
+        """Valores de una dimensión presentes en el cubo."""
+        return sorted(self.frame[dimension].dropna().unique().tolist())
@@ -0,0 +1,164 @@
+"""
+Coalescencia de cálculos idénticos concurrentes (single-flight).
+
+Con la caché fría (tras un despliegue o una recarga de datos) llegan a la
+vez muchas peticiones idénticas de los gráficos de la página de inicio.
+`coalesced` hace que solo la primera construya la figura y que las demás
+esperen y reciban el mismo resultado:
+
+- entre hilos de un proceso, siempre;
+- entre procesos de la máquina (workers de servir.py), con
+  `DASHBOARD_SINGLEFLIGHT=process`: el cálculo se serializa con un archivo
+  de bloqueo y el resultado se entrega a los demás procesos por una caché
+  en disco de vida corta.
+
+El resultado compartido es el mismo objeto para todos los que esperaban:
+no debe modificarse.
+"""
+
+import functools
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils.callback_cache import _MISSING, DiskCache, _data_version, callback_key
+
+try:
+    import fcntl
+    FILE_LOCKS_AVAILABLE = True
+except ImportError:  # Windows: solo coalescencia entre hilos
+    FILE_LOCKS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SINGLEFLIGHT_ENV = "DASHBOARD_SINGLEFLIGHT"
+LOCK_DIR = Path("data/cache/locks")
+RESULTS_DIR = Path("data/cache/singleflight")
+# Los resultados entre procesos solo deben sobrevivir a la ráfaga de peticiones
+RESULTS_TTL = 120
+
+
+class _Call:
+    """Cálculo en curso: los seguidores esperan su evento."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Grupo de cálculos identificados por clave, con un solo cálculo en curso por clave."""
+
+    def __init__(self, interprocess: bool = False, lock_dir: Path = LOCK_DIR,
+                 results_dir: Path = RESULTS_DIR):
+        self.interprocess = interprocess and FILE_LOCKS_AVAILABLE
+        self.lock_dir = Path(lock_dir)
+        self._results = DiskCache(results_dir, ttl=RESULTS_TTL) if self.interprocess else None
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'shared': 0, 'interprocess_shared': 0}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Ejecuta ``func`` una sola vez para las llamadas concurrentes con la misma clave.
+
+        Las excepciones del cálculo se propagan a todos los que esperaban.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['shared'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats['leaders'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._compute(key, func)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _compute(self, key: str, func: Callable[[], Any]) -> Any:
+        if not self.interprocess:
+            return func()
+
+        with self._file_lock(key):
+            # Otro proceso pudo calcularlo mientras se esperaba el bloqueo
+            shared = self._results.get(key)
+            if shared is not _MISSING:
+                with self._lock:
+                    self.stats['interprocess_shared'] += 1
+                return shared
+            result = func()
+            self._results.set(key, result)
+            return result
+
+    @contextmanager
+    def _file_lock(self, key: str) -> Iterator[None]:
+        """Bloqueo exclusivo entre procesos sobre un archivo por clave."""
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_dir / f"{key[:32]}.lock", 'a+b') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_default_group: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_group() -> SingleFlight:
+    """Grupo compartido; `DASHBOARD_SINGLEFLIGHT` elige ``thread`` (por defecto), ``process`` u ``off``."""
+    global _default_group
+    with _default_lock:
+        if _default_group is None:
+            mode = os.environ.get(SINGLEFLIGHT_ENV, 'thread').lower()
+            _default_group = SingleFlight(interprocess=(mode == 'process'))
+        return _default_group
+
+
+def coalesced(name: Optional[str] = None, group: Optional[SingleFlight] = None,
+              version: Callable[[], Any] = _data_version):
+    """
+    Decorador que coalesce las llamadas concurrentes idénticas a un constructor de gráficos.
+
+    La clave es el nombre de la función, sus argumentos y la versión de datos.
+
+    Args:
+        name: Identificador (por defecto, módulo y nombre de la función)
+        group: Grupo de coalescencia (por defecto, el compartido)
+        version: Función que devuelve la versión de datos vigente
+    """
+    def decorator(func: Callable) -> Callable:
+        func_id = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if os.environ.get(SINGLEFLIGHT_ENV, '').lower() == 'off':
+                return func(*args, **kwargs)
+            key = callback_key(func_id, args, kwargs, version())
+            return (group or get_group()).do(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Perfil de arranque del proceso del dashboard.
+
+`dashboard.py` registra en `PROFILE` la duración de cada fase del arranque
+(imports, creación de la app, carga de datos, precalentamiento) y, al
+terminar, escribe una línea de log con el total, el detalle de la carga por
+dataset y qué renderizadores pesados quedaron cargados. Si el total supera
+el presupuesto de arranque en frío (`DASHBOARD_STARTUP_BUDGET`, en
+segundos) se registra una advertencia.
+
+Con `DASHBOARD_STARTUP_PROFILE=<ruta>` el perfil se guarda además en JSON;
+`benchmarks/benchmark_arranque.py` lo usa junto con ``-X importtime`` para
+desglosar el tiempo de import por módulo.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+STARTUP_BUDGET_ENV = "DASHBOARD_STARTUP_BUDGET"
+STARTUP_PROFILE_ENV = "DASHBOARD_STARTUP_PROFILE"
+DEFAULT_BUDGET_S = 3.0
+# Módulos que solo deberían importarse cuando se construye un gráfico que los usa
+DEFERRED_MODULES = ('altair', 'plotly', 'duckdb', 'vl_convert')
+
+
+class StartupProfile:
+    """Fases del arranque, medidas desde que se importa este módulo."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._last_mark = self.started
+        self.report: Optional[Dict[str, Any]] = None
+
+    def mark(self, name: str):
+        """Cierra una fase que empezó al final de la anterior (ej. los imports)."""
+        now = time.perf_counter()
+        self.phases[name] = round(now - self._last_mark, 4)
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mide el bloque como una fase con nombre."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases[name] = round(now - started, 4)
+            self._last_mark = now
+
+    def finish(self, loader=None, budget_s: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Cierra el perfil, lo registra en el log y lo guarda si se pidió.
+
+        Args:
+            loader: DataLoader, para el detalle de la carga por dataset
+            budget_s: Presupuesto en segundos (por defecto, `DASHBOARD_STARTUP_BUDGET` o 3.0)
+
+        Returns:
+            Dict[str, Any]: Total, fases, carga por dataset, módulos diferidos y presupuesto
+        """
+        if budget_s is None:
+            budget_s = float(os.environ.get(STARTUP_BUDGET_ENV, DEFAULT_BUDGET_S))
+        total = round(time.perf_counter() - self.started, 4)
+
+        datasets = {}
+        if loader is not None:
+            datasets = {key: stats.get('duration_s') for key, stats in loader.load_stats.get('datasets', {}).items()}
+
+        self.report = {
+            'pid': os.getpid(),
+            'total_s': total,
+            'budget_s': budget_s,
+            'within_budget': total <= budget_s,
+            'phases': dict(self.phases),
+            'data_load': dict(sorted(datasets.items(), key=lambda item: -(item[1] or 0))),
+            'loaded_modules': {name: name in sys.modules for name in DEFERRED_MODULES},
+        }
+
+        phases = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        slowest = ', '.join(f"{key} {seconds:.3f}s" for key, seconds in list(self.report['data_load'].items())[:3])
+        logger.info(f"⏱️ Arranque en {total:.2f}s ({phases}); datasets más lentos: {slowest or '-'}")
+        eager = [name for name, loaded in self.report['loaded_modules'].items() if loaded]
+        if eager:
+            logger.info(f"   Renderizadores cargados durante el arranque: {', '.join(eager)}")
+        if total > budget_s:
+            logger.warning(f"⚠️ El arranque ({total:.2f}s) supera el presupuesto de {budget_s:.2f}s")
+
+        path = os.environ.get(STARTUP_PROFILE_ENV)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report, f, ensure_ascii=False, indent=2)
+        return self.report
+
+
+PROFILE = StartupProfile()
@@ -0,0 +1,353 @@
+"""
+Almacenamiento de datos limpios en formato columnar.
+
+Además del CSV, cada dataset se guarda como Parquet comprimido con tipos
+inferidos una sola vez en el pipeline, y se registra en un manifiesto con
+su esquema, número de filas y hash de contenido.
+
+La salida del pipeline se escribe en un directorio temporal y se publica
+de una sola vez, junto con un archivo de versión que los consumidores
+pueden vigilar para recargar solo publicaciones completas. Cada versión
+queda en su propio directorio (``data/releases/clean/vN``) y ``data/clean`` es un
+enlace simbólico que se cambia de forma atómica, así que siempre apunta a
+una publicación completa.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+VERSION_FILE = "version.json"
+COLUMNAR_EXTENSION = ".parquet"
+COLUMNAR_COMPRESSION = "zstd"
+
+try:
+    import pyarrow  # noqa: F401
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+try:
+    import fcntl
+    FILE_LOCKS_AVAILABLE = True
+except ImportError:  # Windows: solo se serializan los hilos del proceso
+    FILE_LOCKS_AVAILABLE = False
+
+RELEASES_DIR = "releases"
+# Publicaciones anteriores que se conservan (un proceso puede estar leyéndolas)
+KEEP_RELEASES = 3
+_publish_lock = threading.Lock()
+# Proporción mínima de valores numéricos para tratar una columna como numérica
+NUMERIC_SHARE = 0.95
+
+
+def infer_column_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Devuelve una copia del DataFrame con tipos consistentes por columna.
+
+    Las columnas de texto cuyos valores no nulos son numéricos en al menos
+    ``NUMERIC_SHARE`` se convierten a número; las celdas que no lo son (ej.
+    una fecha suelta en una columna de cifras) quedan nulas y se informa
+    cuántas. Las columnas realmente mixtas se guardan como texto para que el
+    formato columnar tenga un único tipo por columna.
+    """
+    df = df.copy()
+
+    for col in df.columns:
+        if df[col].dtype != object and not pd.api.types.is_string_dtype(df[col]):
+            continue
+
+        values = df[col].dropna()
+        if values.empty:
+            continue
+
+        numeric = pd.to_numeric(values, errors='coerce')
+        dropped = int(numeric.isna().sum())
+        if dropped <= len(values) * (1 - NUMERIC_SHARE):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+            if dropped:
+                logger.warning(f"⚠️ Columna '{col}': {dropped} de {len(values)} celdas no numéricas "
+                               f"se guardan como nulas en el formato columnar")
+        else:
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+
+    return df
+
+
+def file_hash(path: Path) -> str:
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def columnar_path(csv_path: Path) -> Path:
+    """Ruta del archivo columnar que acompaña a un CSV."""
+    return Path(csv_path).with_suffix(COLUMNAR_EXTENSION)
+
+
+def write_dataset(df: pd.DataFrame, output_dir: Path, name: str, **csv_kwargs) -> Dict[str, Any]:
+    """
+    Guarda un dataset como CSV y, si pyarrow está disponible, como Parquet.
+
+    Args:
+        df: Datos limpios
+        output_dir: Directorio de salida
+        name: Nombre del dataset (sin extensión)
+        **csv_kwargs: Opciones adicionales para ``DataFrame.to_csv``
+
+    Returns:
+        Dict[str, Any]: Entrada del manifiesto para el dataset
+    """
+    output_dir = Path(output_dir)
+    csv_file = output_dir / f"{name}.csv"
+    df.to_csv(csv_file, index=False, **csv_kwargs)
+
+    typed = infer_column_types(df)
+    entry = {
+        'csv': csv_file.name,
+        'columnar': None,
+        'rows': int(len(typed)),
+        'schema': {str(col): str(dtype) for col, dtype in typed.dtypes.items()},
+        'sha256': file_hash(csv_file),
+    }
+
+    if COLUMNAR_AVAILABLE:
+        parquet_file = columnar_path(csv_file)
+        try:
+            typed.to_parquet(parquet_file, index=False, compression=COLUMNAR_COMPRESSION)
+            entry['columnar'] = parquet_file.name
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar '{parquet_file.name}' en formato columnar: {e}")
+            parquet_file.unlink(missing_ok=True)
+
+    return entry
+
+
+def read_dataset(csv_path: Path) -> pd.DataFrame:
+    """Lee un dataset, prefiriendo su versión columnar tipada si existe."""
+    parquet_path = columnar_path(csv_path)
+    if COLUMNAR_AVAILABLE and parquet_path.exists():
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo leer {parquet_path.name}, se usará el CSV: {e}")
+    return pd.read_csv(csv_path)
+
+
+def read_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Lee el manifiesto de un directorio de datos limpios (vacío si no existe)."""
+    manifest_file = Path(output_dir) / MANIFEST_FILE
+    if not manifest_file.exists():
+        return {'datasets': {}}
+
+    try:
+        with open(manifest_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Manifiesto ilegible en '{manifest_file}': {e}")
+        return {'datasets': {}}
+
+
+def update_manifest(output_dir: Path, entries: Dict[str, Dict[str, Any]],
+                    source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Añade o reemplaza entradas en el manifiesto del directorio de salida.
+
+    Args:
+        output_dir: Directorio de datos limpios
+        entries: Entradas por nombre de dataset (ver ``write_dataset``)
+        source: Archivo de origen de los datos, si se conoce
+
+    Returns:
+        Dict[str, Any]: Manifiesto actualizado
+    """
+    manifest = read_manifest(output_dir)
+    manifest.setdefault('datasets', {}).update(entries)
+    if source is not None:
+        manifest['source'] = str(source)
+
+    return write_manifest(output_dir, manifest)
+
+
+def write_manifest(output_dir: Path, manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Escribe el manifiesto completo de forma atómica."""
+    manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+    manifest_file = Path(output_dir) / MANIFEST_FILE
+    tmp_file = manifest_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    tmp_file.replace(manifest_file)
+
+    return manifest
+
+
+def read_data_version(data_dir: Path) -> Optional[int]:
+    """Lee la versión publicada de un directorio de datos (None si no hay)."""
+    version_file = Path(data_dir) / VERSION_FILE
+    try:
+        with open(version_file, encoding='utf-8') as f:
+            return int(json.load(f)['version'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def prepare_staging(output_dir: Path) -> Path:
+    """
+    Crea un directorio temporal junto a ``output_dir`` para una nueva publicación.
+
+    El directorio parte de una copia de la publicación actual, de modo que
+    los datasets que no se reescriben se conservan.
+    """
+    output_dir = Path(output_dir)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = output_dir.parent / f".{output_dir.name}.staging-{os.getpid()}-{time.time_ns()}"
+
+    if output_dir.is_dir():
+        shutil.copytree(output_dir, staging)
+    else:
+        staging.mkdir()
+    return staging
+
+
+def write_data_version(data_dir: Path, version: int):
+    """Escribe el archivo de versión de un directorio de datos de forma atómica."""
+    version_file = Path(data_dir) / VERSION_FILE
+    tmp_file = version_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'published_at': datetime.now().isoformat(timespec='seconds')}, f)
+    tmp_file.replace(version_file)
+
+
+def replace_directory(source: Path, target: Path):
+    """Reemplaza ``target`` por ``source`` con renombres, eliminando la versión anterior."""
+    source, target = Path(source), Path(target)
+    previous = target.parent / f".{target.name}.old-{os.getpid()}-{time.time_ns()}"
+    if target.exists():
+        os.replace(target, previous)
+    os.replace(source, target)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+@contextmanager
+def publish_lock(output_dir: Path) -> Iterator[None]:
+    """Bloqueo exclusivo (entre hilos y procesos) para publicar en ``output_dir``."""
+    output_dir = Path(output_dir)
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    with _publish_lock:
+        if not FILE_LOCKS_AVAILABLE:
+            yield
+            return
+        with open(output_dir.parent / f".{output_dir.name}.publish.lock", 'a+b') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def swap_symlink(target: Path, link: Path):
+    """
+    Hace que ``link`` apunte a ``target`` con un único renombre atómico.
+
+    El enlace nuevo se crea con un nombre temporal y reemplaza al anterior
+    con `os.replace`, así que los lectores ven la versión vieja o la nueva,
+    nunca un directorio ausente. Si ``link`` todavía es un directorio real
+    (datos publicados antes de usar enlaces), se reemplaza una única vez.
+    """
+    target, link = Path(target), Path(link)
+    tmp_link = link.parent / f".{link.name}.link-{os.getpid()}-{time.time_ns()}"
+    os.symlink(os.path.relpath(target, link.parent), tmp_link, target_is_directory=True)
+    if link.is_dir() and not link.is_symlink():
+        previous = link.parent / f".{link.name}.old-{os.getpid()}-{time.time_ns()}"
+        os.replace(link, previous)
+        os.replace(tmp_link, link)
+        shutil.rmtree(previous, ignore_errors=True)
+        return
+    os.replace(tmp_link, link)
+
+
+def _release_versions(releases: Path) -> List[Tuple[int, Path]]:
+    """Publicaciones existentes como (versión, directorio), de la más antigua a la más reciente."""
+    if not releases.is_dir():
+        return []
+    return sorted(
+        (int(path.name[1:]), path) for path in releases.iterdir()
+        if path.is_dir() and path.name[:1] == 'v' and path.name[1:].isdigit()
+    )
+
+
+def _prune_releases(releases: Path, keep: int = KEEP_RELEASES):
+    """Elimina las publicaciones más antiguas, conservando las ``keep`` más recientes."""
+    for _, path in _release_versions(releases)[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def publish(staging: Path, output_dir: Path) -> int:
+    """
+    Publica un directorio temporal como ``output_dir`` e incrementa la versión.
+
+    El directorio se mueve a ``<padre>/releases/<nombre>/vN`` y ``output_dir``
+    pasa a ser un enlace a él. La lectura de la versión, la escritura de la
+    nueva y el cambio del enlace ocurren bajo `publish_lock`, así dos
+    publicaciones simultáneas no pueden escribir el mismo número de versión.
+    Un número de versión nunca se reutiliza, aunque falte ``version.json``.
+    Sin soporte de enlaces simbólicos (ej. Windows sin permisos) se usa
+    `replace_directory`.
+
+    Returns:
+        int: Nueva versión publicada
+    """
+    staging, output_dir = Path(staging), Path(output_dir)
+    releases = output_dir.parent / RELEASES_DIR / output_dir.name
+    with publish_lock(output_dir):
+        existing = _release_versions(releases)
+        version = max(read_data_version(output_dir) or 0, existing[-1][0] if existing else 0) + 1
+        write_data_version(staging, version)
+
+        release = releases / f"v{version}"
+        releases.mkdir(parents=True, exist_ok=True)
+        os.replace(staging, release)
+        try:
+            swap_symlink(release, output_dir)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudo enlazar '{output_dir}' ({e}); se publica con renombres")
+            replace_directory(release, output_dir)
+        else:
+            _prune_releases(releases)
+
+    logger.info(f"📦 Publicada la versión {version} de los datos en '{output_dir}'")
+    return version
+
+
+@contextmanager
+def staged_output(output_dir: Path) -> Iterator[Path]:
+    """
+    Contexto que entrega un directorio temporal y lo publica al terminar.
+
+    Si ocurre un error dentro del bloque, el directorio temporal se descarta
+    y la publicación anterior queda intacta.
+    """
+    staging = prepare_staging(output_dir)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    publish(staging, output_dir)
@@ -0,0 +1,92 @@
+"""
+Carga por bloques con agregados predeclarados.
+
+Para extractos grandes (ej. registros SIVIGILA por municipio o por mes con
+el formato de `morbilidad1.csv`), el loader puede leer el archivo por
+bloques y conservar solo los agregados que usa el dashboard (suma y conteo
+de `valor` por indicador y año), en lugar del archivo completo. La memoria
+queda acotada por el número de grupos, no por el número de filas.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Tuple
+
+import pandas as pd
+
+from utils.storage import COLUMNAR_AVAILABLE, columnar_path
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 100_000
+COUNT_COLUMN = "conteo"
+
+
+class AggregateSpec(NamedTuple):
+    """Agregado que se conserva de un dataset: suma y conteo de ``value`` por ``group_by``."""
+    group_by: Tuple[str, ...]
+    value: str
+    numeric_keys: Tuple[str, ...] = ()
+
+
+# Agregados por clave del DataLoader; el resto de datasets se carga completo
+STREAMING_AGGREGATES: Dict[str, AggregateSpec] = {
+    'morbilidad': AggregateSpec(group_by=('indicador', 'ao'), value='valor', numeric_keys=('ao',)),
+}
+
+
+def iter_chunks(file_path: Path, columns: Iterable[str], chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Lee un dataset por bloques, solo con las columnas pedidas (Parquet si existe)."""
+    columns = list(columns)
+    parquet_path = columnar_path(file_path)
+    if COLUMNAR_AVAILABLE and parquet_path.exists():
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    yield from pd.read_csv(file_path, usecols=columns, chunksize=chunk_rows)
+
+
+def aggregate_chunks(chunks: Iterable[pd.DataFrame], spec: AggregateSpec) -> pd.DataFrame:
+    """
+    Acumula la suma y el conteo de ``spec.value`` por grupo, bloque a bloque.
+
+    Las filas sin valor numérico o sin clave numérica válida se descartan,
+    igual que en la carga completa.
+
+    Returns:
+        pd.DataFrame: Columnas ``group_by``, ``value`` (suma) y ``conteo``
+    """
+    group_by = list(spec.group_by)
+    totals = None
+    rows = 0
+
+    for chunk in chunks:
+        rows += len(chunk)
+        chunk = chunk.assign(**{
+            col: pd.to_numeric(chunk[col], errors='coerce') for col in (spec.value, *spec.numeric_keys)
+        })
+        chunk = chunk.dropna(subset=[spec.value, *spec.numeric_keys])
+        if chunk.empty:
+            continue
+
+        grouped = chunk.groupby(group_by, sort=False)[spec.value].agg(['sum', 'count'])
+        totals = grouped if totals is None else totals.add(grouped, fill_value=0)
+
+    if totals is None:
+        return pd.DataFrame(columns=[*group_by, spec.value, COUNT_COLUMN])
+
+    result = totals.rename(columns={'sum': spec.value, 'count': COUNT_COLUMN}).reset_index()
+    result[COUNT_COLUMN] = result[COUNT_COLUMN].astype('int64')
+    for col in spec.numeric_keys:
+        if (result[col] % 1 == 0).all():
+            result[col] = result[col].astype('int64')
+    logger.info(f"🧮 {rows} filas agregadas en {len(result)} grupos por {', '.join(group_by)}")
+    return result.sort_values(group_by, ignore_index=True)
+
+
+def load_aggregated(file_path: Path, spec: AggregateSpec, chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """Lee un dataset por bloques y devuelve solo su agregado."""
+    columns = dict.fromkeys((*spec.group_by, spec.value))
+    return aggregate_chunks(iter_chunks(file_path, columns, chunk_rows), spec)
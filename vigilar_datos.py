@@ -0,0 +1,253 @@
+"""
+Modo vigilancia del pipeline de datos.
+
+Vigila el archivo Excel de indicadores y, cuando cambia, vuelve a procesar
+solo las hojas cuyo contenido cambió, retira los datasets de las hojas que
+ya no existen y publica el resultado en `data/clean`
+(ver `utils.storage.staged_output`). Las escrituras rápidas y sucesivas del
+archivo se agrupan esperando a que deje de cambiar durante unos segundos.
+
+El estado del servicio (última ejecución, duración, hojas reprocesadas y
+fallos) se mantiene en `data/pipeline_status.json`.
+
+Uso:
+    python vigilar_datos.py [--intervalo 1] [--espera 3]
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from preparar_datos import EXCEL_FILE, OUTPUT_DIR, sheet_hash, write_sheet
+from utils.artifacts import ARTIFACTS_DIR, build_artifacts
+from utils.history import HISTORY_DATASETS, HISTORY_DIR, merge_history
+from utils.loader import DataLoader
+from utils.storage import (
+    read_data_version, read_manifest, staged_output, update_manifest, write_manifest
+)
+
+STATUS_FILE = OUTPUT_DIR.parent / "pipeline_status.json"
+POLL_INTERVAL = 1.0
+DEBOUNCE_SECONDS = 3.0
+
+logger = logging.getLogger(__name__)
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Firma barata del archivo (mtime, tamaño); None si no existe o está bloqueado."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def published_sheet_hashes(output_dir: Path) -> Dict[str, str]:
+    """Hashes de las hojas de origen de la última publicación, según el manifiesto."""
+    datasets = read_manifest(output_dir).get('datasets', {})
+    return {
+        entry['sheet']: entry['source_sha256']
+        for entry in datasets.values()
+        if entry.get('sheet') and entry.get('source_sha256')
+    }
+
+
+def rebuild_changed_sheets(excel_file: Path, output_dir: Path,
+                           history_dir: Optional[Path] = HISTORY_DIR,
+                           artifacts_dir: Optional[Path] = ARTIFACTS_DIR,
+                           loader: Optional[DataLoader] = None) -> List[str]:
+    """
+    Procesa y publica solo las hojas del Excel que cambiaron.
+
+    Los datasets de las hojas que ya no están en el libro se eliminan de la
+    publicación y del manifiesto. Las tablas largas de indicadores que cambiaron se fusionan además en el
+    historial (`history_dir`) y se reconstruyen los artefactos derivados
+    afectados (`artifacts_dir`); None omite cada etapa. ``loader`` es el
+    DataLoader sobre `output_dir` con que se construyen los artefactos (ver
+    `build_artifacts`).
+
+    Returns:
+        List[str]: Hojas reprocesadas o eliminadas (vacía si no hubo cambios)
+    """
+    previous = published_sheet_hashes(output_dir)
+
+    with pd.ExcelFile(excel_file) as xls:
+        sheets = {name: pd.read_excel(xls, sheet_name=name) for name in xls.sheet_names}
+
+    changed = [
+        name for name, df in sheets.items()
+        if not df.empty and previous.get(name) != sheet_hash(df)
+    ]
+    removed = sorted(name for name in previous if name not in sheets)
+    if not changed and not removed:
+        logger.info("📭 El archivo cambió pero ninguna hoja tiene contenido nuevo.")
+        return []
+
+    entries = {}
+    with staged_output(output_dir) as staging_dir:
+        if removed:
+            _remove_sheets(staging_dir, removed)
+        for name in changed:
+            dataset_name, entry = write_sheet(sheets[name], staging_dir, name)
+            entries[dataset_name] = entry
+            logger.info(f"    ✅ Hoja '{name}' reprocesada")
+        update_manifest(staging_dir, entries, source=excel_file)
+
+    history_datasets = [name for name in entries if name in HISTORY_DATASETS]
+    if history_dir is not None and history_datasets:
+        merge_history(output_dir, history_dir, history_datasets)
+    if artifacts_dir is not None:
+        build_artifacts(output_dir, artifacts_dir, loader=loader)
+
+    return changed + removed
+
+
+def _remove_sheets(data_dir: Path, sheets: List[str]):
+    """Elimina los archivos y las entradas del manifiesto de las hojas indicadas."""
+    manifest = read_manifest(data_dir)
+    datasets = manifest.setdefault('datasets', {})
+    for dataset_name, entry in list(datasets.items()):
+        if entry.get('sheet') not in sheets:
+            continue
+        for filename in (entry.get('csv'), entry.get('columnar')):
+            if filename:
+                (data_dir / filename).unlink(missing_ok=True)
+        del datasets[dataset_name]
+        logger.info(f"    🗑️ Hoja '{entry['sheet']}' eliminada del libro: se retira '{dataset_name}'")
+    write_manifest(data_dir, manifest)
+
+
+class PipelineWatcher:
+    """Vigila el Excel de indicadores y republica los datos cuando cambia."""
+
+    def __init__(self, excel_file: Path = EXCEL_FILE, output_dir: Path = OUTPUT_DIR,
+                 status_file: Path = STATUS_FILE, interval: float = POLL_INTERVAL,
+                 debounce: float = DEBOUNCE_SECONDS):
+        self.excel_file = Path(excel_file)
+        self.output_dir = Path(output_dir)
+        self.status_file = Path(status_file)
+        self.interval = interval
+        self.debounce = debounce
+        self.status: Dict[str, Any] = {
+            'state': 'starting',
+            'pid': os.getpid(),
+            'excel_file': str(self.excel_file),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'runs': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'last_run': None,
+            'last_error': None,
+            'data_version': read_data_version(self.output_dir),
+        }
+        self._stop_event = threading.Event()
+        # Un único loader entre ejecuciones: se recarga con cada versión publicada
+        self.loader = DataLoader(str(self.output_dir), backend="pandas")
+
+    def _write_status(self, **changes):
+        """Actualiza el archivo de estado de forma atómica."""
+        self.status.update(changes)
+        self.status['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.status_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.status, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.status_file)
+
+    def run_once(self) -> bool:
+        """
+        Ejecuta una reconstrucción incremental y registra el resultado.
+
+        Returns:
+            bool: True si terminó sin errores
+        """
+        started = time.perf_counter()
+        started_at = datetime.now().isoformat(timespec='seconds')
+        self._write_status(state='running')
+        logger.info(f"🔄 Cambios detectados en '{self.excel_file}'. Reprocesando...")
+
+        try:
+            changed = rebuild_changed_sheets(self.excel_file, self.output_dir, loader=self.loader)
+        except Exception as e:
+            logger.error(f"❌ Falló la reconstrucción: {e}", exc_info=True)
+            self._write_status(
+                state='error',
+                failures=self.status['failures'] + 1,
+                consecutive_failures=self.status['consecutive_failures'] + 1,
+                last_error={'at': started_at, 'message': f"{type(e).__name__}: {e}"},
+            )
+            return False
+
+        duration = round(time.perf_counter() - started, 3)
+        self._write_status(
+            state='idle',
+            runs=self.status['runs'] + 1,
+            consecutive_failures=0,
+            data_version=read_data_version(self.output_dir),
+            last_run={'started_at': started_at, 'duration_s': duration, 'sheets': changed},
+        )
+        logger.info(f"🎉 Reconstrucción completada en {duration}s ({len(changed)} hojas)")
+        return True
+
+    def watch(self):
+        """Bucle principal: sondea el archivo y reconstruye tras el periodo de espera."""
+        logger.info(f"👀 Vigilando '{self.excel_file}' (estado en '{self.status_file}')")
+        processed = None
+        self._write_status(state='idle')
+
+        # La primera pasada sincroniza la salida con el Excel actual
+        pending_since = time.monotonic()
+        last_seen = _file_signature(self.excel_file)
+
+        while not self._stop_event.is_set():
+            signature = _file_signature(self.excel_file)
+            now = time.monotonic()
+
+            if signature != last_seen:
+                # El archivo sigue cambiando: reiniciar la espera
+                last_seen = signature
+                pending_since = now
+            elif (signature is not None and signature != processed
+                    and pending_since is not None and now - pending_since >= self.debounce):
+                self.run_once()
+                # Aunque falle, no reintentar hasta el próximo cambio del archivo
+                processed = signature
+                pending_since = None
+
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """Detiene el bucle de `watch` y registra el estado ``stopped``."""
+        self._stop_event.set()
+        self._write_status(state='stopped')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vigila el Excel de indicadores y republica los datos limpios.")
+    parser.add_argument('--excel', type=Path, default=EXCEL_FILE, help="Archivo Excel a vigilar")
+    parser.add_argument('--salida', type=Path, default=OUTPUT_DIR, help="Directorio de datos limpios")
+    parser.add_argument('--estado', type=Path, default=STATUS_FILE, help="Archivo JSON de estado")
+    parser.add_argument('--intervalo', type=float, default=POLL_INTERVAL, help="Segundos entre sondeos")
+    parser.add_argument('--espera', type=float, default=DEBOUNCE_SECONDS,
+                        help="Segundos sin cambios antes de reprocesar")
+    args = parser.parse_args()
+
+    watcher = PipelineWatcher(args.excel, args.salida, args.estado, args.intervalo, args.espera)
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        watcher.stop()
+        logger.info("👋 Vigilancia detenida.")
+
+
+if __name__ == '__main__':
+    main()